@@ -1,12 +1,16 @@
 import argparse
+import glob
 import logging
 import sys
 from pathlib import Path
 
+from arxml_data_extractor.asr.element_index import ElementIndex
+from arxml_data_extractor.asr.file_catalog import FileCatalog
 from arxml_data_extractor.config_provider import ConfigProvider
 from arxml_data_extractor.query_builder import QueryBuilder
 from arxml_data_extractor.query_handler import QueryHandler
 from arxml_data_extractor.data_writer import DataWriter
+from arxml_data_extractor.query.schema import build_schemas
 
 
 # sets the text color to red
@@ -34,12 +38,74 @@ def parse_arguments():
         help='config file that specifies the data that should be extracted',
         required=True)
     parser.add_argument(
-        '--input', '-i', help='ARXML file from where the data should be extracted', required=True)
+        '--input',
+        '-i',
+        help='ARXML files from where the data should be extracted, glob patterns like \'system/*.arxml\' are expanded. The packages of all files are merged.',
+        nargs='+',
+        required=True)
     parser.add_argument(
         '--output',
         '-o',
-        help='output file, possible file formats are \'.txt\', \'.json\' or \'.xlsx\'.',
+        help='output file, possible file formats are \'.txt\', \'.json\', \'.ndjson\', \'.jsonl\', \'.xlsx\', \'.sqlite\' or \'.db\'.',
         required=True)
+    parser.add_argument(
+        '--streaming',
+        '-s',
+        help='parse the ARXML file incrementally to keep the memory usage low on large files.',
+        action='store_true')
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        help='number of processes handling the root objects in parallel (default: 1).',
+        type=int,
+        default=1)
+    parser.add_argument(
+        '--batched',
+        '-b',
+        help='handle nested objects level by level for all parent elements at once.',
+        action='store_true')
+    parser.add_argument(
+        '--index',
+        help='parse only the elements needed by the configuration, located by the element index of the input file. The index is built by the \'index\' command or on first use.',
+        action='store_true')
+    parser.add_argument(
+        '--prune',
+        help='parses the ARXML files without the subtrees and packages the configuration can\'t reach to keep the memory usage low.',
+        action='store_true')
+    parser.add_argument(
+        '--catalog',
+        help='directory of ARXML files, references to elements not defined by the input files are resolved by loading the file defining them on demand. The scan of the directory is cached in \'.arxml_catalog.json\'.'
+    )
+    parser.add_argument(
+        '--catalog-memory',
+        help='memory budget in MB of the files loaded from the catalog directory (default: 1024).',
+        type=int,
+        default=1024)
+    parser.add_argument(
+        '--columnar',
+        help='keep the results in typed columns until they are written to reduce the memory usage.',
+        action='store_true')
+    parser.add_argument(
+        '--intern-size',
+        help='maximum number of distinct strings shared per value, 0 disables sharing (default: 65536).',
+        type=int,
+        default=65536)
+    parser.add_argument(
+        '--arrow-dates',
+        help='convert date values into arrow objects instead of datetime objects.',
+        action='store_true')
+    parser.add_argument(
+        '--compact',
+        help='write \'.json\' output files without indentation.',
+        action='store_true')
+    parser.add_argument(
+        '--max-rows',
+        help='maximum number of table rows per root object in \'.txt\' and \'.xlsx\' output files.',
+        type=int)
+    parser.add_argument(
+        '--constant-memory',
+        help='write \'.xlsx\' output files row by row to keep the memory usage low.',
+        action='store_true')
     parser.add_argument(
         '--debug',
         '-d',
@@ -49,6 +115,28 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def parse_index_arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog='arxml_data_extractor index',
+        description='Builds the element index of ARXML files, which is stored next to each file.')
+    parser.add_argument(
+        'input',
+        help='ARXML files to index, glob patterns like \'system/*.arxml\' are expanded.',
+        nargs='+')
+    parser.add_argument(
+        '--force',
+        '-f',
+        help='build the index even if it is up to date.',
+        action='store_true')
+    parser.add_argument(
+        '--debug',
+        '-d',
+        help='enable debug modus, this will create a log file.',
+        action='store_true')
+
+    return parser.parse_args(argv)
+
+
 def setup_logging(enable: bool):
     logger = logging.getLogger()
 
@@ -60,10 +148,28 @@ def setup_logging(enable: bool):
         logger.disabled = True
 
 
+def expand_inputs(patterns):
+    input_files = []
+    for pattern in patterns:
+        files = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not files:
+            handle_error(f'input pattern: \'{pattern}\' doesn\'t match any file')
+            sys.exit(-1)
+        for file in files:
+            input_file = Path(file)
+            if not input_file.exists() or not input_file.is_file():
+                handle_error(f'input file: \'{file}\' doesn\'t exist or isn\'t a valid file')
+                sys.exit(-1)
+            if input_file not in input_files:
+                input_files.append(input_file)
+    return input_files
+
+
 def validate_arguments(args):
-    input_file = Path(args.input)
-    if not input_file.exists() or not input_file.is_file():
-        handle_error(f'input file: \'{args.input}\' doesn\'t exist or isn\'t a valid file')
+    input_files = expand_inputs(args.input)
+
+    if args.streaming and len(input_files) > 1:
+        handle_error(f'streaming mode supports a single input file, got {len(input_files)} files')
         sys.exit(-1)
 
     config_file = Path(args.config)
@@ -72,14 +178,45 @@ def validate_arguments(args):
         sys.exit(-1)
 
     output_file = Path(args.output)
-    allowed_suffix = ['.txt', '.json', '.xlsx']
+    allowed_suffix = ['.txt', '.json', '.ndjson', '.jsonl', '.xlsx', '.sqlite', '.db']
+    if args.intern_size < 0:
+        handle_error(f'invalid intern size \'{args.intern_size}\', the size must not be negative')
+        sys.exit(-1)
+
+    if args.prune and (args.streaming or args.index):
+        handle_error('pruning isn\'t supported with streaming mode or the element index')
+        sys.exit(-1)
+
+    if args.index and (args.streaming or args.catalog is not None or len(input_files) > 1):
+        handle_error(
+            'the element index supports a single input file without streaming mode or catalog')
+        sys.exit(-1)
+
+    if args.catalog is not None:
+        catalog_dir = Path(args.catalog)
+        if not catalog_dir.exists() or not catalog_dir.is_dir():
+            handle_error(f'catalog: \'{args.catalog}\' doesn\'t exist or isn\'t a directory')
+            sys.exit(-1)
+        if args.streaming:
+            handle_error('streaming mode doesn\'t support a catalog')
+            sys.exit(-1)
+
+    if args.catalog_memory < 1:
+        handle_error(
+            f'invalid catalog memory \'{args.catalog_memory}\', the budget must be at least 1 MB')
+        sys.exit(-1)
+
+    if args.jobs < 1:
+        handle_error(f'invalid number of jobs \'{args.jobs}\', at least one job is required')
+        sys.exit(-1)
+
     if output_file.suffix not in allowed_suffix:
         handle_error(
-            f'invalid output file extension \'{output_file.suffix}\'. Allowed extensions: \'.txt\', \'.json\' or \'.xlsx\''
+            f'invalid output file extension \'{output_file.suffix}\'. Allowed extensions: \'.txt\', \'.json\', \'.ndjson\', \'.jsonl\', \'.xlsx\', \'.sqlite\' or \'.db\''
         )
         sys.exit(-1)
 
-    return input_file, config_file, output_file
+    return input_files, config_file, output_file
 
 
 def load_config(file):
@@ -97,6 +234,25 @@ def load_config(file):
     return config
 
 
+def load_catalog(directory, memory):
+    if directory is None:
+        return None
+
+    logger = logging.getLogger()
+    logger.info(f'START PROCESS - scanning catalog directory \'{str(directory)}\'')
+
+    try:
+        catalog = FileCatalog(
+            str(directory), memory * 1024 * 1024, cache=str(Path(directory) / '.arxml_catalog.json'))
+    except Exception as e:
+        handle_exception(f'scanning catalog directory \'{str(directory)}\'', e)
+        sys.exit(-1)
+
+    logger.info(
+        f'END PROCESS - successfully finished scanning {len(catalog.files)} files of the catalog')
+    return catalog
+
+
 def build_queries(config):
     logger = logging.getLogger()
     logger.info('START PROCESS - building queries from configuration')
@@ -112,22 +268,45 @@ def build_queries(config):
     return queries
 
 
-def extract_data(file, queries):
+def extract_data(files,
+                 queries,
+                 streaming=False,
+                 jobs=1,
+                 batched=False,
+                 columnar=False,
+                 intern_size=65536,
+                 arrow_dates=False,
+                 catalog=None,
+                 use_index=False,
+                 prune=False):
     logger = logging.getLogger()
     logger.info('START PROCESS - handling of data queries')
 
     try:
-        query_handler = QueryHandler()
-        data = query_handler.handle_queries(str(file), queries)
+        query_handler = QueryHandler(intern_size, arrow_dates, catalog, use_index, prune)
+        if columnar:
+            data = query_handler.handle_columnar([str(file) for file in files], queries, streaming,
+                                                 batched)
+        else:
+            data = query_handler.handle_queries([str(file) for file in files], queries, streaming,
+                                                jobs, batched)
     except Exception as e:
         handle_exception('handling queries', e)
         sys.exit(-1)
 
+    report_pruning(query_handler)
     logger.info('END PROCESS - successfully finished handling of data queries')
     return data
 
 
-def write_data(file, data):
+def report_pruning(query_handler):
+    report = query_handler.prune_report
+    if report is not None:
+        print(f'Pruned {report.pruned} of {report.elements + report.pruned} elements '
+              f'({report.share:.0%}), about {report.saved / 2**20:.1f} MB less memory than a full parse')
+
+
+def write_data(file, data, compact=False, max_rows=None, constant_memory=False, schemas=None):
     logger = logging.getLogger()
     logger.info(f'START PROCESS - writing results to \'{str(file)}\'')
     print(f'Writing results to \'{str(file)}\'')
@@ -135,11 +314,13 @@ def write_data(file, data):
     try:
         output_writer = DataWriter()
         if file.suffix == '.json':
-            output_writer.write_json(str(file), data)
+            output_writer.write_json(str(file), data, compact)
         elif file.suffix == '.xlsx':
-            output_writer.write_excel(str(file), data)
+            output_writer.write_excel(str(file), data, max_rows, constant_memory, schemas)
+        elif file.suffix in ['.sqlite', '.db']:
+            output_writer.write_sqlite(str(file), data, schemas)
         else:
-            output_writer.write_text(str(file), data)
+            output_writer.write_text(str(file), data, max_rows, schemas)
     except Exception as e:
         handle_exception(f'writing results to \'{str(file)}\'', e)
         sys.exit(-1)
@@ -148,15 +329,86 @@ def write_data(file, data):
     print(f'Done.')
 
 
+def extract_records(input_files,
+                    queries,
+                    output_file,
+                    streaming=False,
+                    batched=False,
+                    intern_size=65536,
+                    arrow_dates=False,
+                    catalog=None,
+                    use_index=False,
+                    prune=False):
+    logger = logging.getLogger()
+    logger.info(f'START PROCESS - handling of data queries, writing records to \'{str(output_file)}\'')
+    print(f'Writing records to \'{str(output_file)}\'')
+
+    try:
+        query_handler = QueryHandler(intern_size, arrow_dates, catalog, use_index, prune)
+        records = query_handler.iter_records([str(file) for file in input_files], queries, streaming,
+                                             batched)
+        count = DataWriter().write_ndjson(str(output_file), records)
+    except Exception as e:
+        handle_exception(f'writing records to \'{str(output_file)}\'', e)
+        sys.exit(-1)
+
+    report_pruning(query_handler)
+    logger.info(f'END PROCESS - successfully finished writing {count} records')
+    print(f'Done.')
+
+
+def build_indices(files, force=False):
+    logger = logging.getLogger()
+    for file in files:
+        logger.info(f'START PROCESS - indexing \'{str(file)}\'')
+        try:
+            sidecar = Path(ElementIndex.sidecar(str(file)))
+            if force and sidecar.exists():
+                sidecar.unlink()
+            index = ElementIndex(str(file))
+            index.close()
+        except Exception as e:
+            handle_exception(f'indexing \'{str(file)}\'', e)
+            sys.exit(-1)
+
+        state = 'built' if index.built else 'up to date'
+        print(f'Index of \'{str(file)}\' {state}: {index.count} elements in \'{index.file}\'')
+        logger.info(f'END PROCESS - successfully finished indexing \'{str(file)}\'')
+
+
+def run_index(argv):
+    args = parse_index_arguments(argv)
+    setup_logging(args.debug)
+    build_indices(expand_inputs(args.input), args.force)
+
+
 def run():
+    if len(sys.argv) > 1 and sys.argv[1] == 'index':
+        run_index(sys.argv[2:])
+        return
+
     args = parse_arguments()
     setup_logging(args.debug)
-    input_file, config_file, output_file = validate_arguments(args)
+    input_files, config_file, output_file = validate_arguments(args)
 
     config = load_config(config_file)
     queries = build_queries(config)
-    data = extract_data(input_file, queries)
-    write_data(output_file, data)
+    catalog = load_catalog(args.catalog, args.catalog_memory)
+    if output_file.suffix in ['.ndjson', '.jsonl']:
+        if args.jobs > 1:
+            logging.getLogger().warning('writing records ignores the number of jobs')
+        extract_records(input_files, queries, output_file, args.streaming, args.batched,
+                        args.intern_size, args.arrow_dates, catalog, args.index,
+                        args.prune)
+        return
+
+    if args.columnar and args.jobs > 1:
+        logging.getLogger().warning('columnar results ignore the number of jobs')
+    data = extract_data(input_files, queries, args.streaming, args.jobs, args.batched, args.columnar,
+                        args.intern_size, args.arrow_dates, catalog, args.index,
+                        args.prune)
+    write_data(output_file, data, args.compact, args.max_rows, args.constant_memory,
+               build_schemas(queries))
 
 
 if __name__ == '__main__':
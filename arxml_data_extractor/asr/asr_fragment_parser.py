@@ -0,0 +1,135 @@
+import mmap
+import re
+
+from lxml import etree
+from typing import List, Tuple, Union
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.asr_stream_parser import AsrStreamParser, StreamAnchor
+from arxml_data_extractor.asr.element_index import ElementIndex, ElementRecord
+
+
+class AsrFragmentParser():
+    """Parses single elements of an ARXML file instead of the whole tree. The byte
+    ranges of all referable elements are taken from the ElementIndex of the file,
+    every element is parsed on its own inside a copy of the root element, so the
+    namespaces of the file apply. Parsed elements are kept, an element is only parsed
+    once no matter how often it is referred to.
+
+    The file is memory-mapped, so it is never read as a whole. The bytes of a
+    fragment are sliced from the mapping and copied once, when they are joined with
+    the root tags into the buffer given to the XML parser. References are looked up in
+    the index until their number reaches a sixteenth of the indexed elements, then the
+    byte ranges of all elements are loaded into memory, which is faster for the rest.
+
+    Elements only contain their own subtree, their ancestors and the rest of the file
+    aren't available.
+    """
+    __root_tag = re.compile(rb'<([^\s/>]+)')
+
+    def __init__(self, arxml: str, index: ElementIndex):
+        self.index = index
+        self.__file = open(arxml, 'rb')
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__data)
+        self.__fragments = {}
+        self.__offsets = None
+        self.__lookups = 0
+        self.__parser = etree.XMLParser(remove_blank_text=True)
+        self.parsed = 0
+        self.parsed_bytes = 0
+
+        self.__start = index.root
+        self.__end = b'</' + AsrFragmentParser.__root_tag.match(index.root).group(1) + b'>'
+        self.__root = etree.fromstring(self.__start + self.__end, self.__parser)
+        AsrParser.use_namespace(self.__root.nsmap[None])
+        self.xpath_cache = AsrParser.xpath_cache
+
+    def __str__(self) -> str:
+        return f'AsrFragmentParser(parsed={self.parsed} elements, {self.parsed_bytes} bytes)'
+
+    @property
+    def root(self):
+        """Root element of the file without any children"""
+        return self.__root
+
+    find = staticmethod(AsrParser.find)
+    assemble_xpath = staticmethod(AsrParser.assemble_xpath)
+    # the element index doesn't support a catalog
+    catalog = None
+
+    def compile_xpath(self, path: str) -> etree.XPath:
+        return self.xpath_cache.get(path)
+
+    def close(self):
+        self.__view.release()
+        self.__data.close()
+        self.__file.close()
+
+    def find_reference(self, reference: str) -> etree.Element:
+        """Parses the element described by the AUTOSAR reference
+
+        Arguments:
+            reference {str} -- AUTOSAR reference
+
+        Returns:
+            etree.Element -- xml element node or None
+        """
+        if reference is None:
+            return None
+
+        offsets = self.__find_offsets(AsrStreamParser.normalize_reference(reference))
+        return None if offsets is None else self.__element(*offsets)
+
+    def elements(self, anchor: StreamAnchor) -> List[etree.Element]:
+        """Parses all elements matched by the anchor of a root object in document order
+
+        Raises:
+            ValueError: the anchor matches elements that aren't referable and therefore
+                not indexed
+
+        Returns:
+            List[etree.Element] -- matched elements
+        """
+        if anchor.reference is not None:
+            element = self.find_reference(anchor.reference)
+            return [] if element is None else [element]
+
+        tag = anchor.steps[-1]
+        if tag == '*' or not self.index.covers(tag):
+            raise ValueError(
+                f'AsrFragmentParser - anchor \'{"/".join(anchor.steps)}\' matches elements that aren\'t referable, only referable elements are indexed'
+            )
+        return [
+            self.element(record)
+            for record in self.index.elements_by_tag(tag)
+            if anchor.matches(record.tags.split('/'))
+        ]
+
+    def element(self, record: ElementRecord) -> etree.Element:
+        """Parses the element of an index record"""
+        return self.__element(record.start, record.end)
+
+    def __element(self, start: int, end: int) -> etree.Element:
+        element = self.__fragments.get(start)
+        if element is not None:
+            return element
+
+        fragment = b''.join((self.__start, self.__view[start:end], self.__end))
+        element = etree.fromstring(fragment, self.__parser)[0]
+        self.__fragments[start] = element
+        self.parsed += 1
+        self.parsed_bytes += end - start
+        return element
+
+    def __find_offsets(self, path: str) -> Union[Tuple[int, int], None]:
+        if self.__offsets is not None:
+            return self.__offsets.get(path)
+
+        self.__lookups += 1
+        if self.__lookups * 16 >= self.index.count:
+            self.__offsets = self.index.offsets()
+            return self.__offsets.get(path)
+
+        record = self.index.find(path)
+        return None if record is None else (record.start, record.end)
@@ -1,25 +1,189 @@
+import logging
+import operator
+import os
 import re
+from copy import deepcopy
+from functools import reduce
 
+from concurrent.futures import ThreadPoolExecutor
 from lxml import etree
-from typing import Union
+from typing import Union, Iterable, List
+
+from arxml_data_extractor.asr.xpath_cache import XPathCache
 
 
 class AsrParser():
     """Provides parsing functions for navigating within an ARXML file.
-    """
 
-    def __init__(self, arxml: str):
-        parser = etree.XMLParser(remove_blank_text=True)
-        self.__tree = etree.parse(arxml, parser)
+    Several ARXML files of a system are parsed concurrently in a thread pool, lxml
+    releases the GIL while parsing. Their packages are merged into the tree of the
+    first file, packages with the same AUTOSAR path in several files are merged into
+    one package, so anchors and references resolve across all files.
+
+    References that aren't defined by the parsed files are looked up in the catalog
+    of a directory, which parses the file defining the referred element on demand.
+
+    With a PrunePlan, the files are parsed without the parts the queries can't reach,
+    prune_report holds what was pruned.
+
+    All XPath expressions evaluated by the parsers, by the handlers as well as by the
+    lookups of the parser itself, are compiled by one bounded XPathCache. Parsers of
+    files with the same namespace share the cache.
+    """
+    # namespace of the parsed files and its cache of compiled XPath expressions
+    ns = None
+    xpath_cache = None
+
+    def __init__(self,
+                 arxml: Union[str, List[str]],
+                 threads: Union[int, None] = None,
+                 catalog: Union['FileCatalog', None] = None,
+                 prune: Union['PrunePlan', None] = None):
+        files = [arxml] if isinstance(arxml, str) else list(arxml)
+        if not files:
+            raise ValueError('AsrParser - no ARXML file given')
+
+        self.prune = prune
+        self.prune_report = None
+        parse = AsrParser.__parse if prune is None else prune.parse
+        if len(files) == 1:
+            trees = [parse(files[0])]
+        else:
+            threads = min(len(files), threads or os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                trees = list(executor.map(parse, files))
+        if prune is not None:
+            trees, reports = zip(*trees)
+            self.prune_report = reduce(operator.add, reports)
+        self.__tree = trees[0] if len(files) == 1 else AsrParser.__merge(list(trees), files)
         self.__root = self.tree.getroot()
 
         # get namespace from arxml file
-        AsrParser.ns = {'ar': self.__root.nsmap[None]}
+        AsrParser.use_namespace(self.__root.nsmap[None])
+        self.xpath_cache = AsrParser.xpath_cache
+        self.catalog = catalog
 
         self._packages = {
             AsrParser.get_shortname(element): element
             for element in self.find_all_elements('AUTOSAR/AR-PACKAGES/AR-PACKAGE')
         }
+        self.__references = None
+        self.__paths = None
+        self.__back_references = None
+        self.__tags = {}
+
+    @classmethod
+    def use_namespace(cls, namespace: str):
+        """Sets the AUTOSAR namespace of the parsed files. Compiled XPath expressions are
+        bound to the namespace, so the cache is replaced if the namespace changes.
+
+        Arguments:
+            namespace {str} -- default namespace of the ARXML file
+        """
+        if cls.ns is not None and cls.ns['ar'] == namespace:
+            return
+        cls.ns = {'ar': namespace}
+        cls.xpath_cache = XPathCache(cls.ns, cls.assemble_xpath)
+
+    @staticmethod
+    def __parse(arxml: str) -> etree._ElementTree:
+        # parsers aren't thread-safe, every file gets its own
+        parser = etree.XMLParser(remove_blank_text=True)
+        return etree.parse(arxml, parser)
+
+    @staticmethod
+    def __merge(trees: List[etree._ElementTree], files: List[str]) -> etree._ElementTree:
+        root = trees[0].getroot()
+        namespace = root.nsmap[None]
+        packages_tag = f'{{{namespace}}}AR-PACKAGES'
+        packages = root.find(packages_tag)
+        if packages is None:
+            packages = etree.SubElement(root, packages_tag)
+
+        for tree, file in zip(trees[1:], files[1:]):
+            other = tree.getroot()
+            if other.nsmap[None] != namespace:
+                raise ValueError(
+                    f'AsrParser - namespace \'{other.nsmap[None]}\' of \'{file}\' differs from \'{namespace}\' of \'{files[0]}\''
+                )
+            other_packages = other.find(packages_tag)
+            if other_packages is not None:
+                AsrParser.__merge_packages(packages, other_packages, namespace, file)
+
+        return trees[0]
+
+    @staticmethod
+    def __merge_packages(packages: etree.Element, other: etree.Element, namespace: str, file: str):
+        """Copies the AR-PACKAGE elements of other into packages, packages with the same
+        SHORT-NAME are merged by copying their elements and sub-packages. lxml moves a
+        subtree into another document in quadratic time of its size, a copy of it is
+        inserted in linear time.
+
+        The other children of a merged package, e.g. CATEGORY or ADMIN-DATA, are copied
+        if the package of the first file doesn't have them. The entries of REFERENCE-BASES
+        are merged, other children that differ keep the ones of the first file, which is
+        logged."""
+        package_tag = f'{{{namespace}}}AR-PACKAGE'
+        shortname_tag = f'{{{namespace}}}SHORT-NAME'
+        by_name = {
+            package.findtext(shortname_tag): package
+            for package in packages.iterchildren(package_tag)
+        }
+
+        for package in list(other.iterchildren(package_tag)):
+            name = package.findtext(shortname_tag)
+            existing = by_name.get(name)
+            if existing is None:
+                packages.append(deepcopy(package))
+                by_name[name] = packages[-1]
+                continue
+
+            AsrParser.__merge_children(existing, package, namespace, file)
+
+            elements = package.find(f'{{{namespace}}}ELEMENTS')
+            if elements is not None:
+                existing_elements = existing.find(f'{{{namespace}}}ELEMENTS')
+                if existing_elements is None:
+                    existing.append(deepcopy(elements))
+                else:
+                    existing_elements.extend(deepcopy(element) for element in elements)
+
+            sub_packages = package.find(f'{{{namespace}}}AR-PACKAGES')
+            if sub_packages is not None:
+                existing_sub_packages = existing.find(f'{{{namespace}}}AR-PACKAGES')
+                if existing_sub_packages is None:
+                    existing.append(deepcopy(sub_packages))
+                else:
+                    AsrParser.__merge_packages(existing_sub_packages, sub_packages, namespace, file)
+
+    @staticmethod
+    def __merge_children(existing: etree.Element, package: etree.Element, namespace: str,
+                         file: str):
+        """Merges the children of a package besides its SHORT-NAME, elements and
+        sub-packages into the package of the same name"""
+        merged = {f'{{{namespace}}}{tag}' for tag in ('SHORT-NAME', 'ELEMENTS', 'AR-PACKAGES')}
+        # ELEMENTS and AR-PACKAGES are the last children of a package
+        end = next(existing.iterchildren(*merged - {f'{{{namespace}}}SHORT-NAME'}), None)
+        for child in package:
+            if child.tag in merged or not isinstance(child.tag, str):
+                continue
+
+            current = existing.find(child.tag)
+            if current is None:
+                if end is None:
+                    existing.append(deepcopy(child))
+                else:
+                    end.addprevious(deepcopy(child))
+            elif child.tag == f'{{{namespace}}}REFERENCE-BASES':
+                bases = {etree.tostring(base, with_tail=False) for base in current}
+                current.extend(
+                    deepcopy(base) for base in child
+                    if etree.tostring(base, with_tail=False) not in bases)
+            elif etree.tostring(current, with_tail=False) != etree.tostring(child, with_tail=False):
+                name = existing.findtext(f'{{{namespace}}}SHORT-NAME')
+                logging.getLogger().warning(
+                    f'AsrParser - {etree.QName(child).localname} of package \'{name}\' in \'{file}\' differs from the already merged one, which is kept'
+                )
 
     @property
     def tree(self):
@@ -33,6 +197,135 @@ class AsrParser():
     def packages(self):
         return self._packages
 
+    @property
+    def references(self) -> dict:
+        """Index of all referable elements by their AUTOSAR path. The index is built
+        with a single pass over the tree on first access.
+
+        Returns:
+            dict -- AUTOSAR path (e.g. '/Cluster/CAN') to xml element
+        """
+        if self.__references is None:
+            self.__references, self.__paths = self.__build_references()
+        return self.__references
+
+    @property
+    def back_references(self) -> dict:
+        """Reverse index of all AUTOSAR references. The index is built with a single
+        pass over the tree on first access.
+
+        Returns:
+            dict -- referenced AUTOSAR path to all referencing elements in document order
+        """
+        if self.__back_references is None:
+            self.__back_references = self.__build_back_references()
+        return self.__back_references
+
+    def build_indexes(self):
+        """Builds the reference and back reference indices right away instead of on first
+        access, e.g. before worker processes are forked, so all of them inherit the
+        indices instead of building them on their own.
+        """
+        if self.__references is None:
+            self.__references, self.__paths = self.__build_references()
+        if self.__back_references is None:
+            self.__back_references = self.__build_back_references()
+
+    def path_of(self, element: etree.Element) -> Union[str, None]:
+        """Gets the AUTOSAR path of a referable element
+
+        Arguments:
+            element {etree.Element} -- xml element with shortname
+
+        Returns:
+            str -- AUTOSAR path or None if the element isn't referable
+        """
+        if self.__paths is None:
+            self.__references, self.__paths = self.__build_references()
+        path = self.__paths.get(element)
+        if path is None and self.catalog is not None:
+            # elements of files loaded by the catalog
+            return self.catalog.path_of(element)
+        return path
+
+    def __build_back_references(self) -> dict:
+        back_references = {}
+        xpath = '//*[substring(local-name(), string-length(local-name()) - 2) = "REF"]'
+        for element in self.xpath_cache.get(xpath, assemble=False)(self.root):
+            if element.text is None:
+                continue
+            reference = element.text.strip()
+            if not reference.startswith('/'):
+                reference = '/' + reference
+            back_references.setdefault(reference, []).append(element)
+
+        return back_references
+
+    def __build_references(self) -> tuple:
+        references = {}
+        paths = {}
+        for shortname in self.root.iter(f'{{{AsrParser.ns["ar"]}}}SHORT-NAME'):
+            element = shortname.getparent()
+            if element is None or shortname.text is None:
+                continue
+
+            # SHORT-NAME is the first child of a referable, so the closest referable
+            # ancestor has already been visited in document order
+            parent = element.getparent()
+            while parent is not None and parent not in paths:
+                parent = parent.getparent()
+
+            path = paths.get(parent, '') + '/' + shortname.text.strip()
+            paths[element] = path
+            references.setdefault(path, element)
+
+        return references, paths
+
+    def index_tags(self, tags: Iterable[str]):
+        """Indexes all elements of the given tags with a single pass over the tree.
+        Already indexed tags are skipped.
+
+        Arguments:
+            tags {Iterable[str]} -- element names without namespace
+        """
+        tags = {tag for tag in tags if tag not in self.__tags}
+        if not tags:
+            return
+
+        namespace = f'{{{AsrParser.ns["ar"]}}}'
+        index = {namespace + tag: [] for tag in tags}
+        for element in self.root.iter(*index.keys()):
+            index[element.tag].append(element)
+
+        for tag, elements in index.items():
+            self.__tags[tag[len(namespace):]] = elements
+
+    def elements_by_tag(self, tag: str) -> List[etree.Element]:
+        """Gets all elements with the given tag in document order. The tag is indexed
+        on first use.
+
+        Arguments:
+            tag {str} -- element name without namespace
+
+        Returns:
+            List[etree.Element] -- all elements with the tag
+        """
+        if tag not in self.__tags:
+            self.index_tags([tag])
+        return self.__tags[tag]
+
+    def compile_xpath(self, path: str) -> etree.XPath:
+        """Compiles the XPath expression of the configuration with AUTOSAR namespaces.
+        Compiled expressions are cached by their path.
+
+        Arguments:
+            path {str} -- XPath expression without namespaces
+
+        Returns:
+            etree.XPath -- compiled XPath expression
+        """
+        return self.xpath_cache.get(path)
+
     def find_all_elements(self, path: str) -> list:
         """Finds all elements specified by the XML element path. The path can
         either be a simple element name, a complex xml path with namespaces
@@ -45,10 +338,11 @@ class AsrParser():
             list -- all found elements reachable with the specified element path
         """
         xpath = AsrParser.__assemble_xpath(path)
-        return AsrParser.find(self.root, '//' + xpath)
+        return self.xpath_cache.get('//' + xpath, assemble=False)(self.root)
 
     def find_reference(self, reference: str) -> etree.Element:
-        """Tries to find the element described by the AUTOSAR reference
+        """Tries to find the element described by the AUTOSAR reference, in the files
+        of the catalog if the parsed files don't define it
 
         Arguments:
             reference {str} -- AUTOSAR reference
@@ -56,20 +350,16 @@ class AsrParser():
         Returns:
             etree.Element -- xml element node or None
         """
-        ref_parts = reference.split('/')
-        if (reference.startswith('/')):
-            ref_parts = ref_parts[1:]
-
-        element = self.packages[ref_parts[0]]
-        if (element is None):
+        if reference is None:
             return None
 
-        for i in range(1, len(ref_parts)):
-            xpath = f'.//*/ar:SHORT-NAME[text()="{ref_parts[i]}"]/..'
-            element = AsrParser.__first(AsrParser.find(element, xpath))
-            if (element is None):
-                return None
+        reference = reference.strip()
+        if not reference.startswith('/'):
+            reference = '/' + reference
 
+        element = self.references.get(reference)
+        if element is None and self.catalog is not None:
+            return self.catalog.find_reference(reference)
         return element
 
     @staticmethod
@@ -102,7 +392,7 @@ class AsrParser():
         """
         if isinstance(xpath, etree.XPath):
             return xpath(base)
-        return base.xpath(xpath, namespaces=AsrParser.ns)
+        return AsrParser.xpath_cache.get(xpath, assemble=False)(base)
 
     @classmethod
     def find_elements(cls, base: etree.Element, path: str) -> list:
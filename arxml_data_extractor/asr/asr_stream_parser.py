@@ -0,0 +1,261 @@
+import re
+
+from lxml import etree
+from typing import Union, List, Set, Tuple, Iterator, Iterable
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.query.data_query import DataQuery
+
+
+class PendingReference(Exception):
+    """Raised if a reference points to an element that exists in the ARXML file
+    but hasn't been streamed yet.
+    """
+
+    def __init__(self, reference: str):
+        super().__init__(f'reference \'{reference}\' not streamed yet')
+        self.reference = reference
+
+
+class StreamAnchor():
+    """Matches a root anchor against the elements completed while streaming. Only
+    XPath expressions built of plain element names (or '*') and AUTOSAR references
+    can be matched without having the whole tree in memory.
+    """
+    __step = re.compile(r'^(\*|[A-Za-z_][\w.-]*)$')
+
+    def __init__(self, path: Union[DataQuery.XPath, DataQuery.Reference]):
+        self.reference = None
+        self.steps = []
+        self.descendant = False
+        self.include_root = False
+
+        if isinstance(path, DataQuery.Reference):
+            self.reference = AsrStreamParser.normalize_reference(path.ref)
+        elif isinstance(path, DataQuery.XPath) and not path.is_reference:
+            self.__parse(path.xpath)
+        else:
+            raise ValueError(
+                f'StreamAnchor - anchor \'{path}\' isn\'t supported in streaming mode. Root anchors must be \'_xpath\' or \'_ref\''
+            )
+
+    def __parse(self, xpath: str):
+        if xpath.startswith('//'):
+            self.descendant = self.include_root = True
+            steps = xpath[2:]
+        elif xpath.startswith('.//'):
+            self.descendant = True
+            steps = xpath[3:]
+        elif xpath.startswith('/'):
+            self.include_root = True
+            steps = xpath[1:]
+        elif xpath.startswith('./'):
+            steps = xpath[2:]
+        else:
+            steps = xpath
+
+        self.steps = steps.split('/')
+        if not all(self.__step.match(step) for step in self.steps):
+            raise ValueError(
+                f'StreamAnchor - XPath \'{xpath}\' isn\'t supported in streaming mode. Root anchors must only consist of element names, e.g. \'.//I-SIGNAL-I-PDU\''
+            )
+
+    def matches(self, tags: List[str]) -> bool:
+        """Checks if the element described by the tags of all open elements (from the
+        root to the element itself) is matched by the anchor.
+        """
+        if self.reference is not None:
+            return False
+
+        if not self.include_root:
+            tags = tags[1:]
+        if len(tags) < len(self.steps) or (not self.descendant and len(tags) != len(self.steps)):
+            return False
+
+        for step, tag in zip(reversed(self.steps), reversed(tags)):
+            if step != '*' and step != tag:
+                return False
+        return True
+
+
+class AsrStreamParser():
+    """Parses an ARXML file incrementally with lxml.etree.iterparse instead of loading
+    the whole tree into memory.
+
+    A lightweight first pass collects the AUTOSAR paths of all referable elements and
+    all referenced paths. The second pass yields every element matching an anchor as
+    soon as it is completed, keeps referenced elements for random access and clears
+    everything else.
+    """
+
+    def __init__(self,
+                 arxml: str,
+                 reference_tags: Union[Set[str], None] = None,
+                 references: Iterable[str] = ()):
+        self.__arxml = arxml
+        self.__root = None
+        self.__retained = {}
+        self.__kept = set()
+        self.__completed = False
+
+        self.paths, self.referenced, forward = self.__index(reference_tags)
+        self.xpath_cache = AsrParser.xpath_cache
+        self.referenced.update(AsrStreamParser.normalize_reference(ref) for ref in references)
+
+        # references pointing to elements further down in the file would defer the
+        # referring anchors, instead all referenced elements are collected upfront
+        if forward & self.paths:
+            for _ in self.iterate([]):
+                pass
+
+    @property
+    def root(self):
+        return self.__root
+
+    find = staticmethod(AsrParser.find)
+    assemble_xpath = staticmethod(AsrParser.assemble_xpath)
+    # streaming mode doesn't support a catalog
+    catalog = None
+
+    def compile_xpath(self, path: str) -> etree.XPath:
+        return self.xpath_cache.get(path)
+
+    @staticmethod
+    def normalize_reference(reference: str) -> str:
+        reference = reference.strip()
+        return reference if reference.startswith('/') else '/' + reference
+
+    def find_reference(self, reference: str) -> etree.Element:
+        """Tries to find the element described by the AUTOSAR reference among the
+        elements already streamed.
+
+        Arguments:
+            reference {str} -- AUTOSAR reference
+
+        Raises:
+            PendingReference: the element exists but hasn't been streamed yet
+
+        Returns:
+            etree.Element -- xml element node or None
+        """
+        if reference is None:
+            return None
+
+        reference = AsrStreamParser.normalize_reference(reference)
+        element = self.__retained.get(reference)
+        if element is None and not self.__completed and reference in self.paths:
+            raise PendingReference(reference)
+        return element
+
+    def retain(self, element: etree.Element):
+        """Prevents a yielded element from being cleared, e.g. to process it again
+        once all references are available.
+        """
+        self.__kept.add(element)
+
+    def __index(self, reference_tags: Union[Set[str], None]) -> Tuple[Set[str], Set[str], Set[str]]:
+        paths = set()
+        referenced = set()
+        forward = set()
+
+        frames = []
+        shortname = None
+        for event, element in etree.iterparse(self.__arxml, events=('start', 'end')):
+            if event == 'start':
+                if shortname is None:
+                    AsrParser.use_namespace(element.nsmap[None])
+                    shortname = f'{{{AsrParser.ns["ar"]}}}SHORT-NAME'
+                frames.append(_Frame(frames[-1].child_context() if frames else ''))
+                continue
+
+            frame = frames.pop()
+            if element.tag == shortname and frames and element.text is not None:
+                frames[-1].path = frames[-1].context + '/' + element.text.strip()
+                paths.add(frames[-1].path)
+            elif element.tag.endswith('REF') and element.text is not None:
+                tag = etree.QName(element).localname
+                if reference_tags is None or tag in reference_tags:
+                    reference = AsrStreamParser.normalize_reference(element.text)
+                    referenced.add(reference)
+                    if reference not in paths:
+                        forward.add(reference)
+
+            element.clear()
+            if frames:
+                element.getparent().remove(element)
+
+        return paths, referenced, forward
+
+    def iterate(self, anchors: List[StreamAnchor]) -> Iterator[Tuple[int, etree.Element]]:
+        """Streams the ARXML file and yields the index of the matching anchor together
+        with the completed element. The element must be processed before the next
+        element is requested, afterwards it will be cleared unless it is retained.
+
+        Arguments:
+            anchors {List[StreamAnchor]} -- root anchors to match
+
+        Yields:
+            Tuple[int, etree.Element] -- anchor index and matching element
+        """
+        namespace = f'{{{AsrParser.ns["ar"]}}}'
+        shortname = namespace + 'SHORT-NAME'
+        references = {anchor.reference: i for i, anchor in enumerate(anchors) if anchor.reference}
+
+        tags = []
+        frames = []
+        kept_open = 0
+        for event, element in etree.iterparse(
+                self.__arxml, events=('start', 'end'), remove_blank_text=True):
+            if event == 'start':
+                if not frames:
+                    self.__root = element
+                tag = element.tag
+                tags.append(tag[len(namespace):] if tag.startswith(namespace) else tag)
+
+                frame = _Frame(frames[-1].child_context() if frames else '')
+                frame.anchors = [i for i, anchor in enumerate(anchors) if anchor.matches(tags)]
+                frame.keep = bool(frame.anchors)
+                kept_open += frame.keep
+                frames.append(frame)
+                continue
+
+            tags.pop()
+            frame = frames.pop()
+            kept_open -= frame.keep
+
+            if element.tag == shortname and frames and element.text is not None:
+                parent = frames[-1]
+                parent.path = parent.context + '/' + element.text.strip()
+                if parent.path in references:
+                    parent.anchors.append(references[parent.path])
+                if not parent.keep and (parent.path in self.referenced or parent.anchors):
+                    parent.keep = True
+                    kept_open += 1
+
+            retained = frame.path is not None and frame.path in self.referenced
+            if retained:
+                self.__retained.setdefault(frame.path, element)
+
+            for i in frame.anchors:
+                yield i, element
+
+            # no open ancestor needs the subtree of this element anymore
+            if kept_open == 0 and frames:
+                if not retained and element not in self.__kept:
+                    element.clear()
+                element.getparent().remove(element)
+
+        self.__completed = True
+
+
+class _Frame():
+    __slots__ = ('context', 'path', 'keep', 'anchors')
+
+    def __init__(self, context: str):
+        self.context = context
+        self.path = None
+        self.keep = False
+        self.anchors = []
+
+    def child_context(self) -> str:
+        return self.path if self.path is not None else self.context
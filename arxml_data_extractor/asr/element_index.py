@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from arxml_data_extractor.asr.offset_scanner import OffsetScanner
+
+
+@dataclass
+class ElementRecord():
+    path: str
+    tag: str
+    parent: str
+    short_name: str
+    line: int
+    start: int
+    end: int
+    tags: str
+
+
+class ElementIndex():
+    """Catalog of all referable elements of an ARXML file, stored in a SQLite file next
+    to it. Every element is stored with its AUTOSAR path, tag, parent path, SHORT-NAME,
+    source line, byte range and the tags from the root to the element.
+
+    The index is valid as long as the size and the modification time of the ARXML file
+    are unchanged. If only the modification time changed, the content hash decides, so
+    a copied or touched file keeps its index. An outdated or missing index is built
+    again, unless build is False.
+    """
+    version = 1
+    columns = 'path, tag, parent, short_name, line, start, end, tags'
+
+    def __init__(self, arxml: str, file: Union[str, None] = None, build: bool = True):
+        self.logger = logging.getLogger()
+        self.arxml = arxml
+        self.file = file or ElementIndex.sidecar(arxml)
+        self.built = False
+
+        self.__connection = self.__open()
+        if self.__connection is None:
+            if not build:
+                error = f'ElementIndex - no valid index \'{self.file}\' of \'{arxml}\''
+                self.logger.error(error)
+                raise ValueError(error)
+            self.__connection = self.__build()
+            self.built = True
+
+        info = dict(self.__connection.execute('SELECT key, value FROM info'))
+        self.root = info['root']
+        self.count = int(info['count'])
+        self.tags = {
+            tag: (count, referable)
+            for tag, count, referable in self.__connection.execute(
+                'SELECT tag, count, referable FROM tags')
+        }
+
+    def __str__(self) -> str:
+        return f'ElementIndex(file=\'{self.file}\', elements={self.count}, built={self.built})'
+
+    @staticmethod
+    def sidecar(arxml: str) -> str:
+        """Gets the default file of the index of an ARXML file, e.g. 'system.arxml.index.db'"""
+        return str(arxml) + '.index.db'
+
+    def close(self):
+        self.__connection.close()
+
+    def find(self, path: str) -> Union[ElementRecord, None]:
+        """Finds the first element with the AUTOSAR path in document order
+
+        Arguments:
+            path {str} -- normalized AUTOSAR path, e.g. '/Cluster/CAN'
+
+        Returns:
+            Union[ElementRecord, None] -- the element or None if the path isn't defined
+        """
+        row = self.__connection.execute(
+            f'SELECT {ElementIndex.columns} FROM elements WHERE path = ? ORDER BY start LIMIT 1',
+            (path,)).fetchone()
+        return None if row is None else ElementRecord(*row)
+
+    def elements_by_tag(self, tag: str) -> List[ElementRecord]:
+        """Finds all referable elements with the tag in document order"""
+        rows = self.__connection.execute(
+            f'SELECT {ElementIndex.columns} FROM elements WHERE tag = ? ORDER BY start', (tag,))
+        return [ElementRecord(*row) for row in rows]
+
+    def offsets(self) -> Dict[str, Tuple[int, int]]:
+        """Loads the byte ranges of all elements by their AUTOSAR path, a path defined
+        more than once refers to its first element in document order"""
+        offsets = {}
+        for path, start, end in self.__connection.execute(
+                'SELECT path, start, end FROM elements ORDER BY start'):
+            if path not in offsets:
+                offsets[path] = (start, end)
+        return offsets
+
+    def covers(self, tag: str) -> bool:
+        """Checks if all elements with the tag are referable and therefore indexed"""
+        count, referable = self.tags.get(tag, (0, 0))
+        return count == referable
+
+    def __open(self) -> Union[sqlite3.Connection, None]:
+        if not Path(self.file).is_file():
+            return None
+
+        connection = sqlite3.connect(self.file)
+        try:
+            info = dict(connection.execute('SELECT key, value FROM info'))
+        except sqlite3.DatabaseError as e:
+            connection.close()
+            self.logger.warning(f'ElementIndex - ignored invalid index \'{self.file}\', {e}')
+            return None
+
+        stat = os.stat(self.arxml)
+        valid = info.get('version') == str(ElementIndex.version) and info.get('size') == str(
+            stat.st_size)
+        if valid and info.get('mtime') != str(stat.st_mtime_ns):
+            valid = info.get('hash') == ElementIndex.hash(self.arxml)
+            if valid:
+                with connection:
+                    connection.execute('UPDATE info SET value = ? WHERE key = \'mtime\'',
+                                       (str(stat.st_mtime_ns),))
+        if not valid:
+            connection.close()
+            self.logger.info(f'ElementIndex - index \'{self.file}\' is outdated')
+            return None
+        return connection
+
+    def __build(self) -> sqlite3.Connection:
+        self.logger.info(f'ElementIndex - building index \'{self.file}\' of \'{self.arxml}\'')
+        stat = os.stat(self.arxml)
+        # written to a temporary file first, so an interrupted build leaves no index behind
+        temporary = self.file + '.tmp'
+        if Path(temporary).exists():
+            Path(temporary).unlink()
+
+        scanner = OffsetScanner(self.arxml)
+        connection = sqlite3.connect(temporary)
+        try:
+            with connection:
+                connection.execute('CREATE TABLE info (key TEXT PRIMARY KEY, value)')
+                connection.execute(
+                    'CREATE TABLE elements (path TEXT, tag TEXT, parent TEXT, short_name TEXT, '
+                    'line INTEGER, start INTEGER, end INTEGER, tags TEXT)')
+                connection.execute(
+                    'CREATE TABLE tags (tag TEXT PRIMARY KEY, count INTEGER, referable INTEGER)')
+                connection.executemany(
+                    'INSERT INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?)', scanner.scan())
+                connection.execute('CREATE INDEX elements_path ON elements(path)')
+                connection.execute('CREATE INDEX elements_tag ON elements(tag, start)')
+                connection.executemany('INSERT INTO tags VALUES (?, ?, ?)',
+                                       ((tag, *counts) for tag, counts in scanner.tags.items()))
+                count = connection.execute('SELECT COUNT(*) FROM elements').fetchone()[0]
+                connection.executemany('INSERT INTO info VALUES (?, ?)', [
+                    ('version', str(ElementIndex.version)),
+                    ('size', str(stat.st_size)),
+                    ('mtime', str(stat.st_mtime_ns)),
+                    ('hash', ElementIndex.hash(self.arxml)),
+                    ('root', scanner.root),
+                    ('count', str(count)),
+                ])
+        finally:
+            connection.close()
+
+        os.replace(temporary, self.file)
+        self.logger.info(f'ElementIndex - indexed {count} elements of \'{self.arxml}\'')
+        return sqlite3.connect(self.file)
+
+    @staticmethod
+    def hash(arxml: str) -> str:
+        """Content hash of the ARXML file"""
+        with open(arxml, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.blake2b().hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return hashlib.blake2b(data).hexdigest()
@@ -0,0 +1,293 @@
+import json
+import logging
+import os
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from lxml import etree
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+
+
+class FileCatalog():
+    """Catalog of the ARXML files of a directory. Every file is scanned once, which
+    records the top-level packages and the AUTOSAR paths of all referable elements
+    defined by the file without keeping its tree in memory. The results are stored in
+    a cache file, on later runs only new or modified files (by size and modification
+    time) are scanned again.
+
+    A file is only parsed when a reference first points into it. Parsed files are kept
+    in a cache that drops the least recently used files as soon as their estimated
+    memory usage exceeds memory_budget bytes. The file referred to last is always kept,
+    even if it alone exceeds the budget. Memos holding elements of loaded files, e.g.
+    the ResultMemo of an ObjectHandler, are attached to the catalog, so they drop those
+    elements when their file is dropped and the file's tree is actually released.
+    """
+    # memory of a parsed tree in relation to the size of its file, measured with lxml
+    tree_factor = 5
+    cache_version = 1
+
+    def __init__(self,
+                 directory: str,
+                 memory_budget: int = 1024 * 1024 * 1024,
+                 cache: Union[str, None] = None,
+                 jobs: Union[int, None] = None):
+        self.logger = logging.getLogger()
+        directory = Path(directory)
+        if not directory.is_dir():
+            error = f'FileCatalog - catalog directory doesn\'t exist \'{directory}\''
+            self.logger.error(error)
+            raise ValueError(error)
+
+        self.memory_budget = memory_budget
+        self.namespace = None
+        self.files = []
+        self.packages = {}
+        self.paths = {}
+        self.scanned = 0
+        self.loads = 0
+        self.__parsers = OrderedDict()
+        self.__memory = 0
+        self.__memos = weakref.WeakSet()
+
+        self.__build(directory, cache, jobs)
+        self.logger.info(f'FileCatalog - {self}')
+
+    def __str__(self) -> str:
+        return f'FileCatalog(files={len(self.files)}, scanned={self.scanned}, paths={len(self.paths)}, loaded={len(self.__parsers)}, loads={self.loads}, memory={self.__memory}/{self.memory_budget} bytes)'
+
+    def __getstate__(self) -> dict:
+        # parsed trees can't be pickled, worker processes load the files on their own
+        state = self.__dict__.copy()
+        state['logger'] = None
+        state[f'_{FileCatalog.__name__}__parsers'] = OrderedDict()
+        state[f'_{FileCatalog.__name__}__memory'] = 0
+        state[f'_{FileCatalog.__name__}__memos'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.logger = logging.getLogger()
+        self.__memos = weakref.WeakSet()
+
+    def attach(self, memo: 'ResultMemo'):
+        """Attaches a memo, whose entries of a file are discarded when the file is
+        dropped. The catalog only keeps a weak reference to the memo.
+
+        Arguments:
+            memo {ResultMemo} -- memo keyed by elements
+        """
+        self.__memos.add(memo)
+
+    def files_of_package(self, package: str) -> List[str]:
+        """Gets the files defining a top-level package, a package can be split into
+        several files.
+
+        Arguments:
+            package {str} -- SHORT-NAME of the top-level package
+
+        Returns:
+            List[str] -- files in the order of the catalog
+        """
+        return [self.files[index] for index in self.packages.get(package, [])]
+
+    def file_of(self, reference: str) -> Union[str, None]:
+        """Gets the file defining the element of an AUTOSAR path"""
+        index = self.paths.get(reference)
+        return None if index is None else self.files[index]
+
+    def find_reference(self, reference: str) -> etree.Element:
+        """Finds the element of a normalized AUTOSAR path, the file defining it is
+        parsed if it isn't loaded yet.
+
+        Arguments:
+            reference {str} -- AUTOSAR path starting with '/'
+
+        Returns:
+            etree.Element -- xml element node or None if no file defines the path
+        """
+        file = self.file_of(reference)
+        if file is None:
+            return None
+        return self.load(file).find_reference(reference)
+
+    def load(self, file: str) -> AsrParser:
+        """Gets the parser of a file of the catalog, it is parsed if it isn't loaded
+        yet. The least recently used files are dropped if the memory budget is exceeded.
+        """
+        parser = self.__parsers.get(file)
+        if parser is not None:
+            self.__parsers.move_to_end(file)
+            return parser
+
+        self.logger.info(f'FileCatalog - loading \'{file}\'')
+        parser = AsrParser(file)
+        self.loads += 1
+        self.__parsers[file] = parser
+        self.__memory += self.__estimate(file)
+        while self.__memory > self.memory_budget and len(self.__parsers) > 1:
+            evicted, evicted_parser = self.__parsers.popitem(last=False)
+            self.__memory -= self.__estimate(evicted)
+            # the keys of a memo would keep the whole tree alive
+            for memo in list(self.__memos):
+                memo.discard_document(evicted_parser.root)
+            self.logger.debug(f'FileCatalog - dropped \'{evicted}\'')
+        return parser
+
+    @staticmethod
+    def path_of(element: etree.Element) -> Union[str, None]:
+        """Gets the AUTOSAR path of a referable element of a loaded file from the
+        SHORT-NAMEs of its ancestors
+
+        Returns:
+            str -- AUTOSAR path or None if the element isn't referable
+        """
+        shortname = f'{{{etree.QName(element).namespace}}}SHORT-NAME'
+        if element.find(shortname) is None:
+            return None
+
+        names = []
+        while element is not None:
+            name = element.findtext(shortname)
+            if name is not None:
+                names.append(name.strip())
+            element = element.getparent()
+        return '/' + '/'.join(reversed(names))
+
+    @staticmethod
+    def scan(file: str) -> Tuple[str, List[str], List[str]]:
+        """Reads a file with the events of the XML parser and collects its namespace, the
+        SHORT-NAMEs of its top-level packages and the AUTOSAR paths of its referable
+        elements in document order. No tree is built, so the memory of a scan doesn't
+        depend on the size of the file.
+        """
+        return etree.parse(file, etree.XMLParser(target=_ScanTarget()))
+
+    def __estimate(self, file: str) -> int:
+        return os.path.getsize(file) * FileCatalog.tree_factor
+
+    def __build(self, directory: Path, cache: Union[str, None], jobs: Union[int, None]):
+        entries = self.__read_cache(cache)
+
+        files = [str(file) for file in sorted(directory.rglob('*.arxml'))]
+        stats = {file: os.stat(file) for file in files}
+        outdated = [
+            file for file in files
+            if file not in entries or entries[file]['size'] != stats[file].st_size or
+            entries[file]['mtime'] != stats[file].st_mtime_ns
+        ]
+        if outdated:
+            # the events of the scan are handled in Python, so several files are
+            # scanned by a pool of processes instead of threads
+            jobs = min(len(outdated), jobs or os.cpu_count() or 1)
+            if jobs > 1:
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    scans = list(executor.map(_scan, outdated))
+            else:
+                scans = [_scan(file) for file in outdated]
+            for file, scan in zip(outdated, scans):
+                scan.update(size=stats[file].st_size, mtime=stats[file].st_mtime_ns)
+                entries[file] = scan
+            self.scanned = len(outdated)
+
+        for file in files:
+            entry = entries[file]
+            if 'error' in entry:
+                self.logger.warning(f'FileCatalog - skipped \'{file}\', {entry["error"]}')
+                continue
+            if self.namespace is None:
+                self.namespace = entry['namespace']
+            elif entry['namespace'] != self.namespace:
+                self.logger.warning(
+                    f'FileCatalog - skipped \'{file}\', namespace \'{entry["namespace"]}\' differs from \'{self.namespace}\''
+                )
+                continue
+
+            index = len(self.files)
+            self.files.append(file)
+            for package in entry['packages']:
+                self.packages.setdefault(package, []).append(index)
+            for path in entry['paths']:
+                self.paths.setdefault(path, index)
+
+        if cache is not None and outdated:
+            self.__write_cache(cache, {file: entries[file] for file in files})
+
+    def __read_cache(self, cache: Union[str, None]) -> dict:
+        if cache is None or not Path(cache).is_file():
+            return {}
+        try:
+            with open(cache, encoding='utf-8') as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f'FileCatalog - ignored cache \'{cache}\', {e}')
+            return {}
+        if content.get('version') != FileCatalog.cache_version:
+            return {}
+        return content['files']
+
+    def __write_cache(self, cache: str, entries: dict):
+        try:
+            with open(cache, 'w', encoding='utf-8') as f:
+                json.dump({'version': FileCatalog.cache_version, 'files': entries}, f)
+        except OSError as e:
+            self.logger.warning(f'FileCatalog - couldn\'t write cache \'{cache}\', {e}')
+
+
+def _scan(file: str) -> dict:
+    # files that can't be parsed are cached as well, until they are modified
+    try:
+        namespace, packages, paths = FileCatalog.scan(file)
+    except etree.XMLSyntaxError as e:
+        return {'error': str(e)}
+    return {'namespace': namespace, 'packages': packages, 'paths': paths}
+
+
+class _ScanTarget():
+    """Parser target of FileCatalog.scan, it only keeps the AUTOSAR paths of the open
+    elements"""
+
+    def __init__(self):
+        self.namespace = None
+        self.shortname_tag = None
+        # AUTOSAR path of every open element or of its closest referable ancestor and
+        # whether the element itself is referable
+        self.stack = []
+        self.paths = {}
+        self.packages = []
+        self.text = None
+
+    def start(self, tag: str, attrib: dict):
+        if self.shortname_tag is None:
+            self.namespace = etree.QName(tag).namespace
+            self.shortname_tag = f'{{{self.namespace}}}SHORT-NAME'
+        if tag == self.shortname_tag:
+            self.text = []
+        self.stack.append([self.stack[-1][0], False] if self.stack else ['', False])
+
+    def data(self, data: str):
+        if self.text is not None:
+            self.text.append(data)
+
+    def end(self, tag: str):
+        self.stack.pop()
+        if self.text is None or tag != self.shortname_tag:
+            return
+
+        text = ''.join(self.text).strip()
+        self.text = None
+        # SHORT-NAME is the first child of a referable
+        if not self.stack or self.stack[-1][1]:
+            return
+        owner = self.stack[-1]
+        if not owner[0] and len(self.stack) == 3:
+            self.packages.append(text)
+        owner[0] += '/' + text
+        owner[1] = True
+        self.paths[owner[0]] = None
+
+    def close(self) -> Tuple[str, List[str], List[str]]:
+        return self.namespace, self.packages, list(self.paths)
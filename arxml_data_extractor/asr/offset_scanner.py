@@ -0,0 +1,114 @@
+import html
+import mmap
+import re
+from typing import Iterator, Tuple
+
+# path, tag, parent path, SHORT-NAME, line, start offset, end offset, tags from the root
+Offsets = Tuple[str, str, str, str, int, int, int, str]
+
+
+class OffsetScanner():
+    """Scans the tags of an ARXML file without building a tree and collects the byte
+    range of every referable element, from the '<' of its start tag to the end of its
+    end tag. The file is memory-mapped, so it is never loaded as a whole.
+
+    Only tags, comments, CDATA sections and processing instructions are tokenized.
+    SHORT-NAMEs are expected to be UTF-8 encoded, like AUTOSAR requires for ARXML files.
+    """
+    __token = re.compile(
+        rb'<(?:!--.*?-->|!\[CDATA\[.*?\]\]>|\?.*?\?>|![^>]*>|'
+        rb'(/?)([^\s/>]+)(?:[^>"\']|"[^"]*"|\'[^\']*\')*?(/?)>)', re.DOTALL)
+
+    def __init__(self, arxml: str):
+        self.arxml = arxml
+        self.root = b''
+        self.tags = {}
+
+    def scan(self) -> Iterator[Offsets]:
+        """Yields the offsets of all referable elements in the order of their end tags.
+        Afterwards root holds the start tag of the root element and tags the number of
+        all elements and of the referable elements per tag.
+
+        Raises:
+            ValueError: the tags of the file aren't balanced
+        """
+        with open(self.arxml, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from self.__scan(data)
+
+    def __scan(self, data: mmap.mmap) -> Iterator[Offsets]:
+        tags = {}
+        stack = []
+        names = []
+        line, position = 1, 0
+        for match in OffsetScanner.__token.finditer(data):
+            qualified = match.group(2)
+            if qualified is None:
+                continue
+
+            if not match.group(1):
+                local = OffsetScanner.__local(qualified)
+                if match.group(3):
+                    tags.setdefault(local, [0, 0])[0] += 1
+                    continue
+
+                if stack:
+                    parent = stack[-1]
+                    context = parent.path if parent.path is not None else parent.context
+                else:
+                    context = ''
+                    self.root = data[match.start():match.end()]
+                stack.append(_Frame(qualified, local, match.start(), match.end(), context))
+                names.append(local)
+                continue
+
+            if not stack or stack[-1].qualified != qualified:
+                raise ValueError(
+                    f'OffsetScanner - unexpected end tag \'{qualified.decode()}\' at offset {match.start()} of \'{self.arxml}\''
+                )
+            frame = stack.pop()
+            names.pop()
+            count = tags.setdefault(frame.local, [0, 0])
+            count[0] += 1
+
+            if frame.local == 'SHORT-NAME' and stack and stack[-1].path is None:
+                # SHORT-NAME is the first child of a referable element
+                owner = stack[-1]
+                text = data[frame.content:match.start()].decode('utf-8')
+                owner.shortname = html.unescape(text).strip()
+                owner.path = f'{owner.context}/{owner.shortname}'
+                owner.tags = '/'.join(names)
+                # referable elements are found in document order
+                line += data[position:owner.start].count(b'\n')
+                position = owner.start
+                owner.line = line
+            elif frame.path is not None:
+                count[1] += 1
+                yield (frame.path, frame.local, frame.context, frame.shortname, frame.line,
+                       frame.start, match.end(), frame.tags)
+
+        if stack:
+            raise ValueError(
+                f'OffsetScanner - element \'{stack[-1].qualified.decode()}\' isn\'t closed in \'{self.arxml}\''
+            )
+        self.tags = {tag: tuple(count) for tag, count in tags.items()}
+
+    @staticmethod
+    def __local(tag: bytes) -> str:
+        tag = tag.decode('utf-8')
+        return tag[tag.index(':') + 1:] if ':' in tag else tag
+
+
+class _Frame():
+    __slots__ = ('qualified', 'local', 'start', 'content', 'context', 'path', 'shortname', 'line',
+                 'tags')
+
+    def __init__(self, qualified: bytes, local: str, start: int, content: int, context: str):
+        self.qualified = qualified
+        self.local = local
+        self.start = start
+        self.content = content
+        self.context = context
+        self.path = None
+        self.shortname = None
+        self.line = None
+        self.tags = None
@@ -0,0 +1,243 @@
+import os
+import re
+from dataclasses import dataclass, field
+from lxml import etree
+from typing import List, Set, Tuple, Union
+
+from arxml_data_extractor.asr.asr_stream_parser import StreamAnchor
+from arxml_data_extractor.asr.file_catalog import FileCatalog
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_value import DataValue
+
+
+@dataclass
+class PruneReport():
+    elements: int = 0
+    pruned: int = 0
+    size: int = 0
+    packages: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f'PruneReport(elements={self.elements}, pruned={self.pruned} ({self.share:.0%}), packages={self.packages}, saved={self.saved} bytes)'
+
+    def __add__(self, other: 'PruneReport') -> 'PruneReport':
+        return PruneReport(self.elements + other.elements, self.pruned + other.pruned,
+                           self.size + other.size, self.packages + other.packages)
+
+    @property
+    def share(self) -> float:
+        """Share of the pruned elements of all elements of the file"""
+        total = self.elements + self.pruned
+        return self.pruned / total if total else 0.0
+
+    @property
+    def saved(self) -> int:
+        """Estimated memory in bytes that a full parse would have needed for the pruned
+        elements, the tree of the whole file is estimated like the FileCatalog does"""
+        return int(self.size * FileCatalog.tree_factor * self.share)
+
+
+class PrunePlan():
+    """Determines from the DataObjects which parts of an ARXML file the queries can
+    reach and parses the file without the rest.
+
+    Subtrees of documentation and variant handling tags (ADMIN-DATA, DESC, ...) are
+    dropped, unless the queries name their tag or a tag inside them. Top-level
+    packages are dropped, if they neither contain a '_ref' anchor nor an element
+    matched by the XPath anchor of a root object. Queries that may see elements
+    anywhere in the file keep the corresponding parts: wildcards keep all subtrees,
+    '_xref' anchors, inline references, absolute paths and other axes than child and
+    descendant keep all packages and '_backref' anchors disable pruning.
+
+    Subtrees are dropped as soon as they are complete, so the memory of a full parse
+    is never needed. Without XPath anchors, packages are decided by their SHORT-NAME
+    and their elements are dropped while they are read.
+    """
+    prunable = ('ADMIN-DATA', 'ANNOTATIONS', 'DESC', 'INTRODUCTION', 'VARIATION-POINT')
+    __literal = re.compile(r'"[^"]*"|\'[^\']*\'')
+    __name = re.compile(r'(@?)([A-Za-z_][\w.-]*)(\s*(?:\(|::))?')
+    __count = etree.XPath('count(descendant-or-self::*)')
+
+    def __init__(self, queries: List[DataObject]):
+        # SHORT-NAMEs are needed for the AUTOSAR paths of all referable elements
+        self.tags = {'SHORT-NAME'}
+        self.packages = set()
+        self.anchors = set()
+        self.all_packages = False
+        self.wildcard = False
+        self.enabled = True
+
+        for data_object in queries:
+            self.__analyze_anchor(data_object)
+            self.__analyze(data_object, root=True)
+
+        self.drop = set() if self.wildcard or not self.enabled else set(
+            PrunePlan.prunable) - self.tags
+
+    def __str__(self) -> str:
+        packages = 'all' if self.all_packages else sorted(self.packages)
+        return f'PrunePlan(enabled={self.enabled}, drop={sorted(self.drop)}, packages={packages}, anchors={sorted(self.anchors)})'
+
+    def parse(self, arxml: str) -> Tuple[etree._ElementTree, PruneReport]:
+        """Parses the ARXML file without the parts the queries can't reach
+
+        Arguments:
+            arxml {str} -- ARXML file
+
+        Returns:
+            Tuple[etree._ElementTree, PruneReport] -- pruned tree and what was pruned
+        """
+        report = PruneReport(size=os.path.getsize(arxml))
+        tags = [f'{{*}}{tag}' for tag in self.drop]
+        if self.enabled and not self.all_packages:
+            # packages are decided as soon as their SHORT-NAME is read, if possible
+            tags += ['{*}AR-PACKAGE', '{*}SHORT-NAME']
+        if not tags:
+            tree = etree.parse(arxml, etree.XMLParser(remove_blank_text=True))
+            report.elements = int(PrunePlan.__count(tree.getroot()))
+            return tree, report
+
+        context = etree.iterparse(arxml, events=('end',), tag=tags, remove_blank_text=True)
+        namespace = None
+        dropping = None
+        for _, element in context:
+            if namespace is None:
+                namespace = etree.QName(element).namespace
+                namespace = f'{{{namespace}}}' if namespace else ''
+                package_tag = namespace + 'AR-PACKAGE'
+                shortname_tag = namespace + 'SHORT-NAME'
+                needed = {namespace + tag for tag in self.tags}
+                anchors = [namespace + tag for tag in self.anchors]
+
+            tag = element.tag
+            if tag == shortname_tag:
+                owner = element.getparent()
+                if dropping is not None:
+                    # the elements before the owner are complete, they are dropped right away
+                    report.pruned += PrunePlan.__trim(owner, dropping)
+                elif not anchors and owner.tag == package_tag and PrunePlan.__is_top_level(owner):
+                    shortname = (element.text or '').strip()
+                    if shortname not in self.packages:
+                        dropping = owner
+                        report.packages.append(shortname)
+            elif tag == package_tag:
+                if element is dropping:
+                    dropping = None
+                elif not PrunePlan.__is_top_level(element):
+                    continue
+                else:
+                    shortname = (element.findtext(shortname_tag) or '').strip()
+                    if shortname in self.packages or (anchors and next(
+                            element.iter(*anchors), None) is not None):
+                        continue
+                    report.packages.append(shortname)
+                report.pruned += int(PrunePlan.__count(element))
+                PrunePlan.__remove(element)
+            elif dropping is None:
+                count = PrunePlan.__count_unneeded(element, needed)
+                if count:
+                    report.pruned += count
+                    PrunePlan.__remove(element)
+
+        tree = context.root.getroottree()
+        report.elements = int(PrunePlan.__count(tree.getroot()))
+        return tree, report
+
+    @staticmethod
+    def __count_unneeded(element: etree.Element, needed: Set[str]) -> int:
+        """Counts the elements of the subtree, 0 if the subtree contains a needed tag"""
+        count = 0
+        for e in element.iter():
+            if e.tag in needed:
+                return 0
+            count += 1
+        return count
+
+    @staticmethod
+    def __trim(element: etree.Element, package: etree.Element) -> int:
+        """Drops the preceding siblings of the element and of its ancestors up to the
+        package and returns the number of dropped elements"""
+        count = 0
+        while element is not package:
+            parent = element.getparent()
+            while parent[0] is not element:
+                count += int(PrunePlan.__count(parent[0]))
+                del parent[0]
+            element = parent
+        return count
+
+    @staticmethod
+    def __is_top_level(package: etree.Element) -> bool:
+        packages = package.getparent()
+        return packages is not None and packages.getparent() is not None and packages.getparent(
+        ).getparent() is None
+
+    @staticmethod
+    def __remove(element: etree.Element):
+        parent = element.getparent()
+        if element.tail:
+            # the tail belongs to the parent, lxml would remove it with the element
+            previous = element.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or '') + element.tail
+            else:
+                parent.text = (parent.text or '') + element.tail
+        # a removed subtree is moved into a document of its own in quadratic time,
+        # it's emptied first
+        element.clear()
+        parent.remove(element)
+
+    def __analyze_anchor(self, data_object: DataObject):
+        path = data_object.path
+        if not isinstance(path, DataQuery.XPath):
+            return
+
+        try:
+            anchor = StreamAnchor(path)
+        except ValueError:
+            self.all_packages = True
+            return
+
+        tag = anchor.steps[-1]
+        if tag in ('*', 'AUTOSAR', 'AR-PACKAGES'):
+            self.all_packages = True
+        self.anchors.add(tag)
+
+    def __analyze(self, value: Union[DataObject, DataValue], root: bool = False):
+        path = value.path if isinstance(value, DataObject) else value.query.path
+        if isinstance(path, DataQuery.Reference):
+            package = path.ref.strip().lstrip('/').split('/')[0]
+            self.packages.add(package)
+        elif isinstance(path, DataQuery.BackReference):
+            # referring elements can be anywhere in the file
+            self.enabled = False
+        else:
+            if path.is_reference:
+                self.all_packages = True
+            self.__analyze_xpath(path.xpath, root)
+
+        if isinstance(value, DataObject):
+            for v in value.values:
+                self.__analyze(v)
+
+    def __analyze_xpath(self, xpath: str, root: bool):
+        xpath = PrunePlan.__literal.sub('', xpath)
+        if '*' in xpath:
+            self.wildcard = True
+        # root anchors search the whole file anyway, other paths may leave their package
+        if not root and (xpath.startswith('/') or '..' in xpath):
+            self.all_packages = True
+
+        for attribute, name, suffix in PrunePlan.__name.findall(xpath):
+            if attribute:
+                continue
+            if suffix.strip() == '::':
+                if name not in ('child', 'descendant', 'descendant-or-self', 'self', 'attribute'):
+                    self.all_packages = True
+                continue
+            if suffix.strip() == '(':
+                if name == 'node':
+                    self.wildcard = True
+                continue
+            self.tags.add(name)
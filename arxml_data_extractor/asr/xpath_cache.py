@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from lxml import etree
+from typing import Callable
+
+
+class XPathCache():
+    """Bounded cache of compiled XPath expressions. The expressions are keyed by the
+    raw path of the configuration, so the namespace rewrite and the compilation by
+    lxml are only done once per path. The least recently used expression is dropped
+    if the cache is full.
+    """
+
+    def __init__(self, namespaces: dict, assemble: Callable[[str], str], maxsize: int = 1024):
+        self.namespaces = namespaces
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__assemble = assemble
+        self.__cache = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    def __str__(self) -> str:
+        return f'XPathCache(hits={self.hits}, misses={self.misses}, size={len(self)}/{self.maxsize})'
+
+    def get(self, path: str, assemble: bool = True) -> etree.XPath:
+        """Gets the compiled XPath expression of the path, compiles it on a cache miss
+
+        Arguments:
+            path {str} -- XPath expression without namespaces
+            assemble {bool} -- False if the expression already has namespace prefixes
+
+        Returns:
+            etree.XPath -- compiled XPath expression
+        """
+        # expressions with prefixes are keyed apart from the paths of the configuration
+        key = path if assemble else (path, )
+        xpath = self.__cache.get(key)
+        if xpath is not None:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return xpath
+
+        self.misses += 1
+        expression = self.__assemble(path) if assemble else path
+        # text results are plain strings, they don't need a reference to their element
+        xpath = etree.XPath(expression, namespaces=self.namespaces, smart_strings=False)
+        self.__cache[key] = xpath
+        if len(self.__cache) > self.maxsize:
+            self.__cache.popitem(last=False)
+        return xpath
+
+    def clear(self):
+        self.__cache.clear()
+        self.hits = self.misses = 0
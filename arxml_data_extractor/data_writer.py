@@ -1,22 +1,78 @@
 import json
+from typing import Dict, Iterable, Tuple, Union
 
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
 from arxml_data_extractor.output.text_writer import TextWriter
 from arxml_data_extractor.output.excel_writer import ExcelWriter
+from arxml_data_extractor.output.json_writer import JsonWriter
+from arxml_data_extractor.output.sqlite_writer import SqliteWriter
+from arxml_data_extractor.query.schema import ObjectSchema
 
 
 class DataWriter():
+    """Writes the results of the root objects. The results may also be ColumnarResults,
+    they are written directly to '.json' and '.sqlite' files and converted to the
+    values of their elements for table output.
+    """
 
-    def write_text(self, file: str, data: dict):
-        writer = TextWriter()
-        text = writer.as_table(data)
+    def write_text(self,
+                   file: str,
+                   data: dict,
+                   max_rows: Union[int, None] = None,
+                   schemas: Union[Dict[str, ObjectSchema], None] = None):
+        data, schemas = self.__results(data, schemas)
+        writer = TextWriter(max_rows)
+        text = writer.as_table(data, schemas)
 
         with open(file, 'w') as f:
             f.write(text)
 
-    def write_json(self, file: str, data: dict):
+    def write_json(self, file: str, data: dict, compact: bool = False):
+        writer = JsonWriter(compact)
+        writer.write(file, data)
+
+    def write_ndjson(self, file: str, records: Iterable[Tuple[str, dict]]) -> int:
+        """Writes every record as a single line {name: values} as soon as it is produced
+
+        Returns:
+            int -- number of records written
+        """
+        count = 0
         with open(file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+            for name, values in records:
+                f.write(json.dumps({name: values}, ensure_ascii=False, default=JsonWriter.default))
+                f.write('\n')
+                count += 1
+        return count
 
-    def write_excel(self, file: str, data: dict):
-        writer = ExcelWriter()
-        writer.write(file, data)
+    def write_excel(self,
+                    file: str,
+                    data: dict,
+                    max_rows: Union[int, None] = None,
+                    constant_memory: bool = False,
+                    schemas: Union[Dict[str, ObjectSchema], None] = None):
+        data, schemas = self.__results(data, schemas)
+        writer = ExcelWriter(max_rows, constant_memory)
+        writer.write(file, data, schemas)
+
+    def write_sqlite(self,
+                     file: str,
+                     data: dict,
+                     schemas: Union[Dict[str, ObjectSchema], None] = None):
+        writer = SqliteWriter()
+        writer.write(file, data, schemas)
+
+    @staticmethod
+    def __results(data: dict, schemas: Union[Dict[str, ObjectSchema], None]
+                 ) -> Tuple[dict, Union[Dict[str, ObjectSchema], None]]:
+        columnar = {key: value for key, value in data.items() if isinstance(value, ColumnarResult)}
+        if not columnar:
+            return data, schemas
+
+        schemas = dict(schemas or {})
+        for key, value in columnar.items():
+            schemas.setdefault(key, value.schema)
+        results = {
+            key: value.to_results() if key in columnar else value for key, value in data.items()
+        }
+        return results, schemas
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from typing import Hashable, Any
+
+
+class BoundedMemo():
+    """Bounded memo of computed values by their key. The least recently used values
+    are dropped if the memo is full.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(hits={self.hits}, misses={self.misses}, size={len(self)}/{self.maxsize})'
+
+    def get(self, key: Hashable) -> Any:
+        """Gets the memoized value of the key
+
+        Arguments:
+            key {Hashable} -- key of the value
+
+        Returns:
+            Any -- value or None if the key isn't memoized
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
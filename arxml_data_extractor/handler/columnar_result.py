@@ -0,0 +1,145 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import repeat
+from typing import Iterator, Union
+
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.schema import ObjectSchema
+
+
+class ColumnarResult(Sequence):
+    """Values of all elements of a DataObject, stored column by column instead of a dict
+    per element. Integer and Float values are stored in typed arrays, all other values
+    in lists whose equal strings share a single object. The elements of a nested
+    DataObject are stored in a nested ColumnarResult, the offsets of every nested
+    object hold the range of nested elements of each element.
+
+    Values that don't fit into the typed array of their column, e.g. None or the string
+    of a failed conversion, are kept aside per column. Indexing or iterating the result
+    builds the values of an element in the shape returned by the ObjectHandler.
+    """
+    typecodes = {DataQuery.Format.Integer: 'q', DataQuery.Format.Float: 'd'}
+
+    def __init__(self, schema: ObjectSchema):
+        self.schema = schema
+        self.count = 0
+        self.columns = {}
+        self.exceptions = {}
+        self.nested = {}
+        self.offsets = {}
+        self.__pools = {}
+        for value in schema.values:
+            if isinstance(value, ObjectSchema):
+                self.nested[value.name] = ColumnarResult(value)
+                self.offsets[value.name] = array('q', [0])
+                continue
+
+            typecode = ColumnarResult.typecodes.get(value.format)
+            if typecode is None:
+                self.columns[value.name] = []
+                self.__pools[value.name] = {}
+            else:
+                self.columns[value.name] = array(typecode)
+            self.exceptions[value.name] = {}
+
+    @staticmethod
+    def from_results(schema: ObjectSchema, values: Union[list, dict]) -> 'ColumnarResult':
+        """Stores the values of a DataObject as returned by the ObjectHandler"""
+        result = ColumnarResult(schema)
+        result.extend(values)
+        return result
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> dict:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('ColumnarResult index out of range')
+
+        values = {}
+        for value in self.schema.values:
+            name = value.name
+            if isinstance(value, ObjectSchema):
+                offsets = self.offsets[name]
+                nested = self.nested[name][offsets[index]:offsets[index + 1]]
+                values[name] = nested[0] if len(nested) == 1 else nested
+            else:
+                exceptions = self.exceptions[name]
+                values[name] = exceptions[index] if index in exceptions else self.columns[name][index]
+        return values
+
+    def append(self, values: dict):
+        """Appends the values of an element, as built by the ObjectHandler"""
+        index = self.count
+        for name, column in self.columns.items():
+            value = values.get(name)
+            pool = self.__pools.get(name)
+            if pool is not None:
+                if isinstance(value, str):
+                    value = pool.setdefault(value, value)
+                column.append(value)
+                continue
+
+            try:
+                column.append(value)
+            except (TypeError, OverflowError):
+                column.append(0)
+                self.exceptions[name][index] = value
+
+        for name, nested in self.nested.items():
+            nested.extend(values.get(name))
+            self.offsets[name].append(nested.count)
+        self.count += 1
+
+    def extend(self, values: Union[list, dict, None]):
+        if isinstance(values, dict):
+            self.append(values)
+        elif values:
+            for value in values:
+                self.append(value)
+
+    def column(self, name: str) -> Sequence:
+        """Values of a DataValue of all elements, with the values kept aside in place"""
+        column = self.columns[name]
+        exceptions = self.exceptions[name]
+        if not exceptions:
+            return column
+
+        column = list(column)
+        for index, value in exceptions.items():
+            column[index] = value
+        return column
+
+    def parent_indices(self, name: str) -> Iterator[int]:
+        """Yields the index of the parent element for every element of a nested object"""
+        offsets = self.offsets[name]
+        for index in range(self.count):
+            yield from repeat(index, offsets[index + 1] - offsets[index])
+
+    def to_results(self) -> Union[list, dict]:
+        """Builds the values in the shape returned by the ObjectHandler, a single
+        element is returned as dict"""
+        values = list(self)
+        return values[0] if len(values) == 1 else values
+
+    def nbytes(self) -> int:
+        """Approximate memory usage of the stored values in bytes, strings shared by
+        several elements are only counted once"""
+        size = sys.getsizeof(self)
+        for name, column in self.columns.items():
+            size += sys.getsizeof(column) + sys.getsizeof(self.exceptions[name])
+            pool = self.__pools.get(name)
+            if pool is not None:
+                size += sys.getsizeof(pool) + sum(sys.getsizeof(value) for value in pool)
+                size += sum(
+                    sys.getsizeof(value)
+                    for value in column
+                    if value is not None and not isinstance(value, str))
+        for name, nested in self.nested.items():
+            size += sys.getsizeof(self.offsets[name]) + nested.nbytes()
+        return size
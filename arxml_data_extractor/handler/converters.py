@@ -0,0 +1,111 @@
+import arrow
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Union
+
+from arxml_data_extractor.handler.bounded_memo import BoundedMemo
+from arxml_data_extractor.query.data_query import DataQuery
+
+
+def parse_date(value: str) -> datetime:
+    """Parses an ISO 8601 date into a datetime, dates without a timezone are UTC like
+    the ones returned by arrow.get. Other formats supported by arrow are parsed by it.
+
+    Raises:
+        arrow.parser.ParserError: value isn't a valid date
+    """
+    try:
+        date = datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except ValueError:
+        return arrow.get(value).datetime
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
+
+
+class Converters():
+    """Compiles the converters of the value formats for a run. Dates are parsed into
+    datetime objects by parse_date, or into arrow.Arrow objects by arrow.get with
+    arrow_dates. The dates of equal strings are memoized, up to date_memo_size
+    strings. The memo is disabled with a date_memo_size of 0.
+
+    A value that can't be converted is logged and kept as string.
+    """
+
+    def __init__(self, arrow_dates: bool = False, date_memo_size: int = 4096):
+        self.logger = logging.getLogger()
+        self.arrow_dates = arrow_dates
+        self.date_memo = BoundedMemo(date_memo_size) if date_memo_size > 0 else None
+
+    def compile(self, format: DataQuery.Format) -> Callable[[str], Any]:
+        """Compiles the converter of a single value
+
+        Arguments:
+            format {DataQuery.Format} -- format of the DataValue
+
+        Returns:
+            Callable[[str], Any] -- function converting an extracted string
+        """
+        if format == DataQuery.Format.String:
+            return lambda value: value
+
+        convert = self.__parser(format)
+        logger = self.logger
+        if convert is None:
+
+            def keep_value(value: str) -> str:
+                logger.warning(
+                    f'ValueHandler - convertion error {value} to {format} -> fallback to string')
+                return value
+
+            return keep_value
+
+        def convert_value(value: str) -> Any:
+            try:
+                return convert(value)
+            except Exception:
+                logger.exception(
+                    f'ValueHandler - error while converting {value} to {format} -> fallback to string')
+                return value
+
+        return convert_value
+
+    def compile_column(self,
+                       format: DataQuery.Format) -> Callable[[List[Union[str, None]]], List[Any]]:
+        """Compiles the converter of a column of extracted strings, every distinct string
+        of the column is only converted once. Missing values (None) stay None.
+        """
+        if format == DataQuery.Format.String:
+            return lambda values: values
+
+        convert = self.compile(format)
+
+        def convert_column(values: List[Union[str, None]]) -> List[Any]:
+            converted = {value: convert(value) for value in dict.fromkeys(values) if value is not None}
+            converted[None] = None
+            return [converted[value] for value in values]
+
+        return convert_column
+
+    def __parser(self, format: DataQuery.Format) -> Union[Callable[[str], Any], None]:
+        if format == DataQuery.Format.Integer:
+            return int
+        elif format == DataQuery.Format.Float:
+            return float
+        elif format != DataQuery.Format.Date:
+            return None
+
+        parse = arrow.get if self.arrow_dates else parse_date
+        memo = self.date_memo
+        if memo is None:
+            return parse
+
+        def parse_memoized(value: str) -> Any:
+            date = memo.get(value)
+            if date is None:
+                date = parse(value)
+                memo.put(value, date)
+            return date
+
+        return parse_memoized
@@ -0,0 +1,117 @@
+from typing import Iterator, List, Tuple, Union
+from tqdm import tqdm
+import logging
+
+from arxml_data_extractor.asr.asr_fragment_parser import AsrFragmentParser
+from arxml_data_extractor.asr.asr_stream_parser import StreamAnchor
+from arxml_data_extractor.asr.element_index import ElementIndex
+from arxml_data_extractor.handler.intern_pool import summarize
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_value import DataValue
+
+
+class FragmentHandler():
+    """Handles the root DataObjects with the element index of the ARXML file. Only the
+    elements matched by the anchors of the root objects and the elements they refer to
+    are parsed, the rest of the file is never read. Root anchors have the same
+    restrictions as in streaming mode and must only match referable elements.
+    """
+
+    def __init__(self, batched: bool = False, intern_size: int = 65536, arrow_dates: bool = False):
+        self.logger = logging.getLogger()
+        self.batched = batched
+        self.intern_size = intern_size
+        self.arrow_dates = arrow_dates
+
+    def handle(self, arxml: str, index: ElementIndex, queries: List[DataObject]) -> dict:
+        values = {data_object.name: [] for data_object in queries}
+        for name, element_values in self.iterate(arxml, index, queries):
+            values[name].append(element_values)
+
+        return {
+            data_object.name: self.__object_handler.result(data_object, values[data_object.name])
+            for data_object in queries
+        }
+
+    def iterate(self,
+                arxml: str,
+                index: ElementIndex,
+                queries: List[DataObject],
+                chunk_size: Union[int, None] = None) -> Iterator[Tuple[str, dict]]:
+        """Yields the name of the root object and the values of each element in the
+        order of the queries and in document order.
+
+        Raises:
+            ValueError: an anchor isn't supported with the element index
+        """
+        try:
+            anchors = [StreamAnchor(data_object.path) for data_object in queries]
+            for data_object in queries:
+                self.__validate(data_object)
+        except ValueError as e:
+            self.logger.error(str(e))
+            raise
+
+        parser = AsrFragmentParser(arxml, index)
+        object_handler = self.__object_handler = ObjectHandler(
+            parser,
+            use_tag_index=False,
+            progress=False,
+            batched=self.batched,
+            intern_size=self.intern_size,
+            arrow_dates=self.arrow_dates)
+        for data_object in queries:
+            object_handler.compile(data_object)
+
+        try:
+            for data_object, anchor in zip(queries, anchors):
+                yield from self.__handle(parser, object_handler, data_object, anchor, chunk_size)
+        finally:
+            parser.close()
+
+        self.logger.info(f'FragmentHandler - {parser}')
+        self.logger.info(f'FragmentHandler - {parser.xpath_cache}')
+        if object_handler.memo is not None:
+            self.logger.info(f'FragmentHandler - {object_handler.memo}')
+        if object_handler.pools:
+            self.logger.info(f'FragmentHandler - {summarize(object_handler.pools)}')
+
+    def __handle(self, parser: AsrFragmentParser, object_handler: ObjectHandler,
+                 data_object: DataObject, anchor: StreamAnchor,
+                 chunk_size: Union[int, None]) -> Iterator[Tuple[str, dict]]:
+        try:
+            elements = parser.elements(anchor)
+        except ValueError as e:
+            self.logger.error(str(e))
+            raise
+
+        self.logger.info(
+            f'FragmentHandler - [root] handle DataObject(\'{data_object.name}\'): {len(elements)} elements'
+        )
+        if not self.batched:
+            chunk_size = 1
+        elif chunk_size is None:
+            chunk_size = max(1, len(elements))
+
+        with tqdm(
+                total=len(elements),
+                desc=f'Handle DataObject(\'{data_object.name}\')',
+                bar_format="{desc:<70}{percentage:3.0f}% |{bar:70}| {n_fmt:>4}/{total_fmt}"
+        ) as progress:
+            for start in range(0, len(elements), chunk_size):
+                chunk = elements[start:start + chunk_size]
+                for values in object_handler.handle_elements(data_object, chunk):
+                    yield data_object.name, values
+                progress.update(len(chunk))
+
+    def __validate(self, value: Union[DataObject, DataValue]):
+        path = value.path if isinstance(value, DataObject) else value.query.path
+        if isinstance(path, DataQuery.BackReference):
+            raise ValueError(
+                f'FragmentHandler - \'_backref\' anchor of DataObject(\'{value.name}\') isn\'t supported with the element index'
+            )
+        if isinstance(value, DataObject):
+            for v in value.values:
+                self.__validate(v)
@@ -0,0 +1,60 @@
+import sys
+from typing import List, Tuple, Union
+
+
+class InternPool():
+    """Bounded pool of the strings extracted for a DataValue. ARXML files repeat the
+    same values, e.g. reference targets, DEST attributes or categories, and lxml
+    returns a new string for every element. Equal strings are replaced by the first
+    one extracted, so all results share a single object. If the pool is full, new
+    strings are no longer pooled, the strings already pooled stay shared.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+        self.__pool = {}
+
+    def __len__(self) -> int:
+        return len(self.__pool)
+
+    def __str__(self) -> str:
+        return f'InternPool(hits={self.hits}, misses={self.misses}, size={len(self)}/{self.maxsize}, saved={self.saved} bytes)'
+
+    def intern(self, value: Union[str, None]) -> Union[str, None]:
+        """Returns the pooled string equal to the value
+
+        Arguments:
+            value {Union[str, None]} -- extracted string
+
+        Returns:
+            Union[str, None] -- pooled string or the value itself if it isn't pooled
+        """
+        if value is None:
+            return None
+
+        pooled = self.__pool.get(value)
+        if pooled is not None:
+            self.hits += 1
+            self.saved += sys.getsizeof(value)
+            return pooled
+
+        self.misses += 1
+        if len(self.__pool) < self.maxsize:
+            self.__pool[value] = value
+        return value
+
+    def clear(self):
+        self.__pool.clear()
+        self.hits = self.misses = self.saved = 0
+
+
+def summarize(pools: List[Tuple[str, InternPool]]) -> str:
+    """Sums up the hit rate and the memory saved by the pools of all DataValues"""
+    hits = sum(pool.hits for _, pool in pools)
+    lookups = hits + sum(pool.misses for _, pool in pools)
+    saved = sum(pool.saved for _, pool in pools)
+    rate = hits / lookups if lookups else 0.0
+    return f'interned strings of {len(pools)} values: {hits}/{lookups} hits ({rate:.1%}), {saved} bytes saved'
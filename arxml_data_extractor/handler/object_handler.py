@@ -1,46 +1,150 @@
 from lxml.etree import Element, QName
-from typing import Union, List, Any
+from typing import Union, List, Iterator, Tuple
 from tqdm import tqdm
 import logging
 
-from arxml_data_extractor.handler import value_handler
 from arxml_data_extractor.handler.path_handler import PathHandler
+from arxml_data_extractor.handler.query_plan import PlanCompiler, ObjectStep, ValueStep
+from arxml_data_extractor.handler.result_memo import ResultMemo
+from arxml_data_extractor.handler.intern_pool import InternPool
+from arxml_data_extractor.handler.converters import Converters
 from arxml_data_extractor.asr.asr_parser import AsrParser
-from arxml_data_extractor.query.data_query import DataQuery
 from arxml_data_extractor.query.data_object import DataObject
-from arxml_data_extractor.query.data_value import DataValue
 
 
 class ObjectHandler():
+    """Handles DataObjects by executing their compiled plans. A plan is compiled
+    once per DataObject, the first time it is handled or by calling compile.
 
-    def __init__(self, parser: AsrParser):
+    In batched mode the elements of a DataObject are handled level by level: every
+    value is extracted for all elements at once and the anchor of a nested DataObject
+    is evaluated for all parent elements at once. Elements reached from several
+    parents, e.g. by '_xref', are only handled once and share their values.
+
+    The values of nested DataObjects whose anchor may reach the same element from
+    different parents, e.g. '_xref', are memoized per element, so those elements are
+    only handled once. The memo is disabled with a memo_size of 0.
+
+    Equal strings extracted for a DataValue share one object, the pools of the
+    DataValues hold up to intern_size strings each. Interning is disabled with an
+    intern_size of 0.
+
+    Dates are converted into datetime objects, or into arrow.Arrow objects with
+    arrow_dates. In batched mode the values of a DataValue are extracted as strings
+    for all elements first and converted at once, so equal strings are only converted
+    once.
+    """
+
+    def __init__(self,
+                 parser: AsrParser,
+                 use_tag_index: bool = True,
+                 progress: bool = True,
+                 batched: bool = False,
+                 memo_size: int = 4096,
+                 intern_size: int = 65536,
+                 arrow_dates: bool = False):
         self.logger = logging.getLogger()
-        self.path_handler = PathHandler(parser)
+        self.path_handler = PathHandler(parser, use_tag_index)
+        self.progress = progress
+        self.batched = batched
+        self.memo = ResultMemo(memo_size) if memo_size > 0 else None
+        if self.memo is not None and parser.catalog is not None:
+            # values of elements of files dropped by the catalog are discarded with them
+            parser.catalog.attach(self.memo)
+        self.converters = Converters(arrow_dates)
+        self.__compiler = PlanCompiler(self.path_handler, self.__handle_object, intern_size,
+                                       self.converters)
+        self.__plans = {}
+
+    def compile(self, data_object: DataObject) -> ObjectStep:
+        """Compiles the plan of the DataObject, so invalid queries are reported before
+        any element is handled.
+
+        Raises:
+            ValueError: invalid XPath or inline reference
+
+        Returns:
+            ObjectStep -- executable plan of the DataObject
+        """
+        plan = self.__plans.get(data_object)
+        if plan is None:
+            plan = self.__compiler.compile(data_object)
+            self.__plans[data_object] = plan
+        return plan
+
+    @property
+    def pools(self) -> List[Tuple[str, InternPool]]:
+        """Intern pools of all compiled DataValues, named '<DataObject>/<DataValue>'"""
+        return self.__compiler.pools
+
+    def counters(self) -> List[int]:
+        """Hit and miss counters of the memo, the date memo and the XPath cache and the
+        counters of the intern pools in a fixed order. Handlers of the same queries in
+        other processes add theirs up by add_counters.
+        """
+        counters = []
+        for cache in self.__counted_caches():
+            counters += [cache.hits, cache.misses]
+        for _, pool in self.pools:
+            counters += [pool.hits, pool.misses, pool.saved]
+        return counters
+
+    def add_counters(self, counters: List[int]):
+        """Adds the counters of a handler of the same queries, see counters"""
+        counters = iter(counters)
+        for cache in self.__counted_caches():
+            cache.hits += next(counters)
+            cache.misses += next(counters)
+        for _, pool in self.pools:
+            pool.hits += next(counters)
+            pool.misses += next(counters)
+            pool.saved += next(counters)
+
+    def __counted_caches(self) -> list:
+        caches = (self.memo, self.converters.date_memo, self.path_handler.parser.xpath_cache)
+        return [cache for cache in caches if cache is not None]
 
     def handle(self, data_object: DataObject, node: Element = None) -> Union[list, dict]:
-        is_not_root = True
-        if node is None:
-            is_not_root = False
-            node = self.path_handler.parser.root
+        plan = self.compile(data_object)
+        if node is not None:
+            return self.__handle_object(plan, node)
 
-        if is_not_root:
-            self.logger.info(f'ObjectHandler - handle DataObject(\'{data_object.name}\')')
-        else:
-            self.logger.info(f'ObjectHandler - [root] handle DataObject(\'{data_object.name}\')')
+        self.logger.info(f'ObjectHandler - [root] handle DataObject(\'{data_object.name}\')')
+        return self.result(data_object, list(self.iterate(data_object)))
+
+    def iterate(self, data_object: DataObject, chunk_size: Union[int, None] = None) -> Iterator[dict]:
+        """Handles a root DataObject and yields the values of its elements one after
+        another in document order, so they can be written before all elements are
+        handled.
+
+        Arguments:
+            data_object {DataObject} -- root DataObject
+            chunk_size {Union[int, None]} -- number of elements handled at once in batched
+                mode, all elements if None. Element by element handling ignores it.
+
+        Yields:
+            dict -- values of an element
+        """
+        plan = self.compile(data_object)
+        elements = [e for e in plan.elements(self.path_handler.parser.root) if e is not None]
+        if not self.batched:
+            chunk_size = 1
+        elif chunk_size is None:
+            chunk_size = max(1, len(elements))
 
-        values = []
-        elements = self.path_handler.elements_by_path(data_object.path, node)
-        for element in tqdm(
-                elements,
+        with tqdm(
+                total=len(elements),
                 desc=f'Handle DataObject(\'{data_object.name}\')',
-                disable=is_not_root,
-                bar_format="{desc:<70}{percentage:3.0f}% |{bar:70}| {n_fmt:>4}/{total_fmt}"):
-            if element is not None:
-                self.logger.info(
-                    f'ObjectHandler - element found: \'{QName(element).localname}\' at line {element.sourceline - 1}'
-                )
-                values.append(self.__handle_values(data_object.values, element))
+                disable=not self.progress,
+                bar_format="{desc:<70}{percentage:3.0f}% |{bar:70}| {n_fmt:>4}/{total_fmt}"
+        ) as progress:
+            for start in range(0, len(elements), chunk_size):
+                chunk = elements[start:start + chunk_size]
+                yield from self.handle_elements(data_object, chunk)
+                progress.update(len(chunk))
 
+    def result(self, data_object: DataObject, values: List[dict]) -> Union[list, dict]:
+        """Shapes the values of all elements of a DataObject, a single element is returned as dict"""
         if not values:
             self.logger.warning(
                 f'ObjectHandler - no values found for DataObject(\'{data_object.name}\')')
@@ -51,37 +155,109 @@ class ObjectHandler():
 
         return values[0] if len(values) == 1 else values
 
-    def __handle_values(self, values: List[Union[DataValue, DataObject]], node: Element) -> dict:
-        results = {}
-        for value in values:
-            if isinstance(value, DataObject):
-                results[value.name] = self.handle(value, node)
-            elif isinstance(value, DataValue):
-                results[value.name] = self.__handle_value(value.query, node)
-                if results[value.name] is None:
-                    self.logger.info(
-                        f'ObjectHandler - no value found for DataValue(\'{value.name}\')')
-                else:
-                    self.logger.info(
-                        f'ObjectHandler - value found: DataValue(\'{value.name}\') = \'{results[value.name]}\''
-                    )
+    def handle_element(self, data_object: DataObject, element: Element) -> dict:
+        """Handles the values of the DataObject for an element already matched by its anchor"""
+        return self.handle_elements(data_object, [element])[0]
+
+    def handle_elements(self, data_object: DataObject, elements: List[Element]) -> List[dict]:
+        """Handles the values of the DataObject for elements already matched by its anchor"""
+        plan = self.compile(data_object)
+        if not self.batched:
+            return [self.__handle_element(plan, element) for element in elements]
+
+        unique = list(dict.fromkeys(elements))
+        values = self.__handle_batch(plan, unique)
+        if len(unique) == len(elements):
+            return values
+        by_element = dict(zip(unique, values))
+        return [by_element[element] for element in elements]
+
+    def __handle_object(self, plan: ObjectStep, node: Element) -> Union[list, dict]:
+        self.logger.info(f'ObjectHandler - handle DataObject(\'{plan.name}\')')
+
+        values = [
+            self.__handle_nested(plan, element)
+            for element in plan.elements(node)
+            if element is not None
+        ]
+        return self.result(plan.data_object, values)
+
+    def __handle_nested(self, plan: ObjectStep, element: Element) -> dict:
+        if self.memo is None or not plan.repeats:
+            return self.__handle_element(plan, element)
+
+        key = (plan, element)
+        values = self.memo.get(key)
+        if values is None:
+            values = self.__handle_element(plan, element)
+            self.memo.put(key, values)
+        return values
+
+    def __handle_nested_batch(self, plan: ObjectStep, elements: List[Element]) -> dict:
+        if self.memo is None or not plan.repeats:
+            return dict(zip(elements, self.__handle_batch(plan, elements)))
+
+        values = {}
+        missing = []
+        for element in elements:
+            memoized = self.memo.get((plan, element))
+            if memoized is None:
+                missing.append(element)
             else:
-                error = f'ObjectHandler - invalid value type ({type(value)}). Value must be of type DataObject or DataValue'
-                self.logger.error(error)
-                raise TypeError(error)
+                values[element] = memoized
+
+        for element, value in zip(missing, self.__handle_batch(plan, missing)):
+            values[element] = value
+            self.memo.put((plan, element), value)
+        return values
+
+    def __handle_batch(self, plan: ObjectStep, elements: List[Element]) -> List[dict]:
+        if not elements:
+            return []
+        self.logger.info(
+            f'ObjectHandler - batch handle DataObject(\'{plan.name}\'): {len(elements)} elements')
+
+        results = [{} for _ in elements]
+        for step in plan.steps:
+            name = step.name
+            if isinstance(step, ValueStep):
+                if step.convert_column is not None:
+                    extract = step.extract_raw
+                    values = step.convert_column([extract(element) for element in elements])
+                    for result, value in zip(results, values):
+                        result[name] = value
+                    continue
+
+                extract = step.extract
+                for result, element in zip(results, elements):
+                    result[name] = extract(element)
+                continue
+
+            groups = step.batch(elements)
+            children = list(
+                dict.fromkeys(element for group in groups for element in group if element is not None))
+            values = self.__handle_nested_batch(step, children)
+            for result, group in zip(results, groups):
+                result[name] = self.result(
+                    step.data_object, [values[element] for element in group if element is not None])
 
         return results
 
-    def __handle_value(self, query: DataQuery, node: Element) -> Any:
-        if isinstance(query.path, DataQuery.XPath):
-            if query.path.is_reference:
-                element = self.path_handler.element_by_inline_ref(query.path, node)
-            else:
-                element = self.path_handler.element_by_xpath(query.path.xpath, node)
-        else:  # DataQuery.Reference isn't allowed on DataValue
-            return None
+    def __handle_element(self, plan: ObjectStep, element: Element) -> dict:
+        log = self.logger.isEnabledFor(logging.INFO)
+        if log:
+            self.logger.info(
+                f'ObjectHandler - element found: \'{QName(element).localname}\' at line {element.sourceline - 1}'
+            )
 
-        if element is None:
-            return None
+        results = {}
+        for step in plan.steps:
+            value = results[step.name] = step.extract(element)
+            if log and isinstance(step, ValueStep):
+                if value is None:
+                    self.logger.info(f'ObjectHandler - no value found for DataValue(\'{step.name}\')')
+                else:
+                    self.logger.info(
+                        f'ObjectHandler - value found: DataValue(\'{step.name}\') = \'{value}\'')
 
-        return value_handler.handle(query, element)
+        return results
@@ -0,0 +1,161 @@
+from typing import List, Tuple, Union
+from tqdm import tqdm
+import logging
+import math
+import multiprocessing
+import os
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.file_catalog import FileCatalog
+from arxml_data_extractor.asr.prune_plan import PrunePlan
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+
+# state of the worker processes, inherited on fork or set up by the initializer
+_object_handler = None
+_queries = None
+_elements = None
+# counters of the handler of a worker before its first task
+_baseline = None
+
+
+def _anchor_elements(object_handler: ObjectHandler, queries: List[DataObject]) -> list:
+    root = object_handler.path_handler.parser.root
+    return [[
+        element for element in object_handler.path_handler.elements_by_path(data_object.path, root)
+        if element is not None
+    ] for data_object in queries]
+
+
+def _initialize(arxml: Union[str, List[str]], queries: List[DataObject], batched: bool, intern_size: int,
+                arrow_dates: bool, catalog: Union[FileCatalog, None], prune: Union[PrunePlan, None]):
+    global _object_handler, _queries, _elements
+    _object_handler = ObjectHandler(
+        AsrParser(arxml, catalog=catalog, prune=prune),
+        progress=False,
+        batched=batched,
+        intern_size=intern_size,
+        arrow_dates=arrow_dates)
+    for data_object in queries:
+        _object_handler.compile(data_object)
+    _object_handler.path_handler.index_anchors(queries)
+    _queries = queries
+    _elements = _anchor_elements(_object_handler, queries)
+
+
+def _handle(task: Tuple[int, int, int, int]) -> Tuple[int, List[dict], int, List[int]]:
+    global _baseline
+    if _baseline is None:
+        _baseline = _object_handler.counters()
+
+    task_index, object_index, start, stop = task
+    data_object = _queries[object_index]
+    values = _object_handler.handle_elements(data_object, _elements[object_index][start:stop])
+    # the counters of the worker since its first task, the last ones of a worker are its total
+    counters = [count - base for count, base in zip(_object_handler.counters(), _baseline)]
+    return task_index, values, os.getpid(), counters
+
+
+class ParallelHandler():
+    """Handles the root DataObjects in a pool of worker processes. The elements found
+    by the anchors are split into chunks, so even a single root object with many
+    elements is spread over all workers. Workers only receive the position of their
+    chunk within the anchor results. On platforms supporting fork, the workers share
+    the already parsed tree and anchor results of the parent process. Otherwise every
+    worker parses the ARXML file and resolves the anchors on its own.
+
+    The counters of the memos, intern pools and XPath caches of all workers are added
+    to the ObjectHandler of the parent process, object_handler of the last run.
+    """
+
+    def __init__(self,
+                 jobs: int,
+                 chunks_per_job: int = 4,
+                 batched: bool = False,
+                 intern_size: int = 65536,
+                 arrow_dates: bool = False):
+        self.logger = logging.getLogger()
+        self.jobs = jobs
+        self.chunks_per_job = chunks_per_job
+        self.batched = batched
+        self.intern_size = intern_size
+        self.arrow_dates = arrow_dates
+        self.object_handler = None
+
+    def handle(self, arxml: Union[str, List[str]], parser: AsrParser, queries: List[DataObject]) -> list:
+        """Handles the root DataObjects and returns their results in the order of the queries"""
+        global _object_handler, _queries, _elements, _baseline
+
+        object_handler = self.object_handler = ObjectHandler(
+            parser,
+            progress=False,
+            batched=self.batched,
+            intern_size=self.intern_size,
+            arrow_dates=self.arrow_dates)
+        for data_object in queries:
+            object_handler.compile(data_object)
+        object_handler.path_handler.index_anchors(queries)
+        elements = _anchor_elements(object_handler, queries)
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            if self.__uses_references(queries):
+                parser.build_indexes()
+            _object_handler, _queries, _elements = object_handler, queries, elements
+            initializer, initargs = None, ()
+        else:
+            context = multiprocessing.get_context('spawn')
+            initializer, initargs = _initialize, (arxml, queries, self.batched, self.intern_size,
+                                                 self.arrow_dates, parser.catalog, parser.prune)
+
+        tasks = self.__tasks(elements)
+        chunks = [None] * len(tasks)
+        workers = {}
+        total = sum(len(e) for e in elements)
+        self.logger.info(
+            f'ParallelHandler - handle {total} elements of {len(queries)} DataObjects in {len(tasks)} chunks with {self.jobs} processes'
+        )
+        try:
+            with context.Pool(self.jobs, initializer, initargs) as pool, tqdm(
+                    total=total,
+                    desc=f'Handle DataObjects ({self.jobs} processes)',
+                    bar_format="{desc:<70}{percentage:3.0f}% |{bar:70}| {n_fmt:>4}/{total_fmt}"
+            ) as progress:
+                for task_index, values, worker, counters in pool.imap_unordered(_handle, tasks):
+                    chunks[task_index] = values
+                    workers[worker] = counters
+                    progress.update(len(values))
+        finally:
+            _object_handler = _queries = _elements = _baseline = None
+
+        for counters in workers.values():
+            object_handler.add_counters(counters)
+
+        results = [[] for _ in queries]
+        for (_, object_index, _, _), values in zip(tasks, chunks):
+            results[object_index].extend(values)
+        return [
+            object_handler.result(data_object, values)
+            for data_object, values in zip(queries, results)
+        ]
+
+    def __tasks(self, elements: List[list]) -> List[Tuple[int, int, int, int]]:
+        total = sum(len(e) for e in elements)
+        chunk_size = max(1, math.ceil(total / (self.jobs * self.chunks_per_job)))
+
+        tasks = []
+        for object_index, object_elements in enumerate(elements):
+            for start in range(0, len(object_elements), chunk_size):
+                tasks.append((len(tasks), object_index, start, start + chunk_size))
+        return tasks
+
+    @classmethod
+    def __uses_references(cls, data_objects: list) -> bool:
+        for data_object in data_objects:
+            path = data_object.path if isinstance(data_object, DataObject) else data_object.query.path
+            if not isinstance(path, DataQuery.XPath) or path.is_reference:
+                return True
+            if isinstance(data_object, DataObject) and cls.__uses_references(data_object.values):
+                return True
+        return False
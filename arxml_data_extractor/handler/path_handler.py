@@ -1,51 +1,318 @@
 from lxml.etree import Element
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Callable
 import logging
+import re
 
 from arxml_data_extractor.asr.asr_parser import AsrParser
 from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
 
 
 class PathHandler():
+    __descendant_path = re.compile(r'^\.?//[A-Za-z_][\w.-]*(/[A-Za-z_][\w.-]*)*$')
+    __child_path = re.compile(r'^(\./)?[A-Za-z_][\w.-]*(/[A-Za-z_][\w.-]*)*$')
 
-    def __init__(self, parser: AsrParser):
+    def __init__(self, parser: AsrParser, use_tag_index: bool = True):
         self.logger = logging.getLogger()
         self.parser = parser
+        self.use_tag_index = use_tag_index
+        self.__steps = {}
 
-    def elements_by_path(self, path: Union[DataQuery.XPath, DataQuery.Reference],
+    def elements_by_path(self, path: Union[DataQuery.XPath, DataQuery.Reference,
+                                           DataQuery.BackReference],
                          node: Element) -> Union[List[Element], None]:
+        return self.compile_path(path)(node)
+
+    def compile_path(
+        self, path: Union[DataQuery.XPath, DataQuery.Reference, DataQuery.BackReference]
+    ) -> Callable[[Element], List[Element]]:
+        """Compiles the anchor of a DataObject into a function returning all elements
+        found from a node. Invalid XPath expressions are reported here instead of
+        while extracting the values.
+
+        Raises:
+            etree.XPathSyntaxError: invalid XPath expression
+
+        Returns:
+            Callable[[Element], List[Element]] -- function returning the elements of a node
+        """
         if isinstance(path, DataQuery.XPath):
-            elements = self.elements_by_xpath(path.xpath, node)
-            if not elements:
-                self.logger.warning(f'PathHandler - no elements found with XPath \'{path.xpath}\'')
-                return elements
+            xpath = path.xpath
+            find = self.compile_xpath(xpath)
 
-            if path.is_reference is False:
-                return elements
+            def elements_by_xpath(node: Element) -> List[Element]:
+                elements = find(node)
+                if not elements:
+                    self.logger.warning(f'PathHandler - no elements found with XPath \'{xpath}\'')
+                    return elements
 
-            if len(elements) != 1:
-                error = f'PathHandler - too many references found with XPath \'{path.xpath}\''
-                self.logger.error(error)
-                raise Exception(error)
-            return [self.element_by_ref(elements[0].text)]
+                if path.is_reference is False:
+                    return elements
 
+                if len(elements) != 1:
+                    error = f'PathHandler - too many references found with XPath \'{xpath}\''
+                    self.logger.error(error)
+                    raise Exception(error)
+                return [self.element_by_ref(elements[0].text)]
+
+            return elements_by_xpath
         elif isinstance(path, DataQuery.Reference):
-            return [self.element_by_ref(path.ref)]
+            return lambda node: [self.element_by_ref(path.ref)]
+        elif isinstance(path, DataQuery.BackReference):
+            return lambda node: self.elements_by_backref(path.tag, node)
         else:
-            error = f'PathHandler - invalid path type (type: {type(path)}). Path must be of type DataQuery.XPath or DataQuery.Reference'
+            error = f'PathHandler - invalid path type (type: {type(path)}). Path must be of type DataQuery.XPath, DataQuery.Reference or DataQuery.BackReference'
             self.logger.error(error)
             raise TypeError(error)
 
+    def compile_path_batch(
+        self, path: Union[DataQuery.XPath, DataQuery.Reference, DataQuery.BackReference]
+    ) -> Callable[[List[Element]], List[List[Element]]]:
+        """Compiles the anchor of a nested DataObject into a function returning the
+        elements of all parent nodes at once, grouped by parent. The references of
+        '_xref' anchors are collected from all parents and every distinct reference is
+        resolved only once.
+
+        Raises:
+            etree.XPathSyntaxError: invalid XPath expression
+
+        Returns:
+            Callable[[List[Element]], List[List[Element]]] -- function returning the elements of each node
+        """
+        if isinstance(path, DataQuery.XPath):
+            xpath = path.xpath
+            find_all = self.__compile_xpath_batch(xpath)
+
+            def elements_by_xpath(nodes: List[Element]) -> List[List[Element]]:
+                groups = find_all(nodes)
+                missing = sum(1 for elements in groups if not elements)
+                if missing:
+                    self.logger.warning(
+                        f'PathHandler - no elements found with XPath \'{xpath}\' for {missing} of {len(nodes)} elements'
+                    )
+                if path.is_reference is False:
+                    return groups
+
+                referred = {}
+                results = []
+                for elements in groups:
+                    if not elements:
+                        results.append(elements)
+                        continue
+                    if len(elements) != 1:
+                        error = f'PathHandler - too many references found with XPath \'{xpath}\''
+                        self.logger.error(error)
+                        raise Exception(error)
+
+                    reference = elements[0].text
+                    if reference not in referred:
+                        referred[reference] = self.element_by_ref(reference)
+                    results.append([referred[reference]])
+                return results
+
+            return elements_by_xpath
+        elif isinstance(path, DataQuery.Reference):
+
+            def elements_by_ref(nodes: List[Element]) -> List[List[Element]]:
+                element = self.element_by_ref(path.ref)
+                return [[element] for _ in nodes]
+
+            return elements_by_ref
+        elif isinstance(path, DataQuery.BackReference):
+            return lambda nodes: [self.elements_by_backref(path.tag, node) for node in nodes]
+        else:
+            error = f'PathHandler - invalid path type (type: {type(path)}). Path must be of type DataQuery.XPath, DataQuery.Reference or DataQuery.BackReference'
+            self.logger.error(error)
+            raise TypeError(error)
+
+    def __compile_xpath_batch(self, path: str) -> Callable[[List[Element]], List[List[Element]]]:
+        find = self.compile_xpath(path)
+
+        steps = None
+        if self.use_tag_index and path[0] != '/':
+            descendant = not self.__child_path.match(path)
+            steps = self.descendant_steps(path) if descendant else path.lstrip('./').split('/')
+        if steps is None:
+            return lambda nodes: [find(node) for node in nodes]
+
+        def elements_by_xpath(nodes: List[Element]) -> List[List[Element]]:
+            # the tag index only covers the parsed files, elements of files loaded by
+            # the catalog are searched one by one
+            root = self.parser.root
+            indexed = [i for i, node in enumerate(nodes) if node.getroottree().getroot() is root]
+            # a single node is cheaper to search than all elements of the tag
+            if len(indexed) < 2:
+                return [find(node) for node in nodes]
+            if len(indexed) == len(nodes):
+                return self.__group_by_tag_index(steps, descendant, nodes)
+
+            groups = [None] * len(nodes)
+            found = self.__group_by_tag_index(steps, descendant, [nodes[i] for i in indexed])
+            for i, elements in zip(indexed, found):
+                groups[i] = elements
+            return [find(node) if elements is None else elements for node, elements in zip(nodes, groups)]
+
+        return elements_by_xpath
+
+    def __group_by_tag_index(self, steps: List[str], descendant: bool,
+                             nodes: List[Element]) -> List[List[Element]]:
+        positions = {}
+        for i, node in enumerate(nodes):
+            positions.setdefault(node, []).append(i)
+
+        namespace = f'{{{AsrParser.ns["ar"]}}}'
+        parents = [namespace + step for step in reversed(steps[:-1])]
+        groups = [[] for _ in nodes]
+        for element in self.parser.elements_by_tag(steps[-1]):
+            current = element
+            for tag in parents:
+                current = current.getparent()
+                if current is None or current.tag != tag:
+                    break
+            else:
+                # the first step is a child ('A/B') or any descendant ('.//A/B') of the node
+                ancestor = current.getparent()
+                while ancestor is not None:
+                    for i in positions.get(ancestor, ()):
+                        groups[i].append(element)
+                    if not descendant:
+                        break
+                    ancestor = ancestor.getparent()
+        return groups
+
     def elements_by_xpath(self, path: str, node: Element) -> List[Element]:
-        xpath = self.parser.assemble_xpath(path)
-        return self.parser.find(node, xpath)
+        return self.compile_xpath(path)(node)
 
-    def element_by_xpath(self, path: str, node: Element) -> Union[Element, None]:
-        element = next(iter(self.elements_by_xpath(path, node)), None)
-        if element is None:
-            self.logger.warning(f'PathHandler - no element found with XPath \'{path}\'')
+    def compile_xpath(self, path: str) -> Callable[[Element], List[Element]]:
+        """Compiles the XPath into a function returning all elements found from a node.
+        Descendant-axis paths of plain element names are answered from the tag index,
+        a single child element name by lxml's iterchildren. The XPath expression is
+        taken from the cache of the parser, plans keep the returned function.
+
+        Raises:
+            etree.XPathSyntaxError: invalid XPath expression
+
+        Returns:
+            Callable[[Element], List[Element]] -- function returning the elements of a node
+        """
+        tag = self.child_tag(path)
+        if tag is not None:
+            return lambda node: list(node.iterchildren(tag))
+
+        xpath = self.parser.compile_xpath(path)
+        find = self.parser.find
+        steps = self.descendant_steps(path) if self.use_tag_index else None
+        if steps is None:
+            compiled = lambda node: find(node, xpath)
+        else:
+            include_root = path[0] == '/'
+
+            def compiled(node: Element) -> List[Element]:
+                # './/' is only equivalent to a document wide search if started from the root
+                if include_root or node is self.parser.root:
+                    return self.__elements_by_tag_index(steps, include_root)
+                return find(node, xpath)
+
+        return compiled
+
+    def descendant_steps(self, path: str) -> Union[List[str], None]:
+        """Splits a descendant-axis XPath that only consists of element names,
+        e.g. './/I-SIGNAL-TO-PDU-MAPPINGS/I-SIGNAL-TO-I-PDU-MAPPING', into its steps.
+
+        Returns:
+            Union[List[str], None] -- element names or None for any other XPath
+        """
+        if path not in self.__steps:
+            if self.__descendant_path.match(path):
+                self.__steps[path] = path.lstrip('./').split('/')
+            else:
+                self.__steps[path] = None
+        return self.__steps[path]
+
+    def child_tag(self, path: str) -> Union[str, None]:
+        """Qualifies a path of a single child element name, e.g. 'SHORT-NAME' or
+        './LENGTH', with the AUTOSAR namespace, so the children can be found by lxml's
+        iterchildren without the XPath engine. Paths of several steps are evaluated
+        faster by the compiled XPath than by lxml's find or nested iterchildren.
+
+        Returns:
+            Union[str, None] -- qualified element name or None for any other XPath
+        """
+        if not self.__child_path.match(path):
             return None
-        return element
+        if path.startswith('./'):
+            path = path[2:]
+        if '/' in path:
+            return None
+        return f'{{{AsrParser.ns["ar"]}}}{path}'
+
+    def selects_descendants(self, path: str) -> bool:
+        """Checks if the XPath only consists of element names below the node, e.g.
+        './/I-SIGNAL-TO-I-PDU-MAPPING' or 'I-PDU-TIMING-SPECIFICATIONS/I-PDU-TIMING'.
+        Distinct nodes never share elements found by such a path unless one node is
+        an ancestor of the other.
+        """
+        return path[0] != '/' and (bool(self.__child_path.match(path)) or
+                                   self.descendant_steps(path) is not None)
+
+    def index_anchors(self, data_objects: List[DataObject]):
+        """Indexes the tags of all descendant-axis anchors with a single pass over the tree"""
+        tags = set()
+        objects = list(data_objects)
+        while objects:
+            data_object = objects.pop()
+            if isinstance(data_object.path, DataQuery.XPath):
+                steps = self.descendant_steps(data_object.path.xpath)
+                if steps is not None:
+                    tags.add(steps[-1])
+            objects.extend(v for v in data_object.values if isinstance(v, DataObject))
+
+        self.parser.index_tags(tags)
+
+    def __elements_by_tag_index(self, steps: List[str], include_root: bool) -> List[Element]:
+        elements = self.parser.elements_by_tag(steps[-1])
+        if len(steps) == 1 and include_root:
+            return elements
+
+        namespace = f'{{{AsrParser.ns["ar"]}}}'
+        parents = [namespace + step for step in reversed(steps[:-1])]
+        results = []
+        for element in elements:
+            current = element
+            for tag in parents:
+                current = current.getparent()
+                if current is None or current.tag != tag:
+                    break
+            else:
+                # the first step of './/' must not be the root itself
+                if include_root or current.getparent() is not None:
+                    results.append(element)
+        return results
+
+    def element_by_xpath(self, path: str, node: Element) -> Union[Element, None]:
+        return self.__first(path)(node)
+
+    def __first(self, path: str) -> Callable[[Element], Union[Element, None]]:
+        tag = self.child_tag(path)
+        if tag is not None:
+
+            def element_by_path(node: Element) -> Union[Element, None]:
+                element = next(node.iterchildren(tag), None)
+                if element is None:
+                    self.logger.warning(f'PathHandler - no element found with XPath \'{path}\'')
+                return element
+
+            return element_by_path
+
+        find = self.compile_xpath(path)
+
+        def element_by_xpath(node: Element) -> Union[Element, None]:
+            element = next(iter(find(node)), None)
+            if element is None:
+                self.logger.warning(f'PathHandler - no element found with XPath \'{path}\'')
+            return element
+
+        return element_by_xpath
 
     def element_by_ref(self, ref: str) -> Union[Element, None]:
         element = self.parser.find_reference(ref)
@@ -54,25 +321,95 @@ class PathHandler():
             return None
         return element
 
-    def element_by_inline_ref(self, path: DataQuery.XPath, node: Element) -> Union[Element, None]:
-        path_to_reference, path_to_value = self.__split(path.xpath)
-
-        reference = self.element_by_xpath(path_to_reference, node)
-        if reference is None or 'REF' not in reference.tag:
+    def elements_by_backref(self, tag: str, node: Element) -> List[Element]:
+        """Finds all elements of the given tag referencing the node. For every reference
+        pointing to the node, the closest ancestor-or-self with the tag is returned.
+        """
+        path = self.parser.path_of(node)
+        if path is None:
             self.logger.warning(
-                f'PathHandler - processing inline reference, no reference found at \'{path.xpath}\''
+                f'PathHandler - processing back reference, element at line {node.sourceline - 1} isn\'t referable'
             )
+            return []
+
+        qualified_tag = f'{{{AsrParser.ns["ar"]}}}{tag}'
+        elements = []
+        found = set()
+        for reference in self.parser.back_references.get(path, []):
+            element = reference
+            while element is not None and element.tag != qualified_tag:
+                element = element.getparent()
+            if element is not None and element not in found:
+                found.add(element)
+                elements.append(element)
+
+        if not elements:
+            self.logger.warning(
+                f'PathHandler - no elements \'{tag}\' found referencing \'{path}\'')
+        return elements
+
+    def compile_text(self, path: DataQuery.XPath) -> Union[Callable[[Element], Union[str, None]], None]:
+        """Compiles the path of a DataValue extracting the text of a single child element
+        into a function returning the text, without the XPath engine.
+
+        Returns:
+            Union[Callable[[Element], Union[str, None]], None] -- function returning the
+                text of a node or None if the path isn't a single child element name
+        """
+        tag = None if path.is_reference else self.child_tag(path.xpath)
+        if tag is None:
+            return None
+
+        def text_by_path(node: Element) -> Union[str, None]:
+            for element in node.iterchildren(tag):
+                return element.text
+            self.logger.warning(f'PathHandler - no element found with XPath \'{path.xpath}\'')
             return None
 
+        return text_by_path
+
+    def element_by_inline_ref(self, path: DataQuery.XPath, node: Element) -> Union[Element, None]:
+        return self.compile_element(path)(node)
+
+    def compile_element(self, path: DataQuery.XPath) -> Callable[[Element], Union[Element, None]]:
+        """Compiles the path of a DataValue into a function returning the element holding
+        the value. Inline references are split once here.
+
+        Raises:
+            etree.XPathSyntaxError: invalid XPath expression
+            ValueError: invalid inline reference syntax
+
+        Returns:
+            Callable[[Element], Union[Element, None]] -- function returning the element of a node
+        """
+        if not path.is_reference:
+            return self.__first(path.xpath)
+
+        path_to_reference, path_to_value = self.__split(path.xpath)
+        reference_by_xpath = self.__first(path_to_reference)
         # if inline reference and value path is SHORT-NAME, it skips getting referenced element
         # to increase parsing performance. Instead the element containing the reference is returned.
         # This is only possible because the SHORT-NAME can be extracted directly from reference.text.
         # The special treatment is implemented in ValueHandler.
-        if path_to_value == 'SHORT-NAME':
-            return reference
+        value_by_xpath = None if path_to_value == 'SHORT-NAME' else self.__first(path_to_value)
+
+        def element_by_inline_ref(node: Element) -> Union[Element, None]:
+            reference = reference_by_xpath(node)
+            if reference is None or 'REF' not in reference.tag:
+                self.logger.warning(
+                    f'PathHandler - processing inline reference, no reference found at \'{path.xpath}\''
+                )
+                return None
+
+            if value_by_xpath is None:
+                return reference
+
+            referred_element = self.element_by_ref(reference.text)
+            if referred_element is None:
+                return None
+            return value_by_xpath(referred_element)
 
-        referred_element = self.element_by_ref(reference.text)
-        return self.element_by_xpath(path_to_value, referred_element)
+        return element_by_inline_ref
 
     def __split(self, inline_ref: str) -> Tuple[str, str]:
         start_inline_ref = '&('
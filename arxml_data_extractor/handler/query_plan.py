@@ -0,0 +1,176 @@
+from lxml import etree
+from lxml.etree import Element
+from typing import Union, List, Any, Callable, Tuple
+import logging
+
+from arxml_data_extractor.handler import value_handler
+from arxml_data_extractor.handler.converters import Converters
+from arxml_data_extractor.handler.intern_pool import InternPool
+from arxml_data_extractor.handler.path_handler import PathHandler
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_value import DataValue
+
+
+class ValueStep():
+    """Extracts the value of a DataValue from the element of its DataObject. Values that
+    need a conversion can also be extracted as strings and converted column by column.
+    """
+    __slots__ = ('name', 'data_value', 'extract', 'pool', 'extract_raw', 'convert_column')
+
+    def __init__(self,
+                 name: str,
+                 data_value: DataValue,
+                 extract: Callable[[Element], Any],
+                 pool: Union[InternPool, None] = None):
+        self.name = name
+        self.data_value = data_value
+        self.extract = extract
+        self.pool = pool
+        self.extract_raw = None
+        self.convert_column = None
+
+
+class ObjectStep():
+    """Finds the elements of a DataObject, either of a single node or grouped for a
+    batch of nodes, and holds the steps of its values"""
+    __slots__ = ('name', 'data_object', 'elements', 'batch', 'steps', 'extract', 'repeats')
+
+    def __init__(self, name: str, data_object: DataObject,
+                 elements: Callable[[Element], List[Element]],
+                 batch: Callable[[List[Element]], List[List[Element]]],
+                 steps: List[Union[ValueStep, 'ObjectStep']]):
+        self.name = name
+        self.data_object = data_object
+        self.elements = elements
+        self.batch = batch
+        self.steps = steps
+        self.extract = None
+        self.repeats = True
+
+
+class PlanCompiler():
+    """Compiles the DataObjects built by the QueryBuilder into a tree of steps. All
+    XPath expressions are compiled, inline references are split and the value getters
+    and converters are bound once, so handling an element only calls the bound
+    functions of the steps.
+
+    Every DataValue with the String format gets an InternPool of intern_size strings,
+    interning is disabled with an intern_size of 0. The other formats are converted by
+    the converters of the run.
+    """
+
+    def __init__(self,
+                 path_handler: PathHandler,
+                 handle_object: Callable[[ObjectStep, Element], Any],
+                 intern_size: int = 65536,
+                 converters: Union[Converters, None] = None):
+        self.logger = logging.getLogger()
+        self.path_handler = path_handler
+        self.handle_object = handle_object
+        self.intern_size = intern_size
+        self.converters = converters or Converters()
+        self.pools: List[Tuple[str, InternPool]] = []
+
+    def compile(self, data_object: DataObject) -> ObjectStep:
+        """Compiles the DataObject and all of its values
+
+        Arguments:
+            data_object {DataObject} -- root or nested DataObject
+
+        Raises:
+            ValueError: invalid XPath or inline reference
+            TypeError: invalid value type
+
+        Returns:
+            ObjectStep -- executable plan of the DataObject
+        """
+        try:
+            elements = self.path_handler.compile_path(data_object.path)
+            batch = self.path_handler.compile_path_batch(data_object.path)
+        except etree.XPathError as e:
+            error = f'PlanCompiler - invalid XPath \'{data_object.path.xpath}\' of DataObject(\'{data_object.name}\'): {e}'
+            self.logger.error(error)
+            raise ValueError(error)
+
+        steps = [self.__compile_value(value, data_object) for value in data_object.values]
+        step = ObjectStep(data_object.name, data_object, elements, batch, steps)
+        step.extract = lambda node: self.handle_object(step, node)
+        # only references and arbitrary XPath expressions reach the same element
+        # from different parents
+        path = data_object.path
+        step.repeats = not (isinstance(path, DataQuery.XPath) and not path.is_reference and
+                            self.path_handler.selects_descendants(path.xpath))
+        return step
+
+    def __compile_value(self, value: Union[DataValue, DataObject],
+                        parent: DataObject) -> Union[ValueStep, ObjectStep]:
+        if isinstance(value, DataObject):
+            return self.compile(value)
+        elif isinstance(value, DataValue):
+            format = value.query.format
+            if format != DataQuery.Format.String:
+                step = ValueStep(value.name, value, self.__compile_query(value))
+                step.extract_raw = self.__compile_query(value, convert=False)
+                step.convert_column = self.converters.compile_column(format)
+                return step
+
+            pool = None
+            if self.intern_size > 0:
+                pool = InternPool(self.intern_size)
+                self.pools.append((f'{parent.name}/{value.name}', pool))
+            return ValueStep(value.name, value, self.__compile_query(value, pool), pool)
+        else:
+            error = f'PlanCompiler - invalid value type ({type(value)}) in DataObject(\'{parent.name}\'). Value must be of type DataObject or DataValue'
+            self.logger.error(error)
+            raise TypeError(error)
+
+    def __compile_query(self,
+                        data_value: DataValue,
+                        pool: Union[InternPool, None] = None,
+                        convert: bool = True) -> Callable[[Element], Any]:
+        query = data_value.query
+        if not isinstance(query.path, DataQuery.XPath):
+            # DataQuery.Reference isn't allowed on DataValue
+            return lambda node: None
+
+        text_by_path = self.path_handler.compile_text(query.path) if query.value == 'text' else None
+        if text_by_path is not None:
+            # the text of a single child element is read directly, without the XPath engine
+            if not convert or query.format == DataQuery.Format.String:
+                if pool is None:
+                    return text_by_path
+                intern = pool.intern
+                return lambda node: intern(text_by_path(node))
+            element_by_path = text_by_path
+            handle_value = self.converters.compile(query.format)
+        else:
+            try:
+                element_by_path = self.path_handler.compile_element(query.path)
+            except etree.XPathError as e:
+                error = f'PlanCompiler - invalid XPath \'{query.path.xpath}\' of DataValue(\'{data_value.name}\'): {e}'
+                self.logger.error(error)
+                raise ValueError(error)
+            if convert:
+                handle_value = value_handler.compile(query, self.converters)
+            else:
+                handle_value = value_handler.compile_getter(query)
+
+        if pool is not None:
+            intern = pool.intern
+
+            def extract_interned(node: Element) -> Any:
+                element = element_by_path(node)
+                if element is None:
+                    return None
+                return intern(handle_value(element))
+
+            return extract_interned
+
+        def extract(node: Element) -> Any:
+            element = element_by_path(node)
+            if element is None:
+                return None
+            return handle_value(element)
+
+        return extract
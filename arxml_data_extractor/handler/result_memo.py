@@ -0,0 +1,27 @@
+from lxml.etree import Element
+
+from arxml_data_extractor.handler.bounded_memo import BoundedMemo
+
+
+class ResultMemo(BoundedMemo):
+    """Bounded memo of the values extracted for a nested DataObject from an element,
+    keyed by the plan of the DataObject and the element. Elements reached from many
+    parents, e.g. a signal referred by the mappings of several PDUs, are only handled
+    once and all parents share the same values. The least recently used values are
+    dropped if the memo is full.
+    """
+
+    def discard_document(self, root: Element) -> int:
+        """Discards the values of all elements of a document, so the memo doesn't keep
+        the document alive. The element is the last item of the key.
+
+        Arguments:
+            root {Element} -- root element of the document
+
+        Returns:
+            int -- number of discarded values
+        """
+        keys = [key for key in self._entries if key[-1].getroottree().getroot() is root]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
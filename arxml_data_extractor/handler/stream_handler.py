@@ -0,0 +1,132 @@
+from typing import List, Union, Set, Iterator, Tuple
+from tqdm import tqdm
+import logging
+import re
+
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.handler.intern_pool import summarize
+from arxml_data_extractor.asr.asr_stream_parser import AsrStreamParser, StreamAnchor, PendingReference
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_value import DataValue
+
+
+class StreamHandler():
+    """Handles the root DataObjects while streaming the ARXML file. The values of
+    each root object are extracted as soon as its anchor element is completed.
+    """
+    __reference_tag = re.compile(r'[A-Za-z_][\w.-]*REF\b')
+
+    def __init__(self, batched: bool = False, intern_size: int = 65536, arrow_dates: bool = False):
+        self.logger = logging.getLogger()
+        self.batched = batched
+        self.intern_size = intern_size
+        self.arrow_dates = arrow_dates
+
+    def handle(self, arxml: str, queries: List[DataObject]) -> dict:
+        values = [[] for _ in queries]
+        for i, index, element_values in self.__iterate(arxml, queries):
+            if index == len(values[i]):
+                values[i].append(element_values)
+            else:
+                values[i][index] = element_values
+
+        return {
+            data_object.name: self.__object_handler.result(data_object, object_values)
+            for data_object, object_values in zip(queries, values)
+        }
+
+    def iterate(self, arxml: str, queries: List[DataObject]) -> Iterator[Tuple[str, dict]]:
+        """Yields the name of the root object and the values of each element as soon as
+        they are extracted. Elements waiting for a reference further down in the file
+        are yielded at the end.
+        """
+        for i, _, values in self.__iterate(arxml, queries):
+            if values is not None:
+                yield queries[i].name, values
+
+    def __iterate(self, arxml: str,
+                  queries: List[DataObject]) -> Iterator[Tuple[int, int, Union[dict, None]]]:
+        try:
+            anchors = [StreamAnchor(data_object.path) for data_object in queries]
+        except ValueError as e:
+            self.logger.error(str(e))
+            raise
+
+        try:
+            reference_tags, references = self.__analyze_references(queries)
+        except ValueError as e:
+            self.logger.error(str(e))
+            raise
+
+        parser = AsrStreamParser(arxml, reference_tags, references)
+        object_handler = self.__object_handler = ObjectHandler(
+            parser,
+            use_tag_index=False,
+            batched=self.batched,
+            intern_size=self.intern_size,
+            arrow_dates=self.arrow_dates)
+        for data_object in queries:
+            object_handler.compile(data_object)
+
+        counts = [0] * len(queries)
+        deferred = []
+        for i, element in tqdm(
+                parser.iterate(anchors),
+                desc='Streaming DataObjects',
+                bar_format="{desc:<70}{n_fmt:>8} elements [{elapsed}]"):
+            index = counts[i]
+            counts[i] += 1
+            try:
+                values = object_handler.handle_element(queries[i], element)
+            except PendingReference as e:
+                self.logger.info(
+                    f'StreamHandler - deferring element at line {element.sourceline - 1}, {str(e)}')
+                parser.retain(element)
+                deferred.append((i, index, element))
+                values = None
+            yield i, index, values
+
+        for i, index, element in deferred:
+            yield i, index, object_handler.handle_element(queries[i], element)
+
+        self.logger.info(f'StreamHandler - {parser.xpath_cache}')
+        if object_handler.memo is not None:
+            self.logger.info(f'StreamHandler - {object_handler.memo}')
+        if object_handler.pools:
+            self.logger.info(f'StreamHandler - {summarize(object_handler.pools)}')
+        if object_handler.converters.date_memo is not None:
+            self.logger.info(f'StreamHandler - dates {object_handler.converters.date_memo}')
+
+    def __analyze_references(self, queries: List[DataObject]):
+        """Collects the tags of all reference elements used by '_xref' anchors and
+        inline references as well as all '_ref' anchors. Only the elements referred
+        by those need to be kept while streaming. If a reference tag can't be
+        determined, all referred elements are kept.
+        """
+        tags = set()
+        references = set()
+        complete = True
+        for data_object in queries:
+            complete &= self.__collect(data_object, tags, references)
+        return (tags if complete else None), references
+
+    def __collect(self, value: Union[DataObject, DataValue], tags: Set[str],
+                  references: Set[str]) -> bool:
+        complete = True
+        path = value.path if isinstance(value, DataObject) else value.query.path
+        if isinstance(path, DataQuery.Reference):
+            references.add(path.ref)
+        elif isinstance(path, DataQuery.BackReference):
+            raise ValueError(
+                f'StreamHandler - \'_backref\' anchor of DataObject(\'{value.name}\') isn\'t supported in streaming mode'
+            )
+        elif path.is_reference:
+            found = self.__reference_tag.findall(path.xpath)
+            complete = bool(found) and '*' not in path.xpath
+            tags.update(found)
+
+        if isinstance(value, DataObject):
+            for v in value.values:
+                complete &= self.__collect(v, tags, references)
+        return complete
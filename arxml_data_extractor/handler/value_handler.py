@@ -1,57 +1,75 @@
-import arrow
 import logging
 from lxml.etree import Element
-from typing import Any, Union
+from typing import Any, Union, Callable
 
+from arxml_data_extractor.handler.converters import Converters
 from arxml_data_extractor.query.data_query import DataQuery
 
+# converters of the queries handled without a run, their dates are memoized across calls
+__converters = Converters()
+
 
 def handle(query: DataQuery, node: Element) -> Any:
+    return compile(query)(node)
+
+
+def compile(query: DataQuery, converters: Union[Converters, None] = None) -> Callable[[Element], Any]:
+    """Binds the value getter and the converter of the query once, so extracting the
+    value of an element doesn't need to dispatch on the query anymore.
+
+    Arguments:
+        query {DataQuery} -- query of a DataValue
+        converters {Union[Converters, None]} -- converters of the run, the converters of
+            the module if None
+
+    Returns:
+        Callable[[Element], Any] -- function returning the converted value of an element
+    """
+    get_value = compile_getter(query)
+    if query.format == DataQuery.Format.String:
+        return get_value
+    convert = (converters or __converters).compile(query.format)
+
+    def handle_value(node: Element) -> Any:
+        value = get_value(node)
+        if value is None:
+            return value
+        return convert(value)
+
+    return handle_value
+
+
+def compile_getter(query: DataQuery) -> Callable[[Element], Union[str, None]]:
+    """Binds the value getter of the query, the extracted string isn't converted"""
     # Special treatment for inline references pointing to the references SHORT-NAME
     if isinstance(query.path, DataQuery.XPath) \
         and query.path.is_reference \
         and query.path.xpath.endswith(')SHORT-NAME'):
-        value = node.text.split('/')[-1]
-    else:
-        value = __get_value(query.value, node)
+        return __get_reference_shortname
+    return __compile_getter(query.value)
+
 
-    if value is None:
-        return value
-    return __convert_value(value, query.format)
+def __get_reference_shortname(node: Element) -> str:
+    return node.text.split('/')[-1]
 
 
-def __get_value(value: str, node: Element) -> Union[str, None]:
+def __compile_getter(value: str) -> Callable[[Element], Union[str, None]]:
     if value == 'text':
-        return node.text
+        return lambda node: node.text
     elif value == 'tag':
-        return node.tag
+        return lambda node: node.tag
     elif value.startswith('@'):
         attribute = value[1:]
-        if attribute in node.attrib:
-            return node.attrib[attribute]
-        logging.getLogger().warning(f'ValueHandler - no attribute found with name \'{attribute}\'')
-        return None
+
+        def get_attribute(node: Element) -> Union[str, None]:
+            if attribute in node.attrib:
+                return node.attrib[attribute]
+            logging.getLogger().warning(
+                f'ValueHandler - no attribute found with name \'{attribute}\'')
+            return None
+
+        return get_attribute
     else:
         error = f'ValueHandler - invalid value syntax \'{value}\'. Value must be either \'tag\', \'text\' or \'@..\''
         logging.getLogger().error(error)
         raise Exception(error)
-
-
-def __convert_value(value: str, format: DataQuery.Format) -> Any:
-    try:
-        if format == DataQuery.Format.String:
-            return value
-        elif format == DataQuery.Format.Integer:
-            return int(value)
-        elif format == DataQuery.Format.Float:
-            return float(value)
-        elif format == DataQuery.Format.Date:
-            return arrow.get(value)
-        else:
-            logging.getLogger().warning(
-                f'ValueHandler - convertion error {value} to {format} -> fallback to string')
-            return value
-    except Exception as e:
-        logging.getLogger().exception(
-            f'ValueHandler - error while converting {value} to {format} -> fallback to string', e)
-        return value
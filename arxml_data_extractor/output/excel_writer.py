@@ -1,7 +1,11 @@
+import arrow
+import logging
 from dataclasses import dataclass
+from typing import Dict, Union
 from xlsxwriter import Workbook
 
-from arxml_data_extractor.output.tabularize import tabularize
+from arxml_data_extractor.output.tabularize import table
+from arxml_data_extractor.query.schema import ObjectSchema
 
 
 @dataclass
@@ -14,9 +18,29 @@ class Cell():
 
 
 class ExcelWriter():
-
-    def write(self, file: str, data: dict):
-        workbook = Workbook(file)
+    """Writes the results of every root object into a worksheet. In constant memory
+    mode, xlsxwriter flushes every row to a temporary file as soon as the next row is
+    written, so the header and the data rows are written strictly row by row.
+    """
+    # rows of a worksheet supported by Excel
+    sheet_rows = 1048576
+
+    def __init__(self, max_rows: Union[int, None] = None, constant_memory: bool = False):
+        self.logger = logging.getLogger()
+        self.max_rows = max_rows
+        self.constant_memory = constant_memory
+
+    def write(self, file: str, data: dict, schemas: Union[Dict[str, ObjectSchema], None] = None):
+        """Writes the results into a worksheet per root object. The header is derived
+        from the schemas of the root objects, without schemas it is derived from the
+        first element of the results.
+        """
+        workbook = Workbook(
+            file, {
+                'constant_memory': self.constant_memory,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+                'remove_timezone': True
+            })
         self.header_format = workbook.add_format({
             'bold': True,
             'align': 'center',
@@ -24,60 +48,74 @@ class ExcelWriter():
         })
 
         for key, value in data.items():
+            schema = schemas[key] if schemas and key in schemas else ObjectSchema.infer(key, value)
             sheet = workbook.add_worksheet(key)
-            row_count = self.write_header(sheet, value)
-            self.write_data_frames(sheet, value, row_count)
+            sheet.add_write_handler(arrow.Arrow, self.__write_arrow)
+            row_count = self.write_header(sheet, schema)
+            self.write_data_frames(sheet, value, row_count, schema)
 
         workbook.close()
 
-    def write_header(self, sheet, data):
+    @staticmethod
+    def __write_arrow(sheet, row: int, col: int, date: arrow.Arrow, cell_format=None):
+        return sheet.write_datetime(row, col, date.datetime, cell_format)
+
+    def write_header(self, sheet, schema: ObjectSchema):
         headers = []
-        max_row, max_col = self.analyze_header(data, headers)
-        self.preformat_header(sheet, max_row, max_col)
-
-        while headers:
-            cell = headers.pop()
-            if cell.is_object:
-                if cell.col_span > 0:
-                    sheet.merge_range(cell.row, cell.col, cell.row, cell.col + cell.col_span,
-                                      cell.val, self.header_format)
-                else:
-                    sheet.write(cell.row, cell.col, cell.val, self.header_format)
+        max_row, max_col = self.analyze_header(schema, headers)
+
+        # the whole header is laid out before writing it in row order
+        cells = self.preformat_header(max_row, max_col)
+        for cell in headers:
+            if not cell.is_object:
+                cell.row = max_row
+            cells[(cell.row, cell.col)] = cell
+            for col in range(cell.col + 1, cell.col + cell.col_span + 1):
+                cells.pop((cell.row, col), None)
+
+        for (row, col), cell in sorted(cells.items()):
+            if cell is None:
+                sheet.write(row, col, None, self.header_format)
+            elif cell.col_span > 0:
+                sheet.merge_range(row, col, row, col + cell.col_span, cell.val, self.header_format)
             else:
-                sheet.write(max_row, cell.col, cell.val, self.header_format)
+                sheet.write(row, col, cell.val, self.header_format)
 
         return max_row
 
-    def preformat_header(self, sheet, rows, cols):
-        for row in range(rows):
-            for col in range(cols):
-                sheet.write(row, col, None, self.header_format)
+    def preformat_header(self, rows, cols) -> dict:
+        return {(row, col): None for row in range(rows) for col in range(cols)}
 
-    def analyze_header(self, data, header, row=0, col=0):
+    def analyze_header(self, schema: ObjectSchema, header, row=0, col=0):
         max_row = row
 
-        if isinstance(data, list):
-            data = data[0]
-
-        for key, value in data.items():
-            if isinstance(value, (list, dict)):
-                max_row, n_col = self.analyze_header(value, header, row + 1, col)
-                header.append(Cell(row, col, key, n_col - col, True))
+        for value in schema.values:
+            if isinstance(value, ObjectSchema):
+                nested_row, n_col = self.analyze_header(value, header, row + 1, col)
+                max_row = max(max_row, nested_row)
+                header.append(Cell(row, col, value.name, n_col - col, True))
                 col = n_col
             else:
-                header.append(Cell(row, col, key))
+                header.append(Cell(row, col, value.name))
             col += 1
 
         return max_row, col - 1
 
-    def write_data_frames(self, sheet, data, start_row):
+    def write_data_frames(self, sheet, data, start_row, schema: ObjectSchema):
         if isinstance(data, dict):
             data = [data]
 
-        data_frames = tabularize(data)
-        for row_idx, df in enumerate(data_frames, start_row + 1):
+        # the rows are only counted upfront, they are built while writing them
+        row_count, rows = table(data, schema)
+        max_rows = ExcelWriter.sheet_rows - start_row - 1
+        if self.max_rows is not None:
+            max_rows = min(max_rows, self.max_rows)
+        if row_count > max_rows:
+            error = f'ExcelWriter - the results of \'{sheet.get_name()}\' expand to {row_count} rows, which exceeds the maximum of {max_rows} rows'
+            self.logger.error(error)
+            raise ValueError(error)
+
+        for row_idx, df in enumerate(rows, start_row + 1):
             sheet.write_row(row_idx, 0, df)
 
-        row_count = len(data_frames)
-        column_count = len(data_frames[0]) - 1
-        sheet.autofilter(start_row, 0, row_count, column_count)
+        sheet.autofilter(start_row, 0, row_count, len(schema.columns()) - 1)
@@ -0,0 +1,157 @@
+import json
+from json.encoder import encode_basestring
+from typing import Any, TextIO, List
+
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+
+
+class JsonWriter():
+    """Writes the results as JSON by walking the result tree and writing the text in
+    chunks to the file, instead of building it with json.dump. Dates (e.g. arrow.Arrow
+    or datetime) are written as ISO 8601 strings. The indented output is identical to
+    json.dump(data, indent=4, ensure_ascii=False). In compact mode all whitespace is
+    omitted and the records of each root object are encoded by the C encoder of the
+    json module. The elements of a ColumnarResult are built one after another while
+    writing them.
+    """
+
+    def __init__(self, compact: bool = False, indent: int = 4, chunk_size: int = 4096):
+        self.compact = compact
+        self.indent = indent
+        self.chunk_size = chunk_size
+        self.__newlines = []
+        self.__encoder = json.JSONEncoder(
+            ensure_ascii=False, separators=(',', ':'), default=JsonWriter.default)
+
+    @staticmethod
+    def default(value: Any) -> Any:
+        """Serializes values the json module can't handle, used as 'default' of json.dump"""
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+    def write(self, file: str, data: dict):
+        with open(file, 'w', encoding='utf-8') as f:
+            self.dump(data, f)
+
+    def dump(self, data: dict, f: TextIO):
+        parts = []
+        if self.compact:
+            self.__write_compact(data, parts, f)
+        else:
+            self.__write_value(data, 0, parts, f)
+        f.write(''.join(parts))
+
+    def __write_compact(self, data: dict, parts: List[str], f: TextIO):
+        encode = self.__encoder.encode
+        parts.append('{')
+        for i, (name, values) in enumerate(data.items()):
+            if i:
+                parts.append(',')
+            parts.append(self.__key(name))
+            parts.append(':')
+            if isinstance(values, ColumnarResult) and len(values) == 1:
+                values = values[0]
+            if not isinstance(values, (list, ColumnarResult)):
+                parts.append(encode(values))
+                continue
+
+            # the records of a root object are encoded one by one to write them in chunks
+            parts.append('[')
+            for j, value in enumerate(values):
+                if j:
+                    parts.append(',')
+                parts.append(encode(value))
+                if len(parts) >= self.chunk_size:
+                    f.write(''.join(parts))
+                    parts.clear()
+            parts.append(']')
+        parts.append('}')
+
+    def __newline(self, level: int) -> str:
+        while len(self.__newlines) <= level:
+            self.__newlines.append('\n' + ' ' * (self.indent * len(self.__newlines)))
+        return self.__newlines[level]
+
+    def __write_value(self, value: Any, level: int, parts: List[str], f: TextIO):
+        if isinstance(value, str):
+            parts.append(encode_basestring(value))
+        elif isinstance(value, dict):
+            if not value:
+                parts.append('{}')
+                return
+
+            newline = self.__newline(level + 1)
+            separator = ',' + newline
+            parts.append('{' + newline)
+            first = True
+            for key, item in value.items():
+                if first:
+                    first = False
+                else:
+                    parts.append(separator)
+                parts.append(self.__key(key))
+                parts.append(': ')
+                self.__write_value(item, level + 1, parts, f)
+            parts.append(self.__newline(level))
+            parts.append('}')
+        elif isinstance(value, (list, tuple, ColumnarResult)):
+            if isinstance(value, ColumnarResult) and len(value) == 1:
+                # a single element is written like the dict returned by the ObjectHandler
+                self.__write_value(value[0], level, parts, f)
+                return
+            if not value:
+                parts.append('[]')
+                return
+
+            newline = self.__newline(level + 1)
+            separator = ',' + newline
+            parts.append('[' + newline)
+            first = True
+            for item in value:
+                if first:
+                    first = False
+                else:
+                    parts.append(separator)
+                self.__write_value(item, level + 1, parts, f)
+                if len(parts) >= self.chunk_size:
+                    f.write(''.join(parts))
+                    parts.clear()
+            parts.append(self.__newline(level))
+            parts.append(']')
+        else:
+            parts.append(self.__scalar(value))
+
+    def __scalar(self, value: Any) -> str:
+        if value is None:
+            return 'null'
+        elif value is True:
+            return 'true'
+        elif value is False:
+            return 'false'
+        elif isinstance(value, int):
+            return int.__repr__(value)
+        elif isinstance(value, float):
+            return self.__float(value)
+        elif isinstance(value, str):
+            return encode_basestring(value)
+        return self.__encoder.encode(JsonWriter.default(value))
+
+    @staticmethod
+    def __float(value: float) -> str:
+        if value != value:
+            return 'NaN'
+        elif value == float('inf'):
+            return 'Infinity'
+        elif value == -float('inf'):
+            return '-Infinity'
+        return float.__repr__(value)
+
+    def __key(self, key: Any) -> str:
+        if isinstance(key, str):
+            return encode_basestring(key)
+        elif isinstance(key, float):
+            return encode_basestring(JsonWriter.__float(key))
+        elif key is None or isinstance(key, (bool, int)):
+            return encode_basestring(self.__scalar(key))
+        raise TypeError(f'keys must be str, int, float, bool or None, not {type(key).__name__}')
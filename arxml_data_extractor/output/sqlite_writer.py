@@ -0,0 +1,162 @@
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.schema import ObjectSchema, ValueSchema
+
+
+class Table():
+    """Table of a DataObject, the rows are collected until they are inserted in bulk"""
+
+    def __init__(self, name: str, schema: ObjectSchema, parent: Union['Table', None] = None):
+        self.name = name
+        self.schema = schema
+        self.parent = parent
+        self.values = [value for value in schema.values if isinstance(value, ValueSchema)]
+        self.nested = []
+        self.rows = []
+        self.count = 0
+        self.insert = ''
+
+
+class SqliteWriter():
+    """Writes the results into a SQLite database with a table per DataObject. Every
+    table has the primary key '_id' and the tables of nested objects refer to the row
+    of their parent by '_parent_id', so the values of a parent are stored once instead
+    of being repeated in the rows of its nested objects. The ids are assigned while
+    walking the results, so all rows are inserted with executemany in a single
+    transaction. ColumnarResults are inserted column by column, without building the
+    values of their elements.
+    """
+    types = {
+        DataQuery.Format.String: 'TEXT',
+        DataQuery.Format.Integer: 'INTEGER',
+        DataQuery.Format.Float: 'REAL',
+        DataQuery.Format.Date: 'TEXT'
+    }
+
+    def __init__(self, batch_size: int = 10000):
+        self.logger = logging.getLogger()
+        self.batch_size = batch_size
+
+    def write(self, file: str, data: dict, schemas: Union[Dict[str, ObjectSchema], None] = None):
+        """Writes the results into a new database, an existing file is replaced. The
+        tables are derived from the schemas of the root objects, without schemas they
+        are derived from the first element of the results.
+        """
+        path = Path(file)
+        if path.exists():
+            path.unlink()
+
+        connection = sqlite3.connect(file)
+        try:
+            with connection:
+                for key, value in data.items():
+                    if isinstance(value, ColumnarResult):
+                        table = self.create_tables(connection, value.schema)
+                        self.__insert_columnar(connection, table, value, None)
+                        continue
+
+                    schema = schemas[key] if schemas and key in schemas else ObjectSchema.infer(
+                        key, value)
+                    table = self.create_tables(connection, schema)
+                    self.__insert(connection, table, value, None)
+                    self.__flush(connection, table)
+        finally:
+            connection.close()
+
+    def create_tables(self,
+                      connection: sqlite3.Connection,
+                      schema: ObjectSchema,
+                      parent: Union[Table, None] = None) -> Table:
+        """Creates the table of the object and the tables of its nested objects. Tables
+        of nested objects are named '<parent table>.<object name>'.
+
+        Returns:
+            Table -- table of the object, holding the tables of its nested objects
+        """
+        name = schema.name if parent is None else f'{parent.name}.{schema.name}'
+        table = Table(name, schema, parent)
+
+        columns = ['"_id" INTEGER PRIMARY KEY']
+        if parent is not None:
+            columns.append(f'"_parent_id" INTEGER REFERENCES {self.__quote(parent.name)}("_id")')
+        columns.extend(f'{self.__quote(value.name)} {SqliteWriter.types[value.format]}'
+                       for value in table.values)
+        connection.execute(f'CREATE TABLE {self.__quote(name)} ({", ".join(columns)})')
+        table.insert = f'INSERT INTO {self.__quote(name)} VALUES ({", ".join(["?"] * len(columns))})'
+        if parent is not None:
+            connection.execute(f'CREATE INDEX {self.__quote(name + "._parent_id")} '
+                               f'ON {self.__quote(name)}("_parent_id")')
+
+        table.nested = [
+            self.create_tables(connection, value, table)
+            for value in schema.values
+            if isinstance(value, ObjectSchema)
+        ]
+        return table
+
+    def __insert(self, connection: sqlite3.Connection, table: Table, data: Any,
+                 parent_id: Union[int, None]):
+        if data is None:
+            return
+        if isinstance(data, dict):
+            data = [data]
+
+        for values in data:
+            table.count += 1
+            row = [table.count] if parent_id is None else [table.count, parent_id]
+            row.extend(self.__convert(values.get(value.name)) for value in table.values)
+            table.rows.append(row)
+            if len(table.rows) >= self.batch_size:
+                self.__insert_rows(connection, table)
+
+            for nested in table.nested:
+                self.__insert(connection, nested, values.get(nested.schema.name), table.count)
+
+    def __flush(self, connection: sqlite3.Connection, table: Table):
+        self.__insert_rows(connection, table)
+        for nested in table.nested:
+            self.__flush(connection, nested)
+
+    def __insert_rows(self, connection: sqlite3.Connection, table: Table):
+        if not table.rows:
+            return
+
+        connection.executemany(table.insert, table.rows)
+        table.rows = []
+
+    def __insert_columnar(self, connection: sqlite3.Connection, table: Table,
+                          result: ColumnarResult, parent_ids: Union[Iterator[int], None]):
+        first_id = table.count + 1
+        ids = range(first_id, first_id + len(result))
+        table.count += len(result)
+
+        columns = []
+        for value in table.values:
+            column = result.column(value.name)
+            if value.format == DataQuery.Format.Date:
+                column = map(self.__convert, column)
+            columns.append(column)
+        # executemany consumes the rows one by one from the iterator
+        rows = zip(ids, *columns) if parent_ids is None else zip(ids, parent_ids, *columns)
+        connection.executemany(table.insert, rows)
+
+        for nested in table.nested:
+            name = nested.schema.name
+            nested_parent_ids = (first_id + index for index in result.parent_indices(name))
+            self.__insert_columnar(connection, nested, result.nested[name], nested_parent_ids)
+
+    @staticmethod
+    def __convert(value: Any) -> Any:
+        # dates are stored as ISO 8601 strings
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def __quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
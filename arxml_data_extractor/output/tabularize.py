@@ -1,32 +1,105 @@
-def tabularize(data: list) -> list:
-    rows = __flatten(data)
-    return rows
+import logging
+from itertools import chain
+from typing import Any, Callable, Iterator, List, Tuple, Union
 
+from arxml_data_extractor.query.schema import ObjectSchema
 
-def __flatten(data):
+# A table is described by its number of rows, a function creating a new iterator over
+# its rows and the row itself if it is a single row without nested lists. No row is
+# built before it is requested by a writer.
+Table = Tuple[int, Callable[[], Iterator[list]], Union[list, None]]
+
+
+def tabularize(data: list,
+               max_rows: Union[int, None] = None,
+               schema: Union[ObjectSchema, None] = None) -> List[list]:
+    """Flattens the results into rows. With the schema of the root object, the columns
+    of nested objects without elements are filled with None.
+
+    Arguments:
+        data {list} -- values of a root object
+        max_rows {Union[int, None]} -- maximum number of rows, unlimited if None
+        schema {Union[ObjectSchema, None]} -- schema of the root object
+
+    Raises:
+        ValueError: the number of rows exceeds max_rows
+
+    Returns:
+        List[list] -- rows
+    """
+    count, rows = table(data, schema)
+    if max_rows is not None and count > max_rows:
+        error = f'Tabularize - the results expand to {count} rows, which exceeds the maximum of {max_rows} rows'
+        logging.getLogger().error(error)
+        raise ValueError(error)
+    return list(rows)
+
+
+def table(data: list, schema: Union[ObjectSchema, None] = None) -> Tuple[int, Iterator[list]]:
+    """Counts the rows of the results without building them and returns them with
+    the lazily flattened rows, every row is built when it is requested"""
+    count, rows, _ = __table(data, schema)
+    return count, rows()
+
+
+def iter_rows(data: list, schema: Union[ObjectSchema, None] = None) -> Iterator[list]:
+    """Lazily flattens the results, every row is built when it is requested"""
+    return __table(data, schema)[1]()
+
+
+def estimate_rows(data: list, schema: Union[ObjectSchema, None] = None) -> int:
+    """Returns the number of rows the results expand to, without building them"""
+    return __table(data, schema)[0]
+
+
+def __table(data: Any, schema: Union[ObjectSchema, None] = None) -> Table:
     if isinstance(data, dict):
-        rows = []
-        for value in data.values():
-            res = __flatten(value)
-            if isinstance(res, list):
-                if isinstance(res[0], list):
-                    rows = __concatenate(rows, res)
-                else:
-                    rows.extend(res)
-            else:
-                rows.append(res)
-        return rows
+        table = None
+        # cells of single row tables are collected, so a row is only copied once
+        # for every nested list
+        cells = []
+        for value, value_schema in __values(data, schema):
+            if value_schema is None and not isinstance(value, (dict, list)):
+                cells.append(value)
+                continue
+
+            if value_schema is not None and not value:
+                # nested object without elements, its columns stay empty
+                cells.extend([None] * len(value_schema.columns()))
+                continue
+
+            nested = __table(value, value_schema)
+            if nested[2] is not None:
+                cells.extend(nested[2])
+                continue
+
+            if cells:
+                table = __concatenate(table, __row(cells))
+                cells = []
+            table = __concatenate(table, nested)
+
+        if table is None:
+            return __row(cells)
+        return __concatenate(table, __row(cells)) if cells else table
     elif isinstance(data, list):
-        rows = []
-        for value in data:
-            res = __flatten(value)
-            if isinstance(res, list) and type(res[0]) is list:
-                rows.extend(res)
-            else:
-                rows.append(res)
-        return rows
+        tables = [__table(value, schema) for value in data]
+        return sum(count for count, _, _ in tables), lambda: chain.from_iterable(
+            rows() for _, rows, _ in tables), None
     else:
-        return data
+        return __row([data])
+
+
+def __values(data: dict,
+             schema: Union[ObjectSchema, None]) -> Iterator[Tuple[Any, Union[ObjectSchema, None]]]:
+    """Yields the values of the dictionary with the schema of nested objects"""
+    if schema is None:
+        return ((value, None) for value in data.values())
+    return ((data.get(value.name), value if isinstance(value, ObjectSchema) else None)
+            for value in schema.values)
+
+
+def __row(cells: list) -> Table:
+    return 1, lambda: iter((cells,)), cells
 
 
 # len(left) == len(right)
@@ -54,14 +127,19 @@ def __flatten(data):
 #          [c, d, u, v],
 #          [c, d, w, x],
 #          [c, d, y, z]]
-def __concatenate(left: list, right: list) -> list:
-    if not left:
+#
+# A single value or a dictionary without lists is a table with a single row.
+# An empty list is treated like a single row without values.
+def __concatenate(left: Union[Table, None], right: Table) -> Table:
+    if right[0] == 0:
+        right = __row([])
+    if left is None:
         return right
 
-    if type(left[0]) is not list:
-        return [left + r for r in right]
-
-    if len(left) == len(right):
-        return [l + right[i] for i, l in enumerate(left)]
+    left_count, left_rows, _ = left
+    right_count, right_rows, _ = right
+    if left_count == right_count:
+        return left_count, lambda: (l + r for l, r in zip(left_rows(), right_rows())), None
 
-    return [l + r for l in left for r in right]
+    return left_count * right_count, lambda: (
+        l + r for l in left_rows() for r in right_rows()), None
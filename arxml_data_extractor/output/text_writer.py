@@ -1,42 +1,36 @@
 from tabulate import tabulate
+from typing import Dict, List, Union
 
 from arxml_data_extractor.output.tabularize import tabularize
+from arxml_data_extractor.query.schema import ObjectSchema
 
 
 class TextWriter():
 
-    def as_table(self, data: dict) -> str:
+    def __init__(self, max_rows: Union[int, None] = None):
+        self.max_rows = max_rows
+
+    def as_table(self, data: dict, schemas: Union[Dict[str, ObjectSchema], None] = None) -> str:
         text = []
-        headers = self.analyze_headers(data)
-        for i, values in enumerate(data.values()):
+        schemas = self.analyze_headers(data, schemas)
+        for schema, values in zip(schemas, data.values()):
             if not isinstance(values, list):
                 values = [values]
-            rows = tabularize(values)
-            text.append(tabulate(rows, headers=headers[i], tablefmt="orgtbl"))
+            rows = tabularize(values, self.max_rows, schema=schema)
+            headers = [column.name for column in schema.columns()]
+            text.append(tabulate(rows, headers=headers, tablefmt="orgtbl"))
 
         return '\n\n\n'.join(text)
 
-    def analyze_headers(self, data: dict) -> list:
-        headers = []
-
-        for value in data.values():
-            headers.append(self.__names(value))
-
-        return headers
-
-    @classmethod
-    def __names(cls, data):
-        names = []
-        if isinstance(data, dict):
-            for key, values in data.items():
-                if isinstance(values, (list, dict)):
-                    names.extend(cls.__names(values))
-                else:
-                    names.append(key)
-        else:
-            # first entry is enough to collect all names
-            names.extend(cls.__names(data[0]))
-        return names
+    def analyze_headers(self, data: dict,
+                        schemas: Union[Dict[str, ObjectSchema], None] = None) -> List[ObjectSchema]:
+        """Gets the schemas of the root objects in the order of the results, schemas
+        missing for a root object are derived from its first element.
+        """
+        return [
+            schemas[key] if schemas and key in schemas else ObjectSchema.infer(key, value)
+            for key, value in data.items()
+        ]
 
     def as_dictionary(self, data: dict):
         text = []
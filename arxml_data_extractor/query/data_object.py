@@ -9,7 +9,8 @@ from arxml_data_extractor.query.data_value import DataValue
 
 class DataObject():
 
-    def __init__(self, name: str, path: Union[DataQuery.XPath, DataQuery.Reference],
+    def __init__(self, name: str, path: Union[DataQuery.XPath, DataQuery.Reference,
+                                              DataQuery.BackReference],
                  values: List[Union[DataValue, DataObject]]):
 
         self.logger = logging.getLogger()
@@ -18,10 +19,10 @@ class DataObject():
         self.values = self.__set_values(values)
 
     def __set_path(self, path):
-        if (isinstance(path, (DataQuery.Reference, DataQuery.XPath))):
+        if (isinstance(path, (DataQuery.Reference, DataQuery.XPath, DataQuery.BackReference))):
             return path
         else:
-            error = f'DataObject(\'{self.name}\') - invalid path type ({type(path)}). Path must be of type DataQuery.XPath or DataQuery.Reference'
+            error = f'DataObject(\'{self.name}\') - invalid path type ({type(path)}). Path must be of type DataQuery.XPath, DataQuery.Reference or DataQuery.BackReference'
             self.logger.error(error)
             raise TypeError(error)
 
@@ -12,6 +12,10 @@ class DataQuery():
     class Reference():
         ref: str
 
+    @dataclass
+    class BackReference():
+        tag: str
+
     @dataclass
     class XPath():
         xpath: str
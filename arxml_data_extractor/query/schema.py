@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import arrow
+import logging
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Union
+
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_value import DataValue
+
+
+@dataclass
+class ValueSchema():
+    name: str
+    format: DataQuery.Format = DataQuery.Format.String
+
+    types: ClassVar[dict] = {
+        DataQuery.Format.String: str,
+        DataQuery.Format.Integer: int,
+        DataQuery.Format.Float: float,
+        DataQuery.Format.Date: datetime
+    }
+
+    @property
+    def type(self) -> type:
+        """Python type of the extracted values"""
+        return ValueSchema.types[self.format]
+
+
+@dataclass
+class ObjectSchema():
+    """Columns and nesting of the results of a DataObject, derived from the query tree
+    without looking at the extracted data.
+    """
+    name: str
+    values: List[Union[ValueSchema, ObjectSchema]] = field(default_factory=list)
+
+    @staticmethod
+    def from_data_object(data_object: DataObject) -> ObjectSchema:
+        values = []
+        for value in data_object.values:
+            if isinstance(value, DataObject):
+                values.append(ObjectSchema.from_data_object(value))
+            elif isinstance(value, DataValue):
+                values.append(ValueSchema(value.name, value.query.format))
+            else:
+                error = f'ObjectSchema - invalid value type ({type(value)}) in DataObject(\'{data_object.name}\'). Value must be of type DataObject or DataValue'
+                logging.getLogger().error(error)
+                raise TypeError(error)
+        return ObjectSchema(data_object.name, values)
+
+    @staticmethod
+    def infer(name: str, data: Union[list, dict]) -> ObjectSchema:
+        """Derives the schema from the first element of already extracted results, for
+        results without their queries. Nested objects without elements have no columns.
+        """
+        if isinstance(data, list):
+            data = data[0] if data else {}
+
+        values = []
+        for key, value in data.items():
+            if isinstance(value, (list, dict)):
+                values.append(ObjectSchema.infer(key, value))
+            else:
+                values.append(ValueSchema(key, ObjectSchema.__format(value)))
+        return ObjectSchema(name, values)
+
+    @staticmethod
+    def __format(value: Any) -> DataQuery.Format:
+        if isinstance(value, arrow.Arrow):
+            return DataQuery.Format.Date
+        for format, value_type in ValueSchema.types.items():
+            if format != DataQuery.Format.String and isinstance(value, value_type):
+                return format
+        return DataQuery.Format.String
+
+    def columns(self) -> List[ValueSchema]:
+        """All values of the object and its nested objects in the order of the columns"""
+        columns = []
+        for value in self.values:
+            if isinstance(value, ObjectSchema):
+                columns.extend(value.columns())
+            else:
+                columns.append(value)
+        return columns
+
+    def depth(self) -> int:
+        """Number of nested object levels, 0 if the object only has values"""
+        return max((value.depth() + 1 for value in self.values if isinstance(value, ObjectSchema)),
+                   default=0)
+
+
+def build_schemas(queries: List[DataObject]) -> Dict[str, ObjectSchema]:
+    """Derives the schemas of the root objects, keyed by their names"""
+    return {data_object.name: ObjectSchema.from_data_object(data_object) for data_object in queries}
@@ -25,10 +25,10 @@ class QueryBuilder():
         return data_objects
 
     def __parse_object(self, name: str, values: dict) -> DataObject:
-        required = {'_xpath', '_xref', '_ref'}
+        required = {'_xpath', '_xref', '_ref', '_backref'}
         path_value = required & values.keys()
         if len(path_value) != 1:
-            error = f'QueryBuilder - DataObject({name}) is missing an anchor. Possible anchors are \'_xpath\', \'_ref\' or \'_xref\''
+            error = f'QueryBuilder - DataObject({name}) is missing an anchor. Possible anchors are \'_xpath\', \'_ref\', \'_xref\' or \'_backref\''
             self.logger.error(error)
             raise ValueError(error)
 
@@ -38,6 +38,9 @@ class QueryBuilder():
         elif '_xref' in path_value:
             xpath = values['_xref'].split(self.__path_separator)[-1]
             path = DataQuery.XPath(xpath, True)
+        elif '_backref' in path_value:
+            tag = values['_backref'].split(self.__path_separator)[-1]
+            path = DataQuery.BackReference(tag)
         else:
             ref = values['_ref'].split(self.__path_separator)[-1]
             path = DataQuery.Reference(ref)
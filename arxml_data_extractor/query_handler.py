@@ -1,41 +1,249 @@
-from typing import List
+from typing import Dict, List, Iterator, Tuple, Union
 from pathlib import Path
 import logging
 
 from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.element_index import ElementIndex
+from arxml_data_extractor.asr.file_catalog import FileCatalog
+from arxml_data_extractor.asr.prune_plan import PrunePlan
 from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+from arxml_data_extractor.handler.intern_pool import summarize
+from arxml_data_extractor.handler.fragment_handler import FragmentHandler
+from arxml_data_extractor.handler.stream_handler import StreamHandler
+from arxml_data_extractor.handler.parallel_handler import ParallelHandler
 from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.schema import build_schemas
 
 
 class QueryHandler():
+    """Handles the root DataObjects of the queries. Equal strings extracted for a
+    DataValue share one object, up to intern_size strings per DataValue. Interning is
+    disabled with an intern_size of 0. Dates are returned as datetime objects, or as
+    arrow.Arrow objects with arrow_dates.
 
-    def __init__(self):
+    The input is a single ARXML file or the list of ARXML files of a system, whose
+    packages are merged by the AsrParser. References to elements of other files are
+    resolved by the catalog of a directory, which loads those files on demand.
+
+    With use_index, only the elements needed by the queries are parsed from a single
+    ARXML file, located by its ElementIndex. The index is built if it doesn't exist or
+    is outdated.
+
+    With prune, the files are parsed without the subtrees and packages the queries
+    can't reach, see PrunePlan. prune_report holds what was pruned by the last run.
+    """
+
+    def __init__(self,
+                 intern_size: int = 65536,
+                 arrow_dates: bool = False,
+                 catalog: Union[FileCatalog, None] = None,
+                 use_index: bool = False,
+                 prune: bool = False):
         self.logger = logging.getLogger()
+        self.intern_size = intern_size
+        self.arrow_dates = arrow_dates
+        self.catalog = catalog
+        self.use_index = use_index
+        self.prune = prune
+        self.prune_report = None
+
+    def handle_queries(self,
+                       input: Union[str, List[str]],
+                       queries: List[DataObject],
+                       streaming: bool = False,
+                       jobs: int = 1,
+                       batched: bool = False) -> dict:
+        arxml = self.__validate(input, queries, streaming)
+
+        if streaming:
+            if jobs > 1:
+                self.logger.warning('QueryHandler - streaming mode ignores the number of jobs')
+            return StreamHandler(batched, self.intern_size, self.arrow_dates).handle(arxml[0], queries)
+        if self.use_index:
+            if jobs > 1:
+                self.logger.warning('QueryHandler - the element index ignores the number of jobs')
+            return self.__handle_fragments(arxml[0], queries, batched)
+
+        parser = self.__parse(arxml, queries)
+        if jobs > 1:
+            parallel_handler = ParallelHandler(
+                jobs, batched=batched, intern_size=self.intern_size, arrow_dates=self.arrow_dates)
+            values = parallel_handler.handle(arxml, parser, queries)
+            results = {data_object.name: value for data_object, value in zip(queries, values)}
+            self.__log_statistics(parallel_handler.object_handler)
+        else:
+            object_handler = ObjectHandler(
+                parser, batched=batched, intern_size=self.intern_size, arrow_dates=self.arrow_dates)
+            for data_object in queries:
+                object_handler.compile(data_object)
+            object_handler.path_handler.index_anchors(queries)
+
+            results = {}
+            for data_object in queries:
+                results[data_object.name] = object_handler.handle(data_object)
+            self.__log_statistics(object_handler)
+
+        self.logger.info(f'QueryHandler - {parser.xpath_cache}')
+        if self.catalog is not None:
+            self.logger.info(f'QueryHandler - {self.catalog}')
+
+        return results
+
+    def iter_records(self,
+                     input: Union[str, List[str]],
+                     queries: List[DataObject],
+                     streaming: bool = False,
+                     batched: bool = False,
+                     chunk_size: int = 1000) -> Iterator[Tuple[str, dict]]:
+        """Handles the queries and yields one record per element found by the anchor of
+        a root object, so the records can be written while the extraction is running.
+        The input and the queries are validated immediately, the extraction starts on
+        the first record requested.
+
+        Arguments:
+            input {Union[str, List[str]]} -- ARXML file or list of ARXML files
+            queries {List[DataObject]} -- root objects
+            streaming {bool} -- parse the ARXML file incrementally, only a single file
+            batched {bool} -- handle nested objects for chunk_size root elements at once
+            chunk_size {int} -- number of root elements handled at once in batched mode
+
+        Returns:
+            Iterator[Tuple[str, dict]] -- name of the root object and values of an element
+        """
+        arxml = self.__validate(input, queries, streaming)
+
+        if streaming:
+            return StreamHandler(batched, self.intern_size, self.arrow_dates).iterate(arxml[0], queries)
+        if self.use_index:
+            return self.__iter_fragments(arxml[0], queries, batched, chunk_size)
+        return self.__iter_records(arxml, queries, batched, chunk_size)
+
+    def handle_columnar(self,
+                        input: Union[str, List[str]],
+                        queries: List[DataObject],
+                        streaming: bool = False,
+                        batched: bool = False,
+                        chunk_size: int = 1000) -> Dict[str, ColumnarResult]:
+        """Handles the queries like iter_records, but stores the values of every element
+        in a ColumnarResult per root object as soon as it is extracted, so the values
+        are never held as dicts.
+
+        Returns:
+            Dict[str, ColumnarResult] -- results of the root objects, keyed by their names
+        """
+        schemas = build_schemas(queries)
+        results = {data_object.name: ColumnarResult(schemas[data_object.name]) for data_object in queries}
+        for name, values in self.iter_records(input, queries, streaming, batched, chunk_size):
+            results[name].append(values)
+
+        for name, result in results.items():
+            self.logger.info(
+                f'QueryHandler - columnar results of DataObject(\'{name}\'): {len(result)} elements, {result.nbytes()} bytes'
+            )
+        return results
+
+    def __handle_fragments(self, arxml: str, queries: List[DataObject], batched: bool = False) -> dict:
+        index = ElementIndex(arxml)
+        try:
+            self.logger.info(f'QueryHandler - {index}')
+            return FragmentHandler(batched, self.intern_size,
+                                   self.arrow_dates).handle(arxml, index, queries)
+        finally:
+            index.close()
 
-    def handle_queries(self, input: str, queries: List[DataObject]) -> dict:
-        arxml = Path(input)
-        if not arxml.exists:
-            error = f'QueryHandler - input file doesn\'t exist \'{input}\''
+    def __iter_fragments(self, arxml: str, queries: List[DataObject], batched: bool,
+                         chunk_size: int) -> Iterator[Tuple[str, dict]]:
+        index = ElementIndex(arxml)
+        try:
+            self.logger.info(f'QueryHandler - {index}')
+            yield from FragmentHandler(batched, self.intern_size,
+                                       self.arrow_dates).iterate(arxml, index, queries, chunk_size)
+        finally:
+            index.close()
+
+    def __iter_records(self, arxml: List[str], queries: List[DataObject], batched: bool,
+                       chunk_size: int) -> Iterator[Tuple[str, dict]]:
+        parser = self.__parse(arxml, queries)
+        object_handler = ObjectHandler(
+            parser, batched=batched, intern_size=self.intern_size, arrow_dates=self.arrow_dates)
+        for data_object in queries:
+            object_handler.compile(data_object)
+        object_handler.path_handler.index_anchors(queries)
+
+        for data_object in queries:
+            for values in object_handler.iterate(data_object, chunk_size):
+                yield data_object.name, values
+
+        self.__log_statistics(object_handler)
+        self.logger.info(f'QueryHandler - {parser.xpath_cache}')
+        if self.catalog is not None:
+            self.logger.info(f'QueryHandler - {self.catalog}')
+
+    def __parse(self, arxml: List[str], queries: List[DataObject]) -> AsrParser:
+        if not self.prune:
+            return AsrParser(arxml, catalog=self.catalog)
+
+        plan = PrunePlan(queries)
+        self.logger.info(f'QueryHandler - {plan}')
+        parser = AsrParser(arxml, catalog=self.catalog, prune=plan)
+        self.prune_report = parser.prune_report
+        self.logger.info(f'QueryHandler - {parser.prune_report}')
+        return parser
+
+    def __log_statistics(self, object_handler: ObjectHandler):
+        if object_handler.memo is not None:
+            self.logger.info(f'QueryHandler - {object_handler.memo}')
+        if object_handler.pools:
+            for name, pool in object_handler.pools:
+                self.logger.debug(f'QueryHandler - DataValue(\'{name}\'): {pool}')
+            self.logger.info(f'QueryHandler - {summarize(object_handler.pools)}')
+        if object_handler.converters.date_memo is not None:
+            self.logger.info(f'QueryHandler - dates {object_handler.converters.date_memo}')
+
+    def __validate(self, input: Union[str, List[str]], queries: List[DataObject],
+                   streaming: bool) -> List[str]:
+        files = [input] if isinstance(input, str) else list(input)
+        if not files:
+            error = 'QueryHandler - no input file given'
             self.logger.error(error)
             raise ValueError(error)
-        if not arxml.is_file:
-            error = f'QueryHandler - input is not a file \'{input}\''
+        if self.prune and (streaming or self.use_index):
+            error = 'QueryHandler - pruning applies to the parsed tree, it isn\'t supported with streaming mode or the element index'
             self.logger.error(error)
             raise ValueError(error)
-        if arxml.suffix != '.arxml':
-            error = f'QueryHandler - invalid input file extension \'{arxml.suffix}\' != \'.arxml\''
+        if self.use_index and (streaming or self.catalog is not None or len(files) > 1):
+            error = 'QueryHandler - the element index supports a single input file without streaming mode or catalog'
+            self.logger.error(error)
+            raise ValueError(error)
+        if streaming and self.catalog is not None:
+            error = 'QueryHandler - streaming mode doesn\'t support a catalog'
+            self.logger.error(error)
+            raise ValueError(error)
+        if streaming and len(files) > 1:
+            error = f'QueryHandler - streaming mode supports a single input file, got {len(files)} files'
             self.logger.error(error)
             raise ValueError(error)
 
-        object_handler = ObjectHandler(AsrParser(str(arxml)))
+        for file in files:
+            arxml = Path(file)
+            if not arxml.exists():
+                error = f'QueryHandler - input file doesn\'t exist \'{file}\''
+                self.logger.error(error)
+                raise ValueError(error)
+            if not arxml.is_file():
+                error = f'QueryHandler - input is not a file \'{file}\''
+                self.logger.error(error)
+                raise ValueError(error)
+            if arxml.suffix != '.arxml':
+                error = f'QueryHandler - invalid input file extension \'{arxml.suffix}\' != \'.arxml\''
+                self.logger.error(error)
+                raise ValueError(error)
 
-        results = {}
         for data_object in queries:
             if (not isinstance(data_object, DataObject)):
                 error = f'QueryHandler - invalid root element type \'{type(data_object)}\' != \'DataObject\''
                 self.logger.error(error)
                 raise TypeError(error)
 
-            results[data_object.name] = object_handler.handle(data_object)
-
-        return results
+        return [str(file) for file in files]
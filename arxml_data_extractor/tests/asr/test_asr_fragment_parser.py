@@ -0,0 +1,72 @@
+import pytest
+import shutil
+
+from arxml_data_extractor.asr.asr_fragment_parser import AsrFragmentParser
+from arxml_data_extractor.asr.asr_stream_parser import StreamAnchor
+from arxml_data_extractor.asr.element_index import ElementIndex
+from arxml_data_extractor.query.data_query import DataQuery
+
+
+@pytest.fixture
+def parser(tmp_path):
+    file = tmp_path / 'test.arxml'
+    shutil.copy('arxml_data_extractor/tests/test.arxml', file)
+    index = ElementIndex(str(file))
+    parser = AsrFragmentParser(str(file), index)
+    yield parser
+    parser.close()
+    index.close()
+
+
+def test_find_reference_parses_only_the_element(parser):
+    cluster = parser.find_reference('/Cluster/CAN')
+    baudrate = parser.assemble_xpath('CAN-CLUSTER-VARIANTS/CAN-CLUSTER-CONDITIONAL/BAUDRATE')
+
+    assert parser.find(cluster, 'ar:SHORT-NAME')[0].text == 'CAN'
+    assert parser.find(cluster, baudrate)[0].text == '500000'
+    assert parser.find_reference('/Cluster/Unknown') is None
+    assert parser.parsed == 1
+
+
+def test_parses_referenced_elements_once(parser):
+    first = parser.find_reference('/ISignal/Signal1')
+    second = parser.find_reference('/ISignal/Signal1')
+
+    assert first is second
+    assert parser.parsed == 1
+
+
+def test_references_before_and_after_loading_all_offsets(tmp_path):
+    signals = ''.join(f'<I-SIGNAL><SHORT-NAME>S{i}</SHORT-NAME><LENGTH>{i}</LENGTH></I-SIGNAL>'
+                      for i in range(64))
+    file = tmp_path / 'signals.arxml'
+    file.write_text('<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES><AR-PACKAGE>'
+                    f'<SHORT-NAME>P</SHORT-NAME><ELEMENTS>{signals}</ELEMENTS></AR-PACKAGE>'
+                    '</AR-PACKAGES></AUTOSAR>')
+    index = ElementIndex(str(file))
+    parser = AsrFragmentParser(str(file), index)
+
+    lengths = [
+        parser.find(parser.find_reference(f'/P/S{i}'), 'ar:LENGTH')[0].text for i in range(64)
+    ]
+
+    assert lengths == [str(i) for i in range(64)]
+    assert parser.find_reference('/P/S64') is None
+    parser.close()
+    index.close()
+
+
+def test_elements_of_anchor_in_document_order(parser):
+    anchor = StreamAnchor(DataQuery.XPath('.//I-SIGNAL-TO-PDU-MAPPINGS/I-SIGNAL-TO-I-PDU-MAPPING'))
+
+    mappings = parser.elements(anchor)
+
+    assert [parser.find(mapping, 'ar:SHORT-NAME')[0].text
+            for mapping in mappings] == ['Signal1', 'Signal2', 'Signal3']
+
+
+def test_anchor_on_not_referable_elements_raises_value_error(parser):
+    with pytest.raises(ValueError):
+        parser.elements(StreamAnchor(DataQuery.XPath('.//LENGTH')))
+    with pytest.raises(ValueError):
+        parser.elements(StreamAnchor(DataQuery.XPath('.//*')))
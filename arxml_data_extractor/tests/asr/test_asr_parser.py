@@ -67,3 +67,124 @@ def test_find_element_by_reference(parser: AsrParser):
 
     assert signal.tag == '{http://autosar.org/schema/r4.0}I-SIGNAL'
     assert AsrParser.get_shortname(signal) == 'SignalData2'
+
+
+def test_reference_index_contains_nested_paths(parser: AsrParser):
+    references = parser.references
+
+    assert '/SystemSignals/SignalData1' in references
+    assert '/Pdus/Bus/PduCollection/MyPdu' in references
+    assert AsrParser.get_shortname(references['/ISignals/Bus/PduCollection/MyPdu']) == 'MyPdu'
+
+
+def test_find_reference_returns_none_if_not_found(parser: AsrParser):
+    assert parser.find_reference('/ISignals/Bus/Unknown') is None
+    assert parser.find_reference('/Unknown/SignalData1') is None
+
+
+def test_back_reference_index(parser: AsrParser):
+    back_references = parser.back_references
+
+    assert '/SystemSignals/SignalData1' in back_references
+    referencing = back_references['/ISignals/Bus/PduCollection/MyPdu/SignalData2']
+    assert len(referencing) == 1
+    assert referencing[0].tag == '{http://autosar.org/schema/r4.0}I-SIGNAL-REF'
+
+
+def test_path_of_element(parser: AsrParser):
+    pdu_package = parser.packages['Pdus']
+
+    assert parser.path_of(pdu_package) == '/Pdus'
+    assert parser.path_of(parser.root) is None
+
+
+def write_arxml(path, packages: str, namespace: str = 'http://autosar.org/schema/r4.0') -> str:
+    path.write_text(f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    f'<AUTOSAR xmlns="{namespace}"><AR-PACKAGES>{packages}</AR-PACKAGES></AUTOSAR>')
+    return str(path)
+
+
+@pytest.fixture
+def split_files(tmp_path) -> list:
+    signals = write_arxml(
+        tmp_path / 'signals.arxml', '<AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME><ELEMENTS>'
+        '<I-SIGNAL><SHORT-NAME>Speed</SHORT-NAME></I-SIGNAL></ELEMENTS>'
+        '<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>Body</SHORT-NAME><ELEMENTS>'
+        '<I-SIGNAL><SHORT-NAME>Door</SHORT-NAME></I-SIGNAL></ELEMENTS></AR-PACKAGE></AR-PACKAGES>'
+        '</AR-PACKAGE>')
+    pdus = write_arxml(
+        tmp_path / 'pdus.arxml', '<AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME><ELEMENTS>'
+        '<I-SIGNAL><SHORT-NAME>Rpm</SHORT-NAME></I-SIGNAL></ELEMENTS>'
+        '<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>Body</SHORT-NAME><ELEMENTS>'
+        '<I-SIGNAL><SHORT-NAME>Window</SHORT-NAME></I-SIGNAL></ELEMENTS></AR-PACKAGE></AR-PACKAGES>'
+        '</AR-PACKAGE>'
+        '<AR-PACKAGE><SHORT-NAME>Pdus</SHORT-NAME><ELEMENTS><I-SIGNAL-I-PDU><SHORT-NAME>Pdu</SHORT-NAME>'
+        '<I-SIGNAL-TO-PDU-MAPPINGS><I-SIGNAL-TO-I-PDU-MAPPING><SHORT-NAME>SpeedMapping</SHORT-NAME>'
+        '<I-SIGNAL-REF DEST="I-SIGNAL">/Signals/Speed</I-SIGNAL-REF>'
+        '</I-SIGNAL-TO-I-PDU-MAPPING></I-SIGNAL-TO-PDU-MAPPINGS></I-SIGNAL-I-PDU></ELEMENTS>'
+        '</AR-PACKAGE>')
+    return [signals, pdus]
+
+
+def test_merges_packages_of_multiple_files(split_files):
+    parser = AsrParser(split_files)
+
+    assert list(parser.packages.keys()) == ['Signals', 'Pdus']
+    assert [parser.get_shortname(signal) for signal in parser.find_all_elements('I-SIGNAL')
+           ] == ['Speed', 'Rpm', 'Door', 'Window']
+    assert len(parser.find_all_elements('AR-PACKAGE')) == 3
+    assert parser.find_reference('/Signals/Body/Window') is not None
+
+
+def test_resolves_references_across_files(split_files):
+    parser = AsrParser(split_files)
+
+    referencing = parser.back_references['/Signals/Speed']
+    assert len(referencing) == 1
+    assert parser.get_shortname(referencing[0].getparent()) == 'SpeedMapping'
+    assert parser.get_shortname(parser.find_reference(referencing[0].text)) == 'Speed'
+
+
+def test_merges_other_children_of_duplicated_packages(tmp_path, caplog):
+    first = write_arxml(
+        tmp_path / 'first.arxml', '<AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME>'
+        '<CATEGORY>STANDARD</CATEGORY><REFERENCE-BASES><REFERENCE-BASE>'
+        '<SHORT-LABEL>Body</SHORT-LABEL></REFERENCE-BASE></REFERENCE-BASES>'
+        '<ELEMENTS><I-SIGNAL><SHORT-NAME>Speed</SHORT-NAME></I-SIGNAL></ELEMENTS></AR-PACKAGE>')
+    second = write_arxml(
+        tmp_path / 'second.arxml', '<AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME>'
+        '<CATEGORY>BLUEPRINT</CATEGORY><ADMIN-DATA><LANGUAGE>EN</LANGUAGE></ADMIN-DATA>'
+        '<REFERENCE-BASES><REFERENCE-BASE><SHORT-LABEL>Body</SHORT-LABEL></REFERENCE-BASE>'
+        '<REFERENCE-BASE><SHORT-LABEL>Chassis</SHORT-LABEL></REFERENCE-BASE></REFERENCE-BASES>'
+        '<ELEMENTS><I-SIGNAL><SHORT-NAME>Rpm</SHORT-NAME></I-SIGNAL></ELEMENTS></AR-PACKAGE>')
+
+    parser = AsrParser([first, second])
+
+    package = parser.packages['Signals']
+    assert [child.tag.split('}')[1] for child in package] == [
+        'SHORT-NAME', 'CATEGORY', 'REFERENCE-BASES', 'ADMIN-DATA', 'ELEMENTS'
+    ]
+    assert parser.find_elements(package, 'CATEGORY')[0].text == 'STANDARD'
+    assert [label.text for label in parser.find_elements(package, 'SHORT-LABEL')
+           ] == ['Body', 'Chassis']
+    assert 'CATEGORY of package \'Signals\'' in caplog.text
+    assert [parser.get_shortname(signal) for signal in parser.find_all_elements('I-SIGNAL')
+           ] == ['Speed', 'Rpm']
+
+
+def test_single_file_list_equals_file(parser: AsrParser):
+    arxml = 'arxml_data_extractor/tests/asr/test.arxml'
+
+    assert list(AsrParser([arxml]).references.keys()) == list(parser.references.keys())
+
+
+def test_raises_value_error_on_different_namespaces(split_files, tmp_path):
+    other = write_arxml(tmp_path / 'other.arxml', '', 'http://autosar.org/schema/r3.0')
+
+    with pytest.raises(ValueError):
+        AsrParser(split_files + [other])
+
+
+def test_raises_value_error_without_files():
+    with pytest.raises(ValueError):
+        AsrParser([])
@@ -0,0 +1,76 @@
+import pytest
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.asr_stream_parser import AsrStreamParser, StreamAnchor, PendingReference
+from arxml_data_extractor.query.data_query import DataQuery
+
+arxml = 'arxml_data_extractor/tests/asr/test.arxml'
+
+
+def test_collects_paths_and_references():
+    parser = AsrStreamParser(arxml)
+
+    assert '/Pdus/Bus/PduCollection/MyPdu' in parser.paths
+    assert '/ISignals/Bus/PduCollection/MyPdu/SignalData1' in parser.referenced
+    assert '/SystemSignals/SignalData2' in parser.referenced
+
+
+def test_collects_only_references_of_specified_tags():
+    parser = AsrStreamParser(arxml, {'SYSTEM-SIGNAL-REF'})
+
+    assert parser.referenced == {'/SystemSignals/SignalData1', '/SystemSignals/SignalData2'}
+
+
+def test_yields_elements_matching_anchors():
+    parser = AsrStreamParser(arxml)
+    anchors = [
+        StreamAnchor(DataQuery.XPath('.//I-SIGNAL')),
+        StreamAnchor(DataQuery.Reference('/SystemSignals/SignalData2'))
+    ]
+
+    found = [(i, AsrParser.get_shortname(element)) for i, element in parser.iterate(anchors)]
+
+    assert found == [(1, 'SignalData2'), (0, 'SignalData1'), (0, 'SignalData2')]
+
+
+def test_finds_references_after_streaming():
+    parser = AsrStreamParser(arxml, {'I-SIGNAL-REF'})
+    for _ in parser.iterate([]):
+        pass
+
+    signal = parser.find_reference('/ISignals/Bus/PduCollection/MyPdu/SignalData2')
+
+    assert AsrParser.get_shortname(signal) == 'SignalData2'
+    assert parser.find_reference('/SystemSignals/SignalData2') is None
+
+
+def test_raises_pending_reference_for_elements_not_streamed_yet():
+    parser = AsrStreamParser(arxml, set())
+
+    with pytest.raises(PendingReference):
+        parser.find_reference('/SystemSignals/SignalData1')
+
+
+@pytest.mark.parametrize('xpath, tags, matches', [
+    ('.//I-SIGNAL', ['AUTOSAR', 'AR-PACKAGES', 'I-SIGNAL'], True),
+    ('.//ELEMENTS/I-SIGNAL', ['AUTOSAR', 'AR-PACKAGES', 'I-SIGNAL'], False),
+    ('.//*/I-SIGNAL', ['AUTOSAR', 'ELEMENTS', 'I-SIGNAL'], True),
+    ('.//AUTOSAR', ['AUTOSAR'], False),
+    ('//AUTOSAR', ['AUTOSAR'], True),
+    ('./AR-PACKAGES/AR-PACKAGE', ['AUTOSAR', 'AR-PACKAGES', 'AR-PACKAGE'], True),
+    ('AR-PACKAGE', ['AUTOSAR', 'AR-PACKAGES', 'AR-PACKAGE'], False),
+])
+def test_anchor_matches_tags(xpath, tags, matches):
+    anchor = StreamAnchor(DataQuery.XPath(xpath))
+
+    assert anchor.matches(tags) == matches
+
+
+@pytest.mark.parametrize('path', [
+    DataQuery.XPath('.//I-SIGNAL[SHORT-NAME="Signal1"]'),
+    DataQuery.XPath('.//I-SIGNAL/..'),
+    DataQuery.XPath('I-SIGNAL-REF', True),
+])
+def test_anchor_not_supported_in_streaming_mode(path):
+    with pytest.raises(ValueError):
+        StreamAnchor(path)
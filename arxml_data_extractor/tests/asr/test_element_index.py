@@ -0,0 +1,88 @@
+import os
+import pytest
+import shutil
+
+from arxml_data_extractor.asr.element_index import ElementIndex
+
+
+@pytest.fixture
+def arxml(tmp_path) -> str:
+    file = tmp_path / 'test.arxml'
+    shutil.copy('arxml_data_extractor/tests/test.arxml', file)
+    return str(file)
+
+
+def test_builds_index_next_to_file(arxml):
+    index = ElementIndex(arxml)
+    index.close()
+
+    assert index.built
+    assert index.count == 12
+    assert os.path.isfile(arxml + '.index.db')
+
+
+def test_reuses_valid_index(arxml):
+    ElementIndex(arxml).close()
+
+    index = ElementIndex(arxml)
+
+    assert not index.built
+    assert index.find('/ISignal/Signal2').tag == 'I-SIGNAL'
+    index.close()
+
+
+def test_keeps_index_of_touched_file(arxml):
+    ElementIndex(arxml).close()
+    stat = os.stat(arxml)
+    os.utime(arxml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    index = ElementIndex(arxml)
+    index.close()
+
+    assert not index.built
+
+
+def test_rebuilds_index_of_changed_file(arxml):
+    ElementIndex(arxml).close()
+    with open(arxml, 'a') as f:
+        f.write('\n')
+
+    index = ElementIndex(arxml)
+    index.close()
+
+    assert index.built
+
+
+def test_missing_index_raises_value_error_without_build(arxml):
+    with pytest.raises(ValueError):
+        ElementIndex(arxml, build=False)
+
+
+def test_finds_elements_by_path_and_tag(arxml):
+    index = ElementIndex(arxml)
+
+    signal = index.find('/PDU/RxMessage/Signal3')
+    signals = index.elements_by_tag('I-SIGNAL')
+
+    assert signal.parent == '/PDU/RxMessage'
+    assert signal.short_name == 'Signal3'
+    assert signal.tags.endswith('I-SIGNAL-I-PDU/I-SIGNAL-TO-PDU-MAPPINGS/I-SIGNAL-TO-I-PDU-MAPPING')
+    assert index.find('/PDU/Unknown') is None
+    assert [record.path for record in signals
+           ] == ['/ISignal/Signal1', '/ISignal/Signal2', '/ISignal/Signal3']
+    assert index.covers('I-SIGNAL')
+    assert not index.covers('LENGTH')
+    index.close()
+
+
+def test_offsets_hold_first_element_of_each_path(tmp_path):
+    file = tmp_path / 'duplicates.arxml'
+    file.write_text('<AUTOSAR><AR-PACKAGES><AR-PACKAGE><SHORT-NAME>P</SHORT-NAME></AR-PACKAGE>'
+                    '<AR-PACKAGE><SHORT-NAME>P</SHORT-NAME></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    index = ElementIndex(str(file))
+
+    offsets = index.offsets()
+
+    assert offsets == {'/P': (22, 73)}
+    assert (index.find('/P').start, index.find('/P').end) == offsets['/P']
+    index.close()
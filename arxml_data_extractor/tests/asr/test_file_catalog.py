@@ -0,0 +1,143 @@
+import pickle
+import pytest
+from pathlib import Path
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.file_catalog import FileCatalog
+from arxml_data_extractor.handler.result_memo import ResultMemo
+
+
+def write_arxml(path, packages: str, namespace: str = 'http://autosar.org/schema/r4.0') -> str:
+    path.write_text(f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    f'<AUTOSAR xmlns="{namespace}"><AR-PACKAGES>{packages}</AR-PACKAGES></AUTOSAR>')
+    return str(path)
+
+
+def signal_package(package: str, *signals: str) -> str:
+    elements = ''.join(f'<I-SIGNAL><SHORT-NAME>{signal}</SHORT-NAME><LENGTH>8</LENGTH></I-SIGNAL>'
+                       for signal in signals)
+    return f'<AR-PACKAGE><SHORT-NAME>{package}</SHORT-NAME><ELEMENTS>{elements}</ELEMENTS></AR-PACKAGE>'
+
+
+@pytest.fixture
+def directory(tmp_path):
+    catalog = tmp_path / 'catalog'
+    (catalog / 'body').mkdir(parents=True)
+    write_arxml(catalog / 'powertrain.arxml', signal_package('Signals', 'Speed', 'Rpm'))
+    write_arxml(catalog / 'body' / 'body.arxml',
+                signal_package('Signals', 'Door') + signal_package('Body', 'Window'))
+    write_arxml(catalog / 'r3.arxml', signal_package('Old', 'Horn'), 'http://autosar.org/3.1.4')
+    (catalog / 'broken.arxml').write_text('<AUTOSAR>')
+    return catalog
+
+
+@pytest.fixture
+def pdus(tmp_path) -> str:
+    return write_arxml(
+        tmp_path / 'pdus.arxml', '<AR-PACKAGE><SHORT-NAME>Pdus</SHORT-NAME><ELEMENTS>'
+        '<I-SIGNAL-I-PDU><SHORT-NAME>Pdu</SHORT-NAME><I-SIGNAL-TO-PDU-MAPPINGS>'
+        '<I-SIGNAL-TO-I-PDU-MAPPING><SHORT-NAME>DoorMapping</SHORT-NAME>'
+        '<I-SIGNAL-REF DEST="I-SIGNAL">/Signals/Door</I-SIGNAL-REF>'
+        '</I-SIGNAL-TO-I-PDU-MAPPING></I-SIGNAL-TO-PDU-MAPPINGS></I-SIGNAL-I-PDU>'
+        '</ELEMENTS></AR-PACKAGE>')
+
+
+def test_scans_paths_and_packages_of_all_files(directory):
+    catalog = FileCatalog(str(directory))
+
+    assert [Path(file).name for file in catalog.files] == ['body.arxml', 'powertrain.arxml']
+    assert catalog.file_of('/Signals/Door') == catalog.files[0]
+    assert catalog.file_of('/Signals/Speed') == catalog.files[1]
+    assert catalog.file_of('/Body/Window') == catalog.files[0]
+    assert catalog.file_of('/Old/Horn') is None
+    assert catalog.files_of_package('Signals') == catalog.files
+    assert catalog.files_of_package('Body') == catalog.files[:1]
+    assert catalog.loads == 0
+
+
+def test_loads_files_on_first_reference(directory):
+    catalog = FileCatalog(str(directory))
+
+    speed = catalog.find_reference('/Signals/Speed')
+    rpm = catalog.find_reference('/Signals/Rpm')
+
+    assert AsrParser.get_shortname(speed) == 'Speed'
+    assert AsrParser.get_shortname(rpm) == 'Rpm'
+    assert catalog.find_reference('/Signals/Unknown') is None
+    assert catalog.loads == 1
+
+
+def test_drops_least_recently_used_files(directory):
+    catalog = FileCatalog(str(directory), memory_budget=1)
+
+    catalog.find_reference('/Signals/Speed')
+    catalog.find_reference('/Signals/Door')
+    catalog.find_reference('/Signals/Speed')
+
+    assert catalog.loads == 3
+    assert 'loaded=1' in str(catalog)
+
+
+def test_dropped_files_are_discarded_from_attached_memos(directory):
+    catalog = FileCatalog(str(directory), memory_budget=1)
+    memo = ResultMemo()
+    catalog.attach(memo)
+
+    memo.put(('plan', catalog.find_reference('/Signals/Speed')), {'Name': 'Speed'})
+    door = catalog.find_reference('/Signals/Door')
+    memo.put(('plan', door), {'Name': 'Door'})
+
+    assert len(memo) == 1
+    assert memo.get(('plan', door)) == {'Name': 'Door'}
+
+
+def test_path_of_loaded_element(directory):
+    catalog = FileCatalog(str(directory))
+    window = catalog.find_reference('/Body/Window')
+
+    assert FileCatalog.path_of(window) == '/Body/Window'
+    assert FileCatalog.path_of(window[1]) is None
+
+
+def test_parser_resolves_references_by_catalog(directory, pdus):
+    parser = AsrParser(pdus, catalog=FileCatalog(str(directory)))
+    reference = parser.find_all_elements('I-SIGNAL-REF')[0]
+
+    door = parser.find_reference(reference.text)
+
+    assert AsrParser.get_shortname(door) == 'Door'
+    assert parser.path_of(door) == '/Signals/Door'
+    assert parser.find_reference('/Pdus/Pdu') is not None
+    assert parser.catalog.loads == 1
+
+
+def test_pickled_catalog_drops_loaded_files(directory):
+    catalog = FileCatalog(str(directory))
+    catalog.find_reference('/Signals/Speed')
+
+    copy = pickle.loads(pickle.dumps(catalog))
+
+    assert copy.paths == catalog.paths
+    assert 'loaded=0' in str(copy)
+    assert AsrParser.get_shortname(copy.find_reference('/Signals/Speed')) == 'Speed'
+
+
+def test_rescans_only_modified_files(directory, tmp_path):
+    cache = str(tmp_path / 'catalog.json')
+    FileCatalog(str(directory), cache=cache)
+
+    cached = FileCatalog(str(directory), cache=cache)
+    scanned = FileCatalog(str(directory))
+    write_arxml(directory / 'powertrain.arxml', signal_package('Signals', 'Speed', 'Torque'))
+    modified = FileCatalog(str(directory), cache=cache)
+
+    assert cached.scanned == 0
+    assert cached.paths == scanned.paths
+    assert modified.scanned == 1
+    assert modified.file_of('/Signals/Torque') == modified.files[1]
+    assert modified.file_of('/Signals/Rpm') is None
+
+
+def test_raises_value_error_if_directory_does_not_exist(tmp_path):
+    with pytest.raises(ValueError):
+        FileCatalog(str(tmp_path / 'missing'))
@@ -0,0 +1,63 @@
+import pytest
+
+from lxml import etree
+
+from arxml_data_extractor.asr.offset_scanner import OffsetScanner
+
+arxml = 'arxml_data_extractor/tests/test.arxml'
+
+
+def test_scans_paths_of_referable_elements():
+    scanner = OffsetScanner(arxml)
+
+    paths = [offsets[0] for offsets in scanner.scan()]
+
+    assert paths == [
+        '/Cluster/CAN', '/Cluster', '/PDU/TxMessage/Signal1', '/PDU/TxMessage',
+        '/PDU/RxMessage/Signal2', '/PDU/RxMessage/Signal3', '/PDU/RxMessage', '/PDU',
+        '/ISignal/Signal1', '/ISignal/Signal2', '/ISignal/Signal3', '/ISignal'
+    ]
+
+
+def test_byte_ranges_hold_the_elements():
+    scanner = OffsetScanner(arxml)
+    with open(arxml, 'rb') as f:
+        content = f.read()
+
+    for path, tag, parent, short_name, line, start, end, tags in scanner.scan():
+        element = etree.fromstring(content[start:end], etree.XMLParser(recover=True))
+        assert element.tag == tag
+        assert element.findtext('SHORT-NAME') == short_name
+        assert f'{parent}/{short_name}' == path
+        assert tags.split('/')[-1] == tag
+        assert content[:start].count(b'\n') + 1 == line
+
+
+def test_counts_tags_and_keeps_root():
+    scanner = OffsetScanner(arxml)
+    records = list(scanner.scan())
+
+    assert scanner.root.startswith(b'<AUTOSAR ')
+    assert scanner.tags['I-SIGNAL'] == (3, 3)
+    assert scanner.tags['I-SIGNAL-TO-I-PDU-MAPPING'] == (3, 3)
+    assert scanner.tags['LENGTH'][1] == 0
+    assert sum(referable for _, referable in scanner.tags.values()) == len(records)
+
+
+def test_skips_comments_and_cdata(tmp_path):
+    file = tmp_path / 'comments.arxml'
+    file.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<AUTOSAR xmlns="x"><!-- <A> -->'
+                    '<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>P&amp;Q</SHORT-NAME><DESC>'
+                    '<![CDATA[<B>]]></DESC><EMPTY/></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    scanner = OffsetScanner(str(file))
+
+    assert [offsets[0] for offsets in scanner.scan()] == ['/P&Q']
+    assert scanner.tags['EMPTY'] == (1, 0)
+
+
+def test_unbalanced_tags_raise_value_error(tmp_path):
+    file = tmp_path / 'broken.arxml'
+    file.write_text('<AUTOSAR><AR-PACKAGES></AUTOSAR>')
+
+    with pytest.raises(ValueError):
+        list(OffsetScanner(str(file)).scan())
@@ -0,0 +1,129 @@
+import pytest
+
+from lxml import etree
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.prune_plan import PrunePlan
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_value import DataValue
+
+arxml = 'arxml_data_extractor/tests/test.arxml'
+
+
+def name_object(path) -> DataObject:
+    return DataObject('Object', path, [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+
+
+@pytest.fixture
+def documented(tmp_path) -> str:
+    file = tmp_path / 'documented.arxml'
+    file.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES>'
+        '<AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME><ELEMENTS><I-SIGNAL><SHORT-NAME>Speed</SHORT-NAME>'
+        '<ADMIN-DATA><SDGS><SDG GID="Id"><SD>1</SD></SDG></SDGS></ADMIN-DATA>'
+        '<DESC><L-2 L="EN">Vehicle speed</L-2></DESC><LENGTH>16</LENGTH></I-SIGNAL></ELEMENTS></AR-PACKAGE>'
+        '<AR-PACKAGE><SHORT-NAME>Unused</SHORT-NAME><ELEMENTS><I-SIGNAL><SHORT-NAME>Rpm</SHORT-NAME>'
+        '</I-SIGNAL></ELEMENTS></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    return str(file)
+
+
+def test_references_select_packages():
+    plan = PrunePlan([name_object(DataQuery.Reference('/Cluster/CAN'))])
+
+    assert plan.packages == {'Cluster'}
+    assert not plan.all_packages
+    assert plan.drop == set(PrunePlan.prunable)
+
+
+@pytest.mark.parametrize('path', [
+    DataQuery.XPath('.//*'),
+    DataQuery.XPath('.//I-SIGNAL[SHORT-NAME="x"]'),
+])
+def test_unsupported_root_anchor_keeps_all_packages(path):
+    plan = PrunePlan([name_object(path)])
+
+    assert plan.all_packages
+
+
+@pytest.mark.parametrize('xpath', ['I-SIGNAL-REF', '//I-SIGNAL', '../SHORT-NAME', 'ancestor::AR-PACKAGE'])
+def test_queries_leaving_their_package_keep_all_packages(xpath):
+    data_object = DataObject('PDU', DataQuery.XPath('.//I-SIGNAL-I-PDU'), [
+        DataObject('Other', DataQuery.XPath(xpath, is_reference=xpath.endswith('REF')),
+                   [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+    ])
+
+    plan = PrunePlan([data_object])
+
+    assert plan.all_packages
+    assert plan.anchors == {'I-SIGNAL-I-PDU'}
+
+
+def test_named_tags_and_wildcards_keep_subtrees():
+    described = DataObject('Signal', DataQuery.XPath('.//I-SIGNAL'),
+                           [DataValue('Description', DataQuery(DataQuery.XPath('DESC/L-2')))])
+    any_child = DataObject('Signal', DataQuery.XPath('.//I-SIGNAL'),
+                           [DataValue('First', DataQuery(DataQuery.XPath('*'), value='tag'))])
+
+    assert 'DESC' not in PrunePlan([described]).drop
+    assert PrunePlan([any_child]).drop == set()
+
+
+def test_back_reference_disables_pruning():
+    data_object = DataObject('Signal', DataQuery.XPath('.//I-SIGNAL'), [
+        DataObject('PDU', DataQuery.BackReference('I-SIGNAL-I-PDU'),
+                   [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+    ])
+
+    plan = PrunePlan([data_object])
+
+    assert not plan.enabled
+    assert plan.drop == set()
+
+
+def test_parse_drops_documentation_and_unreached_packages(documented):
+    plan = PrunePlan([
+        DataObject('Signal', DataQuery.Reference('/Signals/Speed'),
+                   [DataValue('Length', DataQuery(DataQuery.XPath('LENGTH')))])
+    ])
+
+    tree, report = plan.parse(documented)
+
+    assert report.packages == ['Unused']
+    assert report.pruned == 11
+    assert report.elements == 8
+    assert 0 < report.saved
+    assert [etree.QName(e).localname for e in tree.iter()] == [
+        'AUTOSAR', 'AR-PACKAGES', 'AR-PACKAGE', 'SHORT-NAME', 'ELEMENTS', 'I-SIGNAL',
+        'SHORT-NAME', 'LENGTH'
+    ]
+
+
+def test_parse_keeps_packages_with_anchor_elements(documented):
+    plan = PrunePlan([name_object(DataQuery.XPath('.//I-SIGNAL'))])
+
+    tree, report = plan.parse(documented)
+
+    assert report.packages == []
+    assert len(tree.getroot()[0]) == 2
+
+
+def test_parse_keeps_text_after_pruned_element(tmp_path):
+    file = tmp_path / 'mixed.arxml'
+    file.write_text('<AUTOSAR xmlns="x"><AR-PACKAGES><AR-PACKAGE><SHORT-NAME>P</SHORT-NAME>'
+                    '<L-1>a<DESC>b</DESC>c<DESC>d</DESC>e</L-1></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    plan = PrunePlan([name_object(DataQuery.XPath('.//AR-PACKAGE'))])
+
+    tree, report = plan.parse(str(file))
+
+    assert report.pruned == 2
+    assert tree.getroot().findtext('.//{x}L-1') == 'ace'
+
+
+def test_asr_parser_finds_references_in_pruned_tree():
+    parser = AsrParser(arxml, prune=PrunePlan([name_object(DataQuery.Reference('/Cluster/CAN'))]))
+
+    assert AsrParser.get_shortname(parser.find_reference('/Cluster/CAN')) == 'CAN'
+    assert parser.find_reference('/ISignal/Signal1') is None
+    assert parser.prune_report.packages == ['PDU', 'ISignal']
@@ -0,0 +1,83 @@
+from lxml import etree
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.xpath_cache import XPathCache
+
+namespaces = {'ar': 'http://autosar.org/schema/r4.0'}
+
+
+def test_compiles_path_on_first_use():
+    cache = XPathCache(namespaces, AsrParser.assemble_xpath)
+
+    xpath = cache.get('.//I-SIGNAL/SHORT-NAME')
+
+    assert isinstance(xpath, etree.XPath)
+    assert xpath.path == './/ar:I-SIGNAL/ar:SHORT-NAME'
+    assert cache.misses == 1
+    assert cache.hits == 0
+
+
+def test_returns_cached_xpath():
+    cache = XPathCache(namespaces, AsrParser.assemble_xpath)
+
+    first = cache.get('SHORT-NAME')
+    second = cache.get('SHORT-NAME')
+
+    assert first is second
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+def test_drops_least_recently_used_xpath():
+    cache = XPathCache(namespaces, AsrParser.assemble_xpath, maxsize=2)
+
+    first = cache.get('SHORT-NAME')
+    cache.get('LENGTH')
+    cache.get('SHORT-NAME')
+    cache.get('LONG-NAME')
+
+    assert len(cache) == 2
+    assert cache.get('SHORT-NAME') is first
+    assert cache.misses == 3
+    cache.get('LENGTH')
+    assert cache.misses == 4
+
+
+def test_parser_shares_cache():
+    parser = AsrParser('arxml_data_extractor/tests/asr/test.arxml')
+    other = AsrParser('arxml_data_extractor/tests/asr/test.arxml')
+    hits = parser.xpath_cache.hits
+
+    xpath = parser.compile_xpath('.//I-SIGNAL')
+
+    assert other.xpath_cache is parser.xpath_cache
+    assert other.compile_xpath('.//I-SIGNAL') is xpath
+    assert len(AsrParser.find(parser.root, xpath)) == 2
+    assert parser.xpath_cache.hits == hits + 1
+
+
+def test_parser_lookups_use_cache():
+    parser = AsrParser('arxml_data_extractor/tests/asr/test.arxml')
+    signal = parser.find_all_elements('I-SIGNAL')[0]
+    misses = parser.xpath_cache.misses
+
+    parser.find_all_elements('I-SIGNAL')
+    AsrParser.get_shortname(signal)
+    AsrParser.find_elements(parser.root, 'I-SIGNAL')
+    AsrParser.find_elements(parser.root, 'I-SIGNAL')
+
+    assert parser.xpath_cache.misses == misses + 1
+    assert AsrParser.get_shortname(signal) == 'SignalData1'
+
+
+def test_cache_is_replaced_for_other_namespace(tmp_path):
+    parser = AsrParser('arxml_data_extractor/tests/asr/test.arxml')
+    file = tmp_path / 'r3.arxml'
+    file.write_text('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<AUTOSAR xmlns="http://autosar.org/3.1.4"><AR-PACKAGES><AR-PACKAGE>'
+                    '<SHORT-NAME>Old</SHORT-NAME></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+
+    other = AsrParser(str(file))
+
+    assert other.xpath_cache is not parser.xpath_cache
+    assert list(other.packages) == ['Old']
@@ -0,0 +1,96 @@
+import pytest
+from array import array
+
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.schema import ObjectSchema, ValueSchema
+
+
+@pytest.fixture
+def schema():
+    return ObjectSchema('PDU', [
+        ValueSchema('Name'),
+        ValueSchema('Length', DataQuery.Format.Integer),
+        ValueSchema('Timing', DataQuery.Format.Float),
+        ObjectSchema('Signals', [
+            ValueSchema('Signal'),
+            ValueSchema('Position', DataQuery.Format.Integer),
+        ])
+    ])
+
+
+@pytest.fixture
+def values():
+    return [{
+        'Name': 'TxMessage',
+        'Length': 8,
+        'Timing': 0.1,
+        'Signals': []
+    }, {
+        'Name': 'RxMessage',
+        'Length': None,
+        'Timing': 0.2,
+        'Signals': {
+            'Signal': 'Signal1',
+            'Position': 0
+        }
+    }, {
+        'Name': 'RxMessage',
+        'Length': '0xZZ',
+        'Timing': None,
+        'Signals': [{
+            'Signal': 'Signal2',
+            'Position': 0
+        }, {
+            'Signal': 'Signal3',
+            'Position': 2**70
+        }]
+    }]
+
+
+def test_round_trip_keeps_shape_of_results(schema, values):
+    result = ColumnarResult.from_results(schema, values)
+
+    assert len(result) == 3
+    assert list(result) == values
+    assert result.to_results() == values
+    assert result[-1] == values[2]
+
+
+def test_single_element_results_in_dict(schema, values):
+    result = ColumnarResult.from_results(schema, values[1])
+
+    assert result.to_results() == values[1]
+
+
+def test_numbers_are_stored_in_typed_arrays(schema, values):
+    result = ColumnarResult.from_results(schema, values)
+
+    assert result.columns['Length'] == array('q', [8, 0, 0])
+    assert result.columns['Timing'] == array('d', [0.1, 0.2, 0.0])
+    assert result.exceptions['Length'] == {1: None, 2: '0xZZ'}
+    assert result.column('Length') == [8, None, '0xZZ']
+    assert result.nested['Signals'].column('Position') == [0, 0, 2**70]
+
+
+def test_equal_strings_share_one_object(schema, values):
+    values[2]['Name'] = ''.join(['Rx', 'Message'])
+    assert values[1]['Name'] is not values[2]['Name']
+
+    result = ColumnarResult.from_results(schema, values)
+
+    assert result[1]['Name'] is result[2]['Name']
+
+
+def test_offsets_of_nested_objects(schema, values):
+    result = ColumnarResult.from_results(schema, values)
+
+    assert result.offsets['Signals'] == array('q', [0, 0, 1, 3])
+    assert list(result.parent_indices('Signals')) == [1, 2, 2]
+
+
+def test_index_out_of_range_raises_index_error(schema, values):
+    result = ColumnarResult.from_results(schema, values)
+
+    with pytest.raises(IndexError):
+        result[3]
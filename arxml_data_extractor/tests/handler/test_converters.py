@@ -0,0 +1,81 @@
+import arrow
+import pytest
+from datetime import datetime, timezone, timedelta
+from lxml import etree
+
+from arxml_data_extractor.handler import value_handler
+from arxml_data_extractor.handler.converters import Converters, parse_date
+from arxml_data_extractor.query.data_query import DataQuery
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2020-01-01', datetime(2020, 1, 1, tzinfo=timezone.utc)),
+    ('2020-01-01T10:30:00Z', datetime(2020, 1, 1, 10, 30, tzinfo=timezone.utc)),
+    ('2020-01-01T10:30:00+02:00', datetime(2020, 1, 1, 10, 30, tzinfo=timezone(timedelta(hours=2)))),
+])
+def test_parse_iso_dates_like_arrow(value, expected):
+    date = parse_date(value)
+
+    assert date == expected
+    assert date.isoformat() == arrow.get(value).isoformat()
+
+
+def test_other_formats_are_parsed_by_arrow():
+    assert parse_date('2020-01') == arrow.get('2020-01').datetime
+
+
+@pytest.mark.parametrize('format, value, expected', [
+    (DataQuery.Format.String, '42', '42'),
+    (DataQuery.Format.Integer, '42', 42),
+    (DataQuery.Format.Float, '0.5', 0.5),
+    (DataQuery.Format.Integer, 'invalid', 'invalid'),
+])
+def test_convert_value(format, value, expected):
+    assert Converters().compile(format)(value) == expected
+
+
+def test_arrow_dates_are_opt_in():
+    date = '2020-01-01'
+
+    assert isinstance(Converters().compile(DataQuery.Format.Date)(date), datetime)
+    assert isinstance(Converters(arrow_dates=True).compile(DataQuery.Format.Date)(date), arrow.Arrow)
+
+
+def test_memoizes_repeated_dates():
+    converters = Converters()
+    convert = converters.compile(DataQuery.Format.Date)
+
+    first = convert('2020-01-01')
+    assert convert(''.join(['2020-01', '-01'])) is first
+    assert converters.date_memo.hits == 1
+
+
+def test_value_handler_keeps_date_memo_across_calls():
+    node = etree.fromstring('<DATE>2021-06-01</DATE>')
+    query = DataQuery(DataQuery.XPath('.'), format=DataQuery.Format.Date)
+
+    first = value_handler.handle(query, node)
+
+    assert value_handler.handle(query, node) is first
+
+
+def test_date_memo_can_be_disabled():
+    converters = Converters(date_memo_size=0)
+
+    assert converters.date_memo is None
+    assert converters.compile(DataQuery.Format.Date)('2020-01-01') == parse_date('2020-01-01')
+
+
+def test_convert_column_once_per_distinct_value():
+    converted = []
+
+    class Counting(Converters):
+
+        def compile(self, format):
+            convert = super().compile(format)
+            return lambda value: converted.append(value) or convert(value)
+
+    values = Counting().compile_column(DataQuery.Format.Integer)(['1', None, '2', '1'])
+
+    assert values == [1, None, 2, 1]
+    assert converted == ['1', '2']
@@ -0,0 +1,42 @@
+from arxml_data_extractor.handler.intern_pool import InternPool, summarize
+
+
+def test_returns_first_equal_string():
+    pool = InternPool()
+    first = ''.join(['CAN', 'Cluster'])
+    second = ''.join(['CAN', 'Cluster'])
+
+    assert pool.intern(first) is first
+    assert pool.intern(second) is first
+    assert pool.hits == 1
+    assert pool.misses == 1
+    assert pool.saved > 0
+
+
+def test_none_is_not_pooled():
+    pool = InternPool()
+
+    assert pool.intern(None) is None
+    assert len(pool) == 0
+    assert pool.misses == 0
+
+
+def test_full_pool_keeps_pooled_strings():
+    pool = InternPool(maxsize=1)
+    first = ''.join(['Signal', '1'])
+    other = ''.join(['Signal', '2'])
+
+    pool.intern(first)
+    assert pool.intern(other) is other
+    assert pool.intern(''.join(['Signal', '2'])) is not other
+    assert pool.intern(''.join(['Signal', '1'])) is first
+    assert len(pool) == 1
+
+
+def test_summarize_pools():
+    pool = InternPool()
+    pool.intern('Signal')
+    pool.intern(''.join(['Sig', 'nal']))
+
+    assert summarize([('Signals/Name', pool)]).startswith(
+        'interned strings of 1 values: 1/2 hits (50.0%)')
@@ -0,0 +1,82 @@
+import pytest
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.query.data_value import DataValue
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+
+arxml = 'arxml_data_extractor/tests/test.arxml'
+
+
+@pytest.fixture(scope='module')
+def parser() -> AsrParser:
+    return AsrParser(arxml)
+
+
+@pytest.fixture
+def signals_with_cluster():
+    return DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataObject('Cluster', DataQuery.Reference('/Cluster/CAN'), [
+            DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+            DataValue(
+                'Baudrate',
+                DataQuery(
+                    DataQuery.XPath('CAN-CLUSTER-VARIANTS/CAN-CLUSTER-CONDITIONAL/BAUDRATE'),
+                    format=DataQuery.Format.Integer))
+        ])
+    ])
+
+
+@pytest.mark.parametrize('batched', [False, True])
+def test_memo_reuses_values_of_repeated_elements(parser, signals_with_cluster, batched):
+    object_handler = ObjectHandler(parser, progress=False, batched=batched)
+
+    signals = object_handler.handle(signals_with_cluster)
+
+    assert len(signals) == 3
+    assert all(s['Cluster'] == {'Name': 'CAN', 'Baudrate': 500000} for s in signals)
+    assert signals[0]['Cluster'] is signals[1]['Cluster'] is signals[2]['Cluster']
+    assert object_handler.memo.misses == 1
+    assert object_handler.memo.hits == (0 if batched else 2)
+
+
+@pytest.fixture
+def signal_tags():
+    return DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataValue('Tag', DataQuery(DataQuery.XPath('.'), value='tag'))
+    ])
+
+
+@pytest.mark.parametrize('batched', [False, True])
+def test_equal_strings_share_one_object(parser, signal_tags, batched):
+    object_handler = ObjectHandler(parser, progress=False, batched=batched)
+
+    signals = object_handler.handle(signal_tags)
+
+    assert signals[0]['Tag'] is signals[1]['Tag'] is signals[2]['Tag']
+    pools = dict(object_handler.pools)
+    assert pools['Signals/Tag'].hits == 2
+    assert pools['Signals/Name'].hits == 0
+
+
+def test_interning_can_be_disabled(parser, signal_tags):
+    object_handler = ObjectHandler(parser, progress=False, intern_size=0)
+
+    signals = object_handler.handle(signal_tags)
+
+    assert signals[0]['Tag'] == signals[1]['Tag']
+    assert signals[0]['Tag'] is not signals[1]['Tag']
+    assert object_handler.pools == []
+
+
+def test_memo_can_be_disabled(parser, signals_with_cluster):
+    object_handler = ObjectHandler(parser, progress=False, memo_size=0)
+
+    signals = object_handler.handle(signals_with_cluster)
+
+    assert object_handler.memo is None
+    assert signals == ObjectHandler(parser, progress=False).handle(signals_with_cluster)
+    assert signals[0]['Cluster'] is not signals[1]['Cluster']
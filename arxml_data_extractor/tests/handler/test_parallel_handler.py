@@ -0,0 +1,47 @@
+import pytest
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.handler.parallel_handler import ParallelHandler
+from arxml_data_extractor.query.data_value import DataValue
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+
+arxml = 'arxml_data_extractor/tests/test.arxml'
+
+
+@pytest.fixture
+def signals_with_cluster():
+    return DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataObject('Cluster', DataQuery.Reference('/Cluster/CAN'), [
+            DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        ])
+    ])
+
+
+def test_counters_of_workers_are_added_up(signals_with_cluster):
+    parser = AsrParser(arxml)
+    serial = ObjectHandler(parser, progress=False)
+    expected = serial.handle(signals_with_cluster)
+    parallel_handler = ParallelHandler(2, chunks_per_job=2)
+
+    values = parallel_handler.handle(arxml, parser, [signals_with_cluster])
+
+    assert values == [expected]
+    # the values of the root elements are looked up once, no matter which worker
+    # extracts them, nested values depend on the memo of the worker
+    pool = dict(parallel_handler.object_handler.pools)['Signals/Name']
+    assert pool.hits + pool.misses == 3
+    memo = parallel_handler.object_handler.memo
+    assert memo.hits + memo.misses == serial.memo.hits + serial.memo.misses
+
+
+def test_counters_can_be_added():
+    parser = AsrParser(arxml)
+    object_handler = ObjectHandler(parser, progress=False)
+    counters = object_handler.counters()
+
+    object_handler.add_counters([1] * len(counters))
+
+    assert object_handler.counters() == [count + 1 for count in counters]
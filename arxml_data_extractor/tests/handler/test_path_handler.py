@@ -0,0 +1,120 @@
+import pytest
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.path_handler import PathHandler
+from arxml_data_extractor.query.data_query import DataQuery
+
+arxml = 'arxml_data_extractor/tests/test.arxml'
+
+
+@pytest.fixture(scope='module')
+def parser() -> AsrParser:
+    return AsrParser(arxml)
+
+
+@pytest.mark.parametrize('path, steps', [
+    ('.//I-SIGNAL', ['I-SIGNAL']),
+    ('//I-SIGNAL-TO-PDU-MAPPINGS/I-SIGNAL-TO-I-PDU-MAPPING',
+     ['I-SIGNAL-TO-PDU-MAPPINGS', 'I-SIGNAL-TO-I-PDU-MAPPING']),
+    ('./I-SIGNAL', None),
+    ('I-SIGNAL', None),
+    ('.//*/I-PDU-TIMING', None),
+    ('.//I-SIGNAL[SHORT-NAME="Signal1"]', None),
+    ('.//ELEMENTS//I-SIGNAL', None),
+])
+def test_descendant_steps(parser, path, steps):
+    path_handler = PathHandler(parser)
+
+    assert path_handler.descendant_steps(path) == steps
+
+
+@pytest.mark.parametrize('path', [
+    './/I-SIGNAL', '//I-SIGNAL', './/ELEMENTS/I-SIGNAL', './/AR-PACKAGE/I-SIGNAL', '//AUTOSAR',
+    './/AUTOSAR', '//AUTOSAR/AR-PACKAGES', './/AUTOSAR/AR-PACKAGES', './/AR-PACKAGES/AR-PACKAGE',
+    './/I-SIGNAL-TO-PDU-MAPPINGS/I-SIGNAL-TO-I-PDU-MAPPING/I-SIGNAL-REF'
+])
+def test_tag_index_returns_same_elements_as_xpath(parser, path):
+    indexed = PathHandler(parser, use_tag_index=True)
+    not_indexed = PathHandler(parser, use_tag_index=False)
+
+    assert indexed.elements_by_xpath(path, parser.root) == not_indexed.elements_by_xpath(
+        path, parser.root)
+
+
+def test_tag_index_is_used_for_absolute_path_from_any_node(parser):
+    path_handler = PathHandler(parser)
+    node = parser.find_reference('/PDU/TxMessage')
+
+    elements = path_handler.elements_by_xpath('//I-SIGNAL-TO-I-PDU-MAPPING', node)
+
+    assert len(elements) == 3
+
+
+def test_relative_descendant_path_is_limited_to_node(parser):
+    path_handler = PathHandler(parser)
+    node = parser.find_reference('/PDU/TxMessage')
+
+    elements = path_handler.elements_by_xpath('.//I-SIGNAL-TO-I-PDU-MAPPING', node)
+
+    assert len(elements) == 1
+
+
+@pytest.mark.parametrize('path', [
+    DataQuery.XPath('.//I-SIGNAL-TO-I-PDU-MAPPING'),
+    DataQuery.XPath('I-SIGNAL-TO-PDU-MAPPINGS/I-SIGNAL-TO-I-PDU-MAPPING'),
+    DataQuery.XPath('./SHORT-NAME'),
+    DataQuery.XPath('.//SHORT-NAME'),
+    DataQuery.XPath('./*/I-PDU-TIMING'),
+    DataQuery.XPath('I-SIGNAL-REF', is_reference=True),
+    DataQuery.Reference('/Cluster/CAN'),
+    DataQuery.BackReference('I-SIGNAL-TO-I-PDU-MAPPING'),
+])
+def test_batch_returns_same_elements_as_single_nodes(parser, path):
+    path_handler = PathHandler(parser)
+    xpath = parser.compile_xpath('.//I-SIGNAL-I-PDU | .//I-SIGNAL | .//I-SIGNAL-TO-I-PDU-MAPPING')
+    nodes = parser.find(parser.root, xpath)
+
+    groups = path_handler.compile_path_batch(path)(nodes)
+
+    assert groups == [path_handler.elements_by_path(path, node) for node in nodes]
+
+
+@pytest.mark.parametrize('path, name', [
+    ('SHORT-NAME', 'SHORT-NAME'),
+    ('./SHORT-NAME', 'SHORT-NAME'),
+    ('LONG-NAME/L-4', None),
+    ('.//SHORT-NAME', None),
+    ('SHORT-NAME[1]', None),
+    ('@UUID', None),
+])
+def test_child_tag(parser, path, name):
+    path_handler = PathHandler(parser)
+
+    tag = path_handler.child_tag(path)
+
+    assert tag == (None if name is None else f'{{{parser.ns["ar"]}}}{name}')
+
+
+@pytest.mark.parametrize('path', ['SHORT-NAME', './ELEMENTS', 'AR-PACKAGES'])
+def test_child_tag_returns_same_elements_as_xpath(parser, path):
+    path_handler = PathHandler(parser)
+    nodes = parser.find_all_elements('AR-PACKAGE') + [parser.root]
+
+    for node in nodes:
+        expected = parser.find(node, parser.compile_xpath(path))
+        assert path_handler.elements_by_xpath(path, node) == expected
+        assert path_handler.element_by_xpath(path, node) is next(iter(expected), None)
+
+
+def test_compile_text_of_child_element(parser):
+    path_handler = PathHandler(parser)
+    nodes = parser.find_all_elements('I-SIGNAL')
+
+    text_by_path = path_handler.compile_text(DataQuery.XPath('SHORT-NAME'))
+
+    assert [text_by_path(node) for node in nodes] == [
+        parser.get_shortname(node) for node in nodes
+    ]
+    assert text_by_path(parser.root) is None
+    assert path_handler.compile_text(DataQuery.XPath('LONG-NAME/L-4')) is None
+    assert path_handler.compile_text(DataQuery.XPath('&(I-SIGNAL-REF)SHORT-NAME', True)) is None
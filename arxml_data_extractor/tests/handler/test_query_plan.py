@@ -0,0 +1,64 @@
+import pytest
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from arxml_data_extractor.handler.query_plan import ObjectStep, ValueStep
+from arxml_data_extractor.query.data_value import DataValue
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+
+arxml = 'arxml_data_extractor/tests/test.arxml'
+
+
+@pytest.fixture(scope='module')
+def parser() -> AsrParser:
+    return AsrParser(arxml)
+
+
+def test_compile_builds_steps_for_all_values(parser):
+    data_object = DataObject('PDU', DataQuery.XPath('.//I-SIGNAL-I-PDU'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataObject('Mappings', DataQuery.XPath('.//I-SIGNAL-TO-I-PDU-MAPPING'), [
+            DataValue('Signal', DataQuery(DataQuery.XPath('&(I-SIGNAL-REF)SHORT-NAME', True)))
+        ])
+    ])
+    object_handler = ObjectHandler(parser, progress=False)
+
+    plan = object_handler.compile(data_object)
+
+    assert isinstance(plan, ObjectStep)
+    assert isinstance(plan.steps[0], ValueStep)
+    assert isinstance(plan.steps[1], ObjectStep)
+    assert plan.steps[1].steps[0].name == 'Signal'
+    assert object_handler.compile(data_object) is plan
+
+
+def test_compiled_plan_returns_values_of_all_elements(parser):
+    data_object = DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataValue('Length', DataQuery(DataQuery.XPath('LENGTH'), format=DataQuery.Format.Integer)),
+        DataValue('Type', DataQuery(DataQuery.XPath('.'), value='tag'))
+    ])
+    object_handler = ObjectHandler(parser, progress=False)
+
+    values = object_handler.handle(data_object)
+
+    assert [value['Name'] for value in values] == ['Signal1', 'Signal2', 'Signal3']
+    assert [value['Length'] for value in values] == [5, 1, 1]
+    assert all(value['Type'].endswith('}I-SIGNAL') for value in values)
+
+
+@pytest.mark.parametrize('data_object', [
+    DataObject('Invalid Anchor', DataQuery.XPath('.//I-SIGNAL['),
+               [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))]),
+    DataObject('Invalid Value', DataQuery.XPath('.//I-SIGNAL'),
+               [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME)')))]),
+    DataObject('Invalid Inline Reference', DataQuery.XPath('.//I-SIGNAL-TO-I-PDU-MAPPING'), [
+        DataValue('Signal', DataQuery(DataQuery.XPath('&(I-SIGNAL-REF[)SHORT-NAME', True)))
+    ]),
+])
+def test_invalid_xpath_is_reported_at_compile_time(parser, data_object):
+    object_handler = ObjectHandler(parser, progress=False)
+
+    with pytest.raises(ValueError):
+        object_handler.compile(data_object)
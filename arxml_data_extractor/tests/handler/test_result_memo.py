@@ -0,0 +1,48 @@
+from lxml import etree
+
+from arxml_data_extractor.handler.result_memo import ResultMemo
+
+
+def test_returns_none_for_unknown_key():
+    memo = ResultMemo()
+
+    assert memo.get('unknown') is None
+    assert memo.misses == 1
+    assert memo.hits == 0
+
+
+def test_returns_memoized_values():
+    memo = ResultMemo()
+    values = {'Name': 'Signal1'}
+
+    memo.put('Signal1', values)
+
+    assert memo.get('Signal1') is values
+    assert memo.hits == 1
+
+
+def test_drops_least_recently_used_values():
+    memo = ResultMemo(maxsize=2)
+
+    memo.put('Signal1', {'Name': 'Signal1'})
+    memo.put('Signal2', {'Name': 'Signal2'})
+    memo.get('Signal1')
+    memo.put('Signal3', {'Name': 'Signal3'})
+
+    assert len(memo) == 2
+    assert memo.get('Signal2') is None
+    assert memo.get('Signal1') == {'Name': 'Signal1'}
+    assert memo.get('Signal3') == {'Name': 'Signal3'}
+
+
+def test_discards_values_of_document():
+    memo = ResultMemo()
+    first = etree.fromstring('<A><B/></A>')
+    second = etree.fromstring('<A><B/></A>')
+
+    memo.put(('plan', first[0]), {'Name': 'first'})
+    memo.put(('plan', second[0]), {'Name': 'second'})
+
+    assert memo.discard_document(first) == 1
+    assert len(memo) == 1
+    assert memo.get(('plan', second[0])) == {'Name': 'second'}
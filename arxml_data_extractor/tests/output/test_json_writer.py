@@ -0,0 +1,87 @@
+import io
+import json
+import arrow
+import pytest
+from datetime import datetime
+
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+from arxml_data_extractor.output.json_writer import JsonWriter
+from arxml_data_extractor.query.schema import ObjectSchema
+
+
+@pytest.fixture
+def data():
+    return {
+        'PDU': [{
+            'Name': 'TxMessage',
+            'Length': 5,
+            'Cyclic Timing': 0.1,
+            'Unused': None,
+            'Extended': False,
+            'Description': 'Übertragung "Motor" \\ Tab\t',
+            'Signal Mapping': [],
+            'Timing': {},
+            'I-Signal': {
+                'Init Value': -128,
+                'Factor': 1e-05
+            }
+        }, {
+            'Name': 'RxMessage',
+            'Length': 2,
+            'Cyclic Timing': float('nan'),
+            'Signal Mapping': [{
+                'Signal': 'Signal2',
+                'Start Position': 0
+            }, {
+                'Signal': 'Signal3',
+                'Start Position': 1
+            }]
+        }],
+        'CAN Cluster': {
+            'Name': 'CAN',
+            'Baudrate': 500000
+        }
+    }
+
+
+def dump(writer: JsonWriter, data: dict) -> str:
+    f = io.StringIO()
+    writer.dump(data, f)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4096])
+def test_indented_output_is_identical_to_json_dump(data, chunk_size):
+    assert dump(JsonWriter(chunk_size=chunk_size), data) == json.dumps(
+        data, ensure_ascii=False, indent=4)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_columnar_results_are_written_like_dicts(data, compact):
+    columnar = {
+        name: ColumnarResult.from_results(ObjectSchema.infer(name, values), values)
+        for name, values in data.items()
+    }
+
+    assert dump(JsonWriter(compact), columnar) == dump(JsonWriter(compact), {
+        name: result.to_results() for name, result in columnar.items()
+    })
+
+
+def test_compact_output_has_no_whitespace(data):
+    assert dump(JsonWriter(compact=True, chunk_size=1), data) == json.dumps(
+        data, ensure_ascii=False, separators=(',', ':'))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_writes_dates_as_iso_format(compact):
+    data = {'Dates': [arrow.get('2020-05-17T10:30:00+02:00'), datetime(2020, 5, 17, 10, 30)]}
+
+    text = dump(JsonWriter(compact), data)
+
+    assert json.loads(text) == {'Dates': ['2020-05-17T10:30:00+02:00', '2020-05-17T10:30:00']}
+
+
+def test_raises_type_error_on_unknown_type():
+    with pytest.raises(TypeError):
+        dump(JsonWriter(), {'Object': object()})
@@ -0,0 +1,118 @@
+import sqlite3
+import arrow
+import pytest
+from pathlib import Path
+
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+from arxml_data_extractor.output.sqlite_writer import SqliteWriter
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.schema import ObjectSchema, ValueSchema
+
+
+@pytest.fixture
+def schema():
+    return ObjectSchema('PDU', [
+        ValueSchema('Name'),
+        ValueSchema('Length', DataQuery.Format.Integer),
+        ValueSchema('Timing', DataQuery.Format.Float),
+        ObjectSchema('Signals', [
+            ValueSchema('Signal'),
+            ValueSchema('Date', DataQuery.Format.Date),
+        ])
+    ])
+
+
+@pytest.fixture
+def data():
+    return {
+        'PDU': [{
+            'Name': 'TxMessage',
+            'Length': 8,
+            'Timing': 0.1,
+            'Signals': []
+        }, {
+            'Name': 'RxMessage',
+            'Length': 2,
+            'Timing': 0.2,
+            'Signals': [{
+                'Signal': 'Signal1',
+                'Date': arrow.get('2020-01-01')
+            }, {
+                'Signal': 'Signal2',
+                'Date': None
+            }]
+        }]
+    }
+
+
+@pytest.fixture
+def database():
+    file = Path('result.sqlite')
+    yield file
+    if file.exists():
+        file.unlink()
+
+
+def query(file, sql):
+    connection = sqlite3.connect(str(file))
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+def test_creates_typed_table_per_data_object(database, schema, data):
+    SqliteWriter().write(str(database), data, {'PDU': schema})
+
+    assert query(database, 'SELECT name FROM sqlite_master WHERE type = "table" ORDER BY name') == [
+        ('PDU',), ('PDU.Signals',)
+    ]
+    columns = query(database, 'PRAGMA table_info("PDU")')
+    assert [(column[1], column[2]) for column in columns] == [('_id', 'INTEGER'), ('Name', 'TEXT'),
+                                                              ('Length', 'INTEGER'),
+                                                              ('Timing', 'REAL')]
+
+
+def test_nested_rows_refer_to_their_parent(database, schema, data):
+    SqliteWriter().write(str(database), data, {'PDU': schema})
+
+    assert query(database, 'SELECT * FROM "PDU"') == [(1, 'TxMessage', 8, 0.1),
+                                                      (2, 'RxMessage', 2, 0.2)]
+    assert query(
+        database, 'SELECT p.Name, s.Signal, s.Date FROM "PDU" AS p '
+        'JOIN "PDU.Signals" AS s ON s._parent_id = p._id') == [
+            ('RxMessage', 'Signal1', '2020-01-01T00:00:00+00:00'), ('RxMessage', 'Signal2', None)
+        ]
+
+
+def test_inserts_rows_in_batches(database, schema, data):
+    data['PDU'] = data['PDU'] * 5
+
+    SqliteWriter(batch_size=3).write(str(database), data, {'PDU': schema})
+
+    assert query(database, 'SELECT COUNT(*) FROM "PDU"') == [(10,)]
+    assert query(database, 'SELECT COUNT(*) FROM "PDU.Signals"') == [(10,)]
+
+
+def test_replaces_existing_database(database, data):
+    writer = SqliteWriter()
+
+    writer.write(str(database), data)
+    writer.write(str(database), data)
+
+    assert query(database, 'SELECT COUNT(*) FROM "PDU"') == [(2,)]
+
+
+def test_columnar_results_are_inserted_by_column(database, schema, data):
+    dict_file = Path('dict_result.sqlite')
+    columnar = {'PDU': ColumnarResult.from_results(schema, data['PDU'])}
+
+    SqliteWriter().write(str(database), columnar)
+    SqliteWriter().write(str(dict_file), data, {'PDU': schema})
+
+    try:
+        for table in ('PDU', 'PDU.Signals'):
+            assert query(database, f'SELECT * FROM "{table}"') == query(
+                dict_file, f'SELECT * FROM "{table}"')
+    finally:
+        dict_file.unlink()
@@ -1,4 +1,7 @@
-from arxml_data_extractor.output.tabularize import tabularize
+import pytest
+
+from arxml_data_extractor.output.tabularize import tabularize, table, iter_rows, estimate_rows
+from arxml_data_extractor.query.schema import ObjectSchema, ValueSchema
 
 
 def test_flatten_dict():
@@ -105,3 +108,62 @@ def test_dict_containing_lists_different_dimensions():
                       ['Message', 16, 'Signal2', 8, 'SignalGroup1'],
                       ['Message', 16, 'Signal2', 8, 'SignalGroup2'],
                       ['Message', 16, 'Signal2', 8, 'SignalGroup3']]
+
+
+@pytest.fixture
+def cross_product():
+    return [{
+        'Name': 'Message',
+        'Signal': [{
+            'Name': f'Signal{i}'
+        } for i in range(100)],
+        'SignalGroup': [{
+            'Name': f'SignalGroup{i}'
+        } for i in range(101)],
+        'Timing': [{
+            'Name': f'Timing{i}'
+        } for i in range(99)]
+    }]
+
+
+def test_estimate_rows_without_building_them(cross_product):
+    assert estimate_rows(cross_product) == 100 * 101 * 99
+
+
+def test_iter_rows_builds_rows_on_demand(cross_product):
+    rows = iter_rows(cross_product)
+
+    assert next(rows) == ['Message', 'Signal0', 'SignalGroup0', 'Timing0']
+    assert next(rows) == ['Message', 'Signal0', 'SignalGroup0', 'Timing1']
+
+
+def test_raises_value_error_if_rows_exceed_maximum(cross_product):
+    with pytest.raises(ValueError):
+        tabularize(cross_product, max_rows=1000)
+
+
+def test_table_counts_rows_and_builds_them_lazily(cross_product):
+    count, rows = table(cross_product)
+
+    assert count == 100 * 101 * 99
+    assert next(rows) == ['Message', 'Signal0', 'SignalGroup0', 'Timing0']
+
+
+def test_empty_list_is_a_row_without_values():
+    input = {'Name': 'Message', 'Signal': [], 'Length': 8}
+
+    result = tabularize([input])
+
+    assert result == [['Message', 8]]
+
+
+def test_schema_fills_columns_of_empty_nested_objects():
+    schema = ObjectSchema('PDU', [
+        ValueSchema('Name'),
+        ObjectSchema('Signals', [ValueSchema('Signal'), ValueSchema('Position')]),
+        ValueSchema('Length')
+    ])
+    data = [{'Name': 'a', 'Signals': [], 'Length': 8},
+            {'Name': 'b', 'Signals': [{'Signal': 's', 'Position': 0}], 'Length': 4}]
+
+    assert tabularize(data, schema=schema) == [['a', None, None, 8], ['b', 's', 0, 4]]
@@ -0,0 +1,53 @@
+import arrow
+import pytest
+
+from arxml_data_extractor.query.data_query import DataQuery
+from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.query.data_value import DataValue
+from arxml_data_extractor.query.schema import ObjectSchema, ValueSchema, build_schemas
+
+
+@pytest.fixture
+def data_object():
+    name = DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))
+    length = DataValue('Length', DataQuery(DataQuery.XPath('LENGTH'), format=DataQuery.Format.Integer))
+    position = DataValue('Position',
+                         DataQuery(DataQuery.XPath('START-POSITION'), format=DataQuery.Format.Integer))
+    signals = DataObject('Signals', DataQuery.XPath('.//I-SIGNAL-TO-I-PDU-MAPPING'), [name, position])
+    return DataObject('PDU', DataQuery.XPath('.//I-SIGNAL-I-PDU'), [name, length, signals])
+
+
+def test_schema_from_data_object(data_object):
+    schema = ObjectSchema.from_data_object(data_object)
+
+    assert schema.name == 'PDU'
+    assert [value.name for value in schema.values] == ['Name', 'Length', 'Signals']
+    assert isinstance(schema.values[2], ObjectSchema)
+    assert schema.depth() == 1
+
+
+def test_columns_of_nested_objects(data_object):
+    columns = ObjectSchema.from_data_object(data_object).columns()
+
+    assert [column.name for column in columns] == ['Name', 'Length', 'Name', 'Position']
+    assert [column.type for column in columns] == [str, int, str, int]
+
+
+def test_build_schemas_by_name(data_object):
+    schemas = build_schemas([data_object])
+
+    assert list(schemas.keys()) == ['PDU']
+    assert schemas['PDU'] == ObjectSchema.from_data_object(data_object)
+
+
+def test_infer_schema_from_results():
+    data = [{'Name': 'Pdu', 'Length': 8, 'Date': arrow.get('2020-01-01'), 'Signals': []}]
+
+    schema = ObjectSchema.infer('PDU', data)
+
+    assert schema.values == [
+        ValueSchema('Name', DataQuery.Format.String),
+        ValueSchema('Length', DataQuery.Format.Integer),
+        ValueSchema('Date', DataQuery.Format.Date),
+        ObjectSchema('Signals', [])
+    ]
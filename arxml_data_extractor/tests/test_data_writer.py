@@ -1,7 +1,11 @@
+import json
+import re
+import zipfile
 import pytest
 from pathlib import Path
 
 from arxml_data_extractor.data_writer import DataWriter
+from arxml_data_extractor.query.schema import ObjectSchema
 
 
 @pytest.fixture
@@ -55,6 +59,23 @@ def test_write_text_file_as_table(data):
     file.unlink()
 
 
+def test_write_text_with_schemas_of_the_queries(data):
+    file = Path('result.txt')
+    writer = DataWriter()
+    schema = ObjectSchema.infer('PDU', data['PDU'])
+    # the header doesn't depend on the first PDU having signals
+    data['PDU'][0]['Signal Mapping'] = []
+
+    writer.write_text(str(file), data, schemas={'PDU': schema})
+
+    lines = file.read_text().splitlines()
+    file.unlink()
+    assert [name.strip() for name in lines[0].split('|')[1:-1]] == [
+        'Name', 'Length', 'Cyclic Timing', 'Signal', 'Start Position', 'Init Value', 'Length'
+    ]
+    assert len(lines) == 5
+
+
 def test_write_to_json(data):
     file = Path('result.json')
     writer = DataWriter()
@@ -65,6 +86,19 @@ def test_write_to_json(data):
     file.unlink()
 
 
+def test_write_records_to_ndjson(data):
+    file = Path('result.ndjson')
+    writer = DataWriter()
+    records = (('PDU', pdu) for pdu in data['PDU'])
+
+    count = writer.write_ndjson(str(file), records)
+
+    lines = file.read_text(encoding='utf-8').splitlines()
+    assert count == 2
+    assert [json.loads(line) for line in lines] == [{'PDU': pdu} for pdu in data['PDU']]
+    file.unlink()
+
+
 def test_write_to_excel(data):
     file = Path('result.xlsx')
     writer = DataWriter()
@@ -73,3 +107,42 @@ def test_write_to_excel(data):
 
     assert file.exists()
     file.unlink()
+
+
+def test_write_to_excel_with_constant_memory(data):
+    file = Path('result.xlsx')
+    writer = DataWriter()
+
+    writer.write_excel(str(file), data, constant_memory=True)
+
+    with zipfile.ZipFile(file) as xlsx:
+        sheet = xlsx.read('xl/worksheets/sheet1.xml').decode()
+    # rows are written in order with inline strings instead of a shared string table
+    rows = [int(row) for row in re.findall(r'<row r="(\d+)"', sheet)]
+    assert rows == list(range(1, 3 + 3 + 1))
+    assert '<mergeCell ref="D1:G1"/>' in sheet
+    assert 'RxMessage' in sheet
+    file.unlink()
+
+
+@pytest.mark.parametrize('suffix', ['.xlsx', '.txt'])
+def test_write_table_raises_value_error_if_rows_exceed_maximum(data, suffix):
+    file = Path('result' + suffix)
+    writer = DataWriter()
+    write = writer.write_excel if suffix == '.xlsx' else writer.write_text
+
+    with pytest.raises(ValueError):
+        write(str(file), data, max_rows=2)
+
+    if file.exists():
+        file.unlink()
+
+
+def test_write_to_sqlite(data):
+    file = Path('result.sqlite')
+    writer = DataWriter()
+
+    writer.write_sqlite(str(file), data)
+
+    assert file.exists()
+    file.unlink()
@@ -266,6 +266,25 @@ def test_object_contains_xref():
     assert referred_object.path.is_reference is True
 
 
+def test_object_contains_backref():
+    config = {
+        'Signal': {
+            '_ref': '/ISignal/Signal1',
+            'PDU': {
+                '_backref': 'I-SIGNAL-I-PDU',
+                'Name': 'SHORT-NAME'
+            }
+        }
+    }
+
+    builder = QueryBuilder()
+    data_objects = builder.build(config)
+    pdu_object = data_objects[0].values[0]
+
+    assert isinstance(pdu_object, DataObject)
+    assert pdu_object.path == DataQuery.BackReference('I-SIGNAL-I-PDU')
+
+
 def test_inline_reference():
     config = {'SimpleObject': {'_ref': '/path/element', 'RefValue': '&(path-to-element)value'}}
 
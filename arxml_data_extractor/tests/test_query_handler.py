@@ -1,8 +1,16 @@
+import logging
 import pytest
+import shutil
+from copy import deepcopy
+from lxml import etree
+from pathlib import Path
 
 from arxml_data_extractor.query.data_value import DataValue
 from arxml_data_extractor.query.data_query import DataQuery
 from arxml_data_extractor.query.data_object import DataObject
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.asr_stream_parser import AsrStreamParser
+from arxml_data_extractor.asr.file_catalog import FileCatalog
 from arxml_data_extractor.query_handler import QueryHandler
 
 arxml = 'arxml_data_extractor/tests/test.arxml'
@@ -219,6 +227,158 @@ def test_find_all_objects_by_xpath(multi_value_complex_object):
     assert pdus[1]['Signal Mappings'][1]['Signal']['Length'] == 1
 
 
+@pytest.fixture
+def indexed_arxml(tmp_path) -> str:
+    file = tmp_path / 'test.arxml'
+    shutil.copy(arxml, file)
+    return str(file)
+
+
+@pytest.mark.parametrize('data_object', [
+    'simple_object_by_ref', 'complex_object_by_ref', 'simple_object_by_xpath',
+    'complex_object_by_xpath', 'multi_value_complex_object'
+])
+@pytest.mark.parametrize('options, mode', [
+    ({}, {'streaming': True}),
+    ({}, {'batched': True}),
+    ({'use_index': True}, {}),
+    ({'use_index': True}, {'batched': True}),
+    ({'prune': True}, {}),
+], ids=['streaming', 'batched', 'index', 'index-batched', 'prune'])
+def test_modes_return_same_results(data_object, options, mode, indexed_arxml, request):
+    data_objects = [request.getfixturevalue(data_object)]
+
+    expected = QueryHandler().handle_queries(arxml, data_objects)
+    data_results = QueryHandler(**options).handle_queries(indexed_arxml, data_objects, **mode)
+
+    assert data_results == expected
+
+
+def test_streaming_raises_value_error_on_unsupported_anchor():
+    data_object = DataObject('Signal', DataQuery.XPath('.//I-SIGNAL-REF', is_reference=True),
+                             [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+
+    query_handler = QueryHandler()
+
+    with pytest.raises(ValueError):
+        query_handler.handle_queries(arxml, [data_object], streaming=True)
+
+
+def test_streaming_raises_value_error_on_back_reference():
+    data_object = DataObject('Signal', DataQuery.XPath('.//I-SIGNAL'), [
+        DataObject('PDU', DataQuery.BackReference('I-SIGNAL-I-PDU'),
+                   [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+    ])
+
+    query_handler = QueryHandler()
+
+    with pytest.raises(ValueError):
+        query_handler.handle_queries(arxml, [data_object], streaming=True)
+
+
+def test_streaming_releases_handled_elements(multi_value_complex_object, monkeypatch):
+    streamed = []
+    iterate = AsrStreamParser.iterate
+
+    def iterate_and_record(parser, anchors):
+        for i, element in iterate(parser, anchors):
+            streamed.append((parser, element))
+            yield i, element
+
+    monkeypatch.setattr(AsrStreamParser, 'iterate', iterate_and_record)
+
+    QueryHandler().handle_queries(arxml, [multi_value_complex_object], streaming=True)
+
+    parser = streamed[0][0]
+    assert len(streamed) == 2
+    assert len(parser.root) == 0
+    assert all(len(pdu) == 0 and pdu.getparent() is None for _, pdu in streamed)
+    # referenced elements are kept for random access
+    assert parser.find_reference('/ISignal/Signal1').findtext('{*}LENGTH') == '5'
+
+
+def test_streaming_defers_elements_with_forward_references(caplog):
+    # the signal referred by every PDU is streamed after the PDUs
+    pdus = DataObject('PDUs', DataQuery.XPath('.//I-SIGNAL-I-PDU'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataObject('First Signal', DataQuery.Reference('/ISignal/Signal1'), [
+            DataValue('Length', DataQuery(DataQuery.XPath('LENGTH'),
+                                          format=DataQuery.Format.Integer))
+        ])
+    ])
+    signals = DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'),
+                         [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+    caplog.set_level(logging.INFO)
+
+    expected = QueryHandler().handle_queries(arxml, [pdus, signals])
+    records = list(QueryHandler().iter_records(arxml, [pdus, signals], streaming=True))
+
+    assert records == [('Signals', values) for values in expected['Signals']] + [
+        ('PDUs', values) for values in expected['PDUs']
+    ]
+    assert expected['PDUs'][1]['First Signal'] == {'Length': 5}
+    assert len([r for r in caplog.records if 'StreamHandler - deferring' in r.message]) == 2
+
+
+def test_parallel_returns_same_results(simple_object_by_ref, multi_value_complex_object):
+    data_objects = [multi_value_complex_object, simple_object_by_ref]
+    query_handler = QueryHandler()
+
+    expected = query_handler.handle_queries(arxml, data_objects)
+    data_results = query_handler.handle_queries(arxml, data_objects, jobs=2)
+
+    assert list(data_results.keys()) == list(expected.keys())
+    assert data_results == expected
+
+
+def test_parallel_chunks_single_object(multi_value_complex_object):
+    query_handler = QueryHandler()
+
+    expected = query_handler.handle_queries(arxml, [multi_value_complex_object])
+    data_results = query_handler.handle_queries(arxml, [multi_value_complex_object], jobs=2)
+
+    assert data_results == expected
+
+
+@pytest.mark.parametrize('streaming, batched', [(False, False), (False, True), (True, False)])
+def test_iter_records_yields_every_element(simple_object_by_ref, multi_value_complex_object,
+                                           streaming, batched):
+    data_objects = [multi_value_complex_object, simple_object_by_ref]
+    query_handler = QueryHandler()
+
+    expected = query_handler.handle_queries(arxml, data_objects)
+    records = list(
+        query_handler.iter_records(arxml, data_objects, streaming, batched, chunk_size=1))
+
+    # streaming yields the records of all root objects in document order
+    assert [values for name, values in records if name == 'PDUs'] == expected['PDUs']
+    assert [values for name, values in records if name == 'CAN Cluster'] == [
+        expected['CAN Cluster']
+    ]
+    assert len(records) == 3
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_columnar_results_hold_same_values(simple_object_by_ref, multi_value_complex_object,
+                                          streaming):
+    data_objects = [multi_value_complex_object, simple_object_by_ref]
+    query_handler = QueryHandler()
+
+    expected = query_handler.handle_queries(arxml, data_objects)
+    results = query_handler.handle_columnar(arxml, data_objects, streaming)
+
+    assert list(results.keys()) == ['PDUs', 'CAN Cluster']
+    assert {name: result.to_results() for name, result in results.items()} == expected
+
+
+def test_iter_records_validates_input_immediately(simple_object_by_ref):
+    query_handler = QueryHandler()
+
+    with pytest.raises(ValueError):
+        query_handler.iter_records('arxml_data_extractor/tests/test_config.yaml',
+                                   [simple_object_by_ref])
+
+
 def test_handle_inline_reference():
     data_object = DataObject('SignalMapping', DataQuery.Reference('/PDU/TxMessage'), [
         DataValue(
@@ -237,6 +397,39 @@ def test_handle_inline_reference():
     assert results['SignalMapping']['Name'] == 'Signal1'
 
 
+def test_handle_back_reference():
+    data_object = DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataObject('PDU', DataQuery.BackReference('I-SIGNAL-I-PDU'), [
+            DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+            DataValue('Length', DataQuery(DataQuery.XPath('LENGTH'), format=DataQuery.Format.Integer))
+        ]),
+        DataObject('Mapping', DataQuery.BackReference('I-SIGNAL-TO-I-PDU-MAPPING'),
+                   [DataValue('Start Position', DataQuery(DataQuery.XPath('START-POSITION')))])
+    ])
+
+    query_handler = QueryHandler()
+    results = query_handler.handle_queries(arxml, [data_object])
+
+    signals = results['Signals']
+    assert signals[0]['PDU'] == {'Name': 'TxMessage', 'Length': 5}
+    assert signals[1]['PDU'] == {'Name': 'RxMessage', 'Length': 2}
+    assert signals[2]['PDU'] == {'Name': 'RxMessage', 'Length': 2}
+    assert signals[2]['Mapping'] == {'Start Position': '1'}
+
+
+def test_back_reference_on_not_referable_element_returns_empty_list():
+    data_object = DataObject('Timing', DataQuery.XPath('.//I-PDU-TIMING'), [
+        DataObject('PDU', DataQuery.BackReference('I-SIGNAL-I-PDU'),
+                   [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+    ])
+
+    query_handler = QueryHandler()
+    results = query_handler.handle_queries(arxml, [data_object])
+
+    assert results['Timing'][0]['PDU'] == []
+
+
 def test_invalid_file_raises_value_error():
     with pytest.raises(ValueError):
         query_handler = QueryHandler()
@@ -281,3 +474,208 @@ def test_returns_none_value_if_no_attribute_found_with_specified_name():
 
     assert isinstance(result['CAN Cluster'], dict)
     assert result['CAN Cluster']['UUID'] is None
+
+
+def test_handle_multiple_input_files(simple_object_by_ref, tmp_path):
+    other = tmp_path / 'other.arxml'
+    other.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES><AR-PACKAGE>'
+        '<SHORT-NAME>Other</SHORT-NAME><ELEMENTS><I-SIGNAL><SHORT-NAME>Speed</SHORT-NAME></I-SIGNAL>'
+        '</ELEMENTS></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    signal = DataObject('Signal', DataQuery.Reference('/Other/Speed'),
+                        [DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME')))])
+    query_handler = QueryHandler()
+
+    expected = query_handler.handle_queries(arxml, [simple_object_by_ref])
+    results = query_handler.handle_queries([arxml, str(other)], [simple_object_by_ref, signal])
+
+    assert results['CAN Cluster'] == expected['CAN Cluster']
+    assert results['Signal'] == {'Name': 'Speed'}
+
+
+def test_streaming_multiple_input_files_raises_value_error(simple_object_by_ref):
+    query_handler = QueryHandler()
+
+    with pytest.raises(ValueError):
+        query_handler.handle_queries([arxml, arxml], [simple_object_by_ref], streaming=True)
+
+
+def test_handle_references_by_catalog(tmp_path):
+    catalog = tmp_path / 'catalog'
+    catalog.mkdir()
+    (catalog / 'signals.arxml').write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES><AR-PACKAGE>'
+        '<SHORT-NAME>Other</SHORT-NAME><ELEMENTS><I-SIGNAL><SHORT-NAME>Speed</SHORT-NAME>'
+        '<LENGTH>16</LENGTH></I-SIGNAL></ELEMENTS></AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    signal = DataObject('Signal', DataQuery.Reference('/Other/Speed'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataValue('Length', DataQuery(DataQuery.XPath('LENGTH'), format=DataQuery.Format.Integer))
+    ])
+    query_handler = QueryHandler(catalog=FileCatalog(str(catalog)))
+
+    results = query_handler.handle_queries(arxml, [signal])
+
+    assert results['Signal'] == {'Name': 'Speed', 'Length': 16}
+    assert query_handler.catalog.loads == 1
+
+
+@pytest.mark.parametrize('batched', [False, True])
+def test_nested_anchors_on_elements_of_catalog(batched, tmp_path):
+    # the ISignal package is moved from the input file into the catalog
+    tree = etree.parse(arxml)
+    packages = tree.getroot()[0]
+    signals = etree.ElementTree(deepcopy(tree.getroot()))
+    for package in list(packages)[2:]:
+        packages.remove(package)
+    for package in list(signals.getroot()[0])[:2]:
+        signals.getroot()[0].remove(package)
+    main = tmp_path / 'main.arxml'
+    tree.write(str(main))
+    catalog = tmp_path / 'catalog'
+    catalog.mkdir()
+    signals.write(str(catalog / 'signals.arxml'))
+
+    data_object = DataObject('PDUs', DataQuery.XPath('.//I-SIGNAL-I-PDU'), [
+        DataObject('Signal Mappings', DataQuery.XPath('.//I-SIGNAL-TO-I-PDU-MAPPING'), [
+            DataObject('Signal', DataQuery.XPath('I-SIGNAL-REF', is_reference=True), [
+                DataObject('Init', DataQuery.XPath('INIT-VALUE/NUMERICAL-VALUE-SPECIFICATION'), [
+                    DataValue('Value',
+                              DataQuery(DataQuery.XPath('VALUE'), format=DataQuery.Format.Integer))
+                ])
+            ])
+        ])
+    ])
+
+    expected = QueryHandler().handle_queries(arxml, [data_object], batched=batched)
+    results = QueryHandler(catalog=FileCatalog(str(catalog))).handle_queries(
+        str(main), [data_object], batched=batched)
+
+    assert results == expected
+    assert results['PDUs'][1]['Signal Mappings'][0]['Signal']['Init'] == {'Value': 0}
+
+
+def test_batched_groups_elements_of_input_and_catalog(tmp_path, monkeypatch):
+    # Signal3 is moved into the catalog, so the signals of the batch are only partly
+    # covered by the tag index of the input file
+    tree = etree.parse(arxml)
+    elements = tree.getroot()[0][2][1]
+    elements.remove(elements[2])
+    main = tmp_path / 'main.arxml'
+    tree.write(str(main))
+    catalog = tmp_path / 'catalog'
+    catalog.mkdir()
+    (catalog / 'signals.arxml').write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES><AR-PACKAGE>'
+        '<SHORT-NAME>ISignal</SHORT-NAME><ELEMENTS><I-SIGNAL><SHORT-NAME>Signal3</SHORT-NAME>'
+        '<INIT-VALUE><NUMERICAL-VALUE-SPECIFICATION><VALUE>7</VALUE>'
+        '</NUMERICAL-VALUE-SPECIFICATION></INIT-VALUE></I-SIGNAL></ELEMENTS></AR-PACKAGE>'
+        '</AR-PACKAGES></AUTOSAR>')
+    tags = []
+    elements_by_tag = AsrParser.elements_by_tag
+    monkeypatch.setattr(AsrParser, 'elements_by_tag',
+                        lambda parser, tag: tags.append(tag) or elements_by_tag(parser, tag))
+
+    data_object = DataObject('PDUs', DataQuery.XPath('.//I-SIGNAL-I-PDU'), [
+        DataObject('Signal Mappings', DataQuery.XPath('.//I-SIGNAL-TO-I-PDU-MAPPING'), [
+            DataObject('Signal', DataQuery.XPath('I-SIGNAL-REF', is_reference=True), [
+                DataObject('Init', DataQuery.XPath('INIT-VALUE/NUMERICAL-VALUE-SPECIFICATION'), [
+                    DataValue('Value',
+                              DataQuery(DataQuery.XPath('VALUE'), format=DataQuery.Format.Integer))
+                ])
+            ])
+        ])
+    ])
+    results = QueryHandler(catalog=FileCatalog(str(catalog))).handle_queries(
+        str(main), [data_object], batched=True)
+
+    pdus = results['PDUs']
+    assert pdus[0]['Signal Mappings']['Signal'] == {'Init': {'Value': 128}}
+    inits = [mapping['Signal']['Init'] for mapping in pdus[1]['Signal Mappings']]
+    assert inits == [{'Value': 0}, {'Value': 7}]
+    assert 'NUMERICAL-VALUE-SPECIFICATION' in tags
+
+
+def test_iter_records_with_element_index(simple_object_by_ref, multi_value_complex_object,
+                                         indexed_arxml):
+    data_objects = [multi_value_complex_object, simple_object_by_ref]
+
+    expected = QueryHandler().handle_queries(arxml, data_objects)
+    records = list(QueryHandler(use_index=True).iter_records(indexed_arxml, data_objects))
+
+    assert [values for name, values in records if name == 'PDUs'] == expected['PDUs']
+    assert [values for name, values in records if name == 'CAN Cluster'] == [expected['CAN Cluster']]
+
+
+def test_element_index_of_changed_file_is_rebuilt(indexed_arxml, caplog):
+    signals = DataObject('Signals', DataQuery.XPath('.//I-SIGNAL'), [
+        DataValue('Name', DataQuery(DataQuery.XPath('SHORT-NAME'))),
+        DataValue('Init Value',
+                  DataQuery(DataQuery.XPath('.//VALUE'), format=DataQuery.Format.Integer))
+    ])
+    caplog.set_level(logging.INFO)
+    QueryHandler(use_index=True).handle_queries(indexed_arxml, [signals])
+
+    # the value grows, so the byte ranges of all following elements move
+    file = Path(indexed_arxml)
+    file.write_bytes(file.read_bytes().replace(b'<VALUE>128</VALUE>', b'<VALUE>1024</VALUE>'))
+    caplog.clear()
+    results = QueryHandler(use_index=True).handle_queries(indexed_arxml, [signals])
+
+    assert [signal['Name'] for signal in results['Signals']] == ['Signal1', 'Signal2', 'Signal3']
+    assert [signal['Init Value'] for signal in results['Signals']] == [1024, 0, 0]
+    assert any(r.message.endswith('is outdated') for r in caplog.records)
+
+
+def test_element_index_raises_value_error_on_not_referable_anchor(indexed_arxml):
+    data_object = DataObject('Lengths', DataQuery.XPath('.//LENGTH'),
+                             [DataValue('Length', DataQuery(DataQuery.XPath('.')))])
+
+    with pytest.raises(ValueError):
+        QueryHandler(use_index=True).handle_queries(indexed_arxml, [data_object])
+
+
+def test_element_index_with_streaming_raises_value_error(simple_object_by_ref, indexed_arxml):
+    with pytest.raises(ValueError):
+        QueryHandler(use_index=True).handle_queries(
+            indexed_arxml, [simple_object_by_ref], streaming=True)
+
+
+def test_pruning_drops_packages_not_reached(simple_object_by_ref):
+    query_handler = QueryHandler(prune=True)
+
+    expected = QueryHandler().handle_queries(arxml, [simple_object_by_ref])
+    records = list(query_handler.iter_records(arxml, [simple_object_by_ref]))
+
+    assert records == [('CAN Cluster', expected['CAN Cluster'])]
+    assert query_handler.prune_report.packages == ['PDU', 'ISignal']
+
+
+def test_pruning_reports_dropped_subtrees(simple_object_by_ref, tmp_path):
+    # the cluster gets a description, which isn't reached by the query
+    tree = etree.parse(arxml)
+    cluster = tree.getroot()[0][0][1][0]
+    desc = etree.SubElement(cluster, f'{{{cluster.nsmap[None]}}}DESC')
+    etree.SubElement(desc, f'{{{cluster.nsmap[None]}}}L-2').text = 'Powertrain'
+    file = tmp_path / 'test.arxml'
+    tree.write(str(file))
+    count = etree.XPath('count(descendant-or-self::*)')
+    packages = {package.findtext('{*}SHORT-NAME'): int(count(package)) for package in tree.getroot()[0]}
+    described = int(count(desc))
+
+    query_handler = QueryHandler(prune=True)
+    results = query_handler.handle_queries(str(file), [simple_object_by_ref])
+    report = query_handler.prune_report
+
+    assert results == QueryHandler().handle_queries(arxml, [simple_object_by_ref])
+    assert report.packages == ['PDU', 'ISignal']
+    assert report.pruned == packages['PDU'] + packages['ISignal'] + described
+    # AUTOSAR and AR-PACKAGES are kept with the cluster package
+    assert report.elements == 2 + packages['Cluster'] - described
+
+
+def test_pruning_with_streaming_raises_value_error(simple_object_by_ref):
+    with pytest.raises(ValueError):
+        QueryHandler(prune=True).handle_queries(arxml, [simple_object_by_ref], streaming=True)
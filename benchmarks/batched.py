@@ -0,0 +1,43 @@
+"""Compares the element by element handling of the PDU configuration of the README,
+with and without the memo of nested objects, with the batched handling of nested
+objects and '_xref' anchors.
+
+    python -m benchmarks.batched --pdus 2000 --shared-signals 500
+"""
+import argparse
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.object_handler import ObjectHandler
+from benchmarks.common import PDU_CONFIG, build_queries, generated_arxml, measure
+
+
+def handle(parser: AsrParser, queries: list, batched: bool, memo_size: int = 4096) -> list:
+    object_handler = ObjectHandler(parser, progress=False, batched=batched, memo_size=memo_size)
+    object_handler.path_handler.index_anchors(queries)
+    return [object_handler.handle(data_object) for data_object in queries]
+
+
+def run(pdus: int, shared_signals: int):
+    queries = build_queries(PDU_CONFIG)
+    with generated_arxml(pdus=pdus, shared_signals=shared_signals) as arxml:
+        parser = AsrParser(arxml)
+        parser.references
+
+        element_time, expected = measure(handle, parser, queries, False, 0)
+        memo_time, memo_results = measure(handle, parser, queries, False)
+        batched_time, results = measure(handle, parser, queries, True)
+
+        print(f'PDU configuration ({pdus} PDUs, {shared_signals} shared signals)')
+        print(f'  element by element: {element_time:8.3f}s')
+        print(f'  with memo         : {memo_time:8.3f}s')
+        print(f'  batched           : {batched_time:8.3f}s')
+        print(f'  same results      : {results == expected and memo_results == expected}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the batched handling.')
+    parser.add_argument('--pdus', type=int, default=1000)
+    parser.add_argument('--shared-signals', type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.pdus, args.shared_signals)
@@ -0,0 +1,79 @@
+"""Compares parsing all ARXML files of a directory up front with parsing only the
+input file and loading referenced files on demand from a directory catalog. The
+directory holds the file of the PDUs, the file of the signals they refer to and a
+number of unrelated files. The catalog is measured with a cold cache, which scans all
+files, and with the cache of the previous run.
+
+    python -m benchmarks.catalog --pdus 2000 --files 20
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from arxml_data_extractor.asr.file_catalog import FileCatalog
+from arxml_data_extractor.query_handler import QueryHandler
+from benchmarks.common import PDU_CONFIG, build_queries, measure
+from benchmarks.generate_arxml import FOOTER, HEADER, generate
+
+
+def split(file: str, directory: str, files: int):
+    """Splits the generated file into the file of the PDUs, the file of the signals and
+    copies of the signals under other package names"""
+    with open(file, encoding='utf-8') as f:
+        content = f.read()
+    start = content.index('    <AR-PACKAGE>\n      <SHORT-NAME>ISignal</SHORT-NAME>')
+    end = content.index('    <AR-PACKAGE>\n      <SHORT-NAME>Frame</SHORT-NAME>')
+    signals = content[start:end]
+
+    with open(os.path.join(directory, 'pdus.arxml'), 'w', encoding='utf-8') as f:
+        f.write(content[:start] + content[end:])
+    with open(os.path.join(directory, 'signals.arxml'), 'w', encoding='utf-8') as f:
+        f.write(HEADER + signals + FOOTER)
+    for index in range(files):
+        with open(os.path.join(directory, f'unused{index}.arxml'), 'w', encoding='utf-8') as f:
+            f.write(HEADER + signals.replace('>ISignal<', f'>Unused{index}<', 1) + FOOTER)
+
+
+def extract_all(directory: str, queries: list) -> dict:
+    files = sorted(
+        os.path.join(directory, file) for file in os.listdir(directory) if file.endswith('.arxml'))
+    return QueryHandler().handle_queries(files, queries)
+
+
+def extract_on_demand(directory: str, queries: list, cache: str) -> tuple:
+    catalog = FileCatalog(directory, cache=cache)
+    results = QueryHandler(catalog=catalog).handle_queries(
+        os.path.join(directory, 'pdus.arxml'), queries)
+    return catalog, results
+
+
+def run(pdus: int, files: int):
+    directory = tempfile.mkdtemp()
+    try:
+        file = os.path.join(tempfile.mkdtemp(dir=directory), 'generated.arxml')
+        generate(file, pdus=pdus)
+        split(file, directory, files)
+        shutil.rmtree(os.path.dirname(file))
+
+        queries = build_queries(PDU_CONFIG)
+        cache = os.path.join(directory, 'catalog.json')
+        all_time, expected = measure(extract_all, directory, queries)
+        cold_time, (catalog, results) = measure(extract_on_demand, directory, queries, cache)
+        warm_time, (catalog, results) = measure(extract_on_demand, directory, queries, cache)
+        print(f'{files + 2} files, {pdus} PDUs')
+        print(f'  parse all files:      {all_time:6.2f} s')
+        print(f'  catalog, cold cache:  {cold_time:6.2f} s')
+        print(f'  catalog, warm cache:  {warm_time:6.2f} s ({catalog.loads} files loaded, '
+              f'identical: {results == expected})')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the on-demand loading of files.')
+    parser.add_argument('--pdus', type=int, default=2000)
+    parser.add_argument('--files', type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.pdus, args.files)
@@ -0,0 +1,45 @@
+"""Compares the lookup of a value by a single child element name, e.g. 'SHORT-NAME',
+through the compiled XPath with the lookup by lxml's iterchildren.
+
+    python -m benchmarks.child_path --pdus 2000
+"""
+import argparse
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.path_handler import PathHandler
+from arxml_data_extractor.query.data_query import DataQuery
+from benchmarks.common import generated_arxml, measure
+
+
+def lookup_xpath(parser: AsrParser, path: str, nodes: list) -> list:
+    xpath = parser.compile_xpath(path)
+    return [next(iter(xpath(node)), None) for node in nodes]
+
+
+def lookup_text(path_handler: PathHandler, path: str, nodes: list) -> list:
+    text_by_path = path_handler.compile_text(DataQuery.XPath(path))
+    return [text_by_path(node) for node in nodes]
+
+
+def run(pdus: int):
+    with generated_arxml(pdus=pdus) as arxml:
+        parser = AsrParser(arxml)
+        path_handler = PathHandler(parser)
+        nodes = parser.find_all_elements('I-SIGNAL-TO-I-PDU-MAPPING')
+
+        print(f'{len(nodes)} lookups')
+        for path in ('SHORT-NAME', 'START-POSITION'):
+            xpath_time, elements = measure(lookup_xpath, parser, path, nodes, repeat=5)
+            text_time, texts = measure(lookup_text, path_handler, path, nodes, repeat=5)
+            identical = [element.text for element in elements] == texts
+            print(f'  {path:<15} XPath: {xpath_time / len(nodes) * 1e9:6.0f} ns, '
+                  f'iterchildren: {text_time / len(nodes) * 1e9:6.0f} ns per value '
+                  f'(identical: {identical})')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the lookup of child elements.')
+    parser.add_argument('--pdus', type=int, default=2000)
+    args = parser.parse_args()
+
+    run(args.pdus)
@@ -0,0 +1,53 @@
+"""Compares the memory retained by the dict results with the ColumnarResult on a
+generated result set of the shape produced by the PDU configuration of the README.
+
+    python -m benchmarks.columnar --pdus 48000
+"""
+import argparse
+import tracemalloc
+
+from arxml_data_extractor.handler.columnar_result import ColumnarResult
+from arxml_data_extractor.query.schema import build_schemas
+from benchmarks.common import PDU_CONFIG, build_queries, measure
+from benchmarks.json_writer import generate_records
+
+
+def build_dicts(pdus: int):
+    return list(generate_records(pdus))
+
+
+def build_columnar(pdus: int):
+    schema = build_schemas(build_queries(PDU_CONFIG))['PDU']
+    result = ColumnarResult(schema)
+    # the values of an element only exist until they are appended
+    for values in generate_records(pdus):
+        result.append(values)
+    return result
+
+
+def retained(build, pdus: int):
+    tracemalloc.start()
+    try:
+        elapsed, result = measure(build, pdus)
+        return elapsed, tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def run(pdus: int):
+    dict_time, dict_memory, dicts = retained(build_dicts, pdus)
+    columnar_time, columnar_memory, columnar = retained(build_columnar, pdus)
+    identical = columnar.to_results() == dicts
+
+    print(f'{pdus} PDUs, {len(columnar.nested["SignalMappings"])} signal mappings')
+    print(f'  dict results    : {dict_time:8.3f}s, {dict_memory / 1024**2:8.1f} MB')
+    print(f'  columnar results: {columnar_time:8.3f}s, {columnar_memory / 1024**2:8.1f} MB '
+          f'(identical: {identical})')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the columnar results.')
+    parser.add_argument('--pdus', type=int, default=48000)
+    args = parser.parse_args()
+
+    run(args.pdus)
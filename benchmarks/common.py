@@ -0,0 +1,67 @@
+"""Shared helpers for the benchmark scripts."""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from arxml_data_extractor.config_provider import ConfigProvider
+from arxml_data_extractor.query_builder import QueryBuilder
+from benchmarks.generate_arxml import generate
+
+# example configurations of the README
+PDU_CONFIG = """
+PDU:
+  _xpath: ".//I-SIGNAL-I-PDU"
+  Name: "SHORT-NAME"
+  Length: "text>int:LENGTH"
+  CyclicTiming: "text>float:.//TRANSMISSION-MODE-TRUE-TIMING/CYCLIC-TIMING/TIME-PERIOD/VALUE"
+  SignalMappings:
+    _xpath: ".//I-SIGNAL-TO-I-PDU-MAPPING"
+    Signal: "SHORT-NAME"
+    StartPosition: "text>int:START-POSITION"
+    ISignal:
+      _xref: "I-SIGNAL-REF"
+      InitValue: "text>int:.//VALUE"
+      Length: "text>int:LENGTH"
+"""
+
+CAN_CLUSTER_CONFIG = """
+CanCluster:
+  _ref: "/Cluster/CAN"
+  Name: "SHORT-NAME"
+  Baudrate: "text>int:CAN-CLUSTER-VARIANTS/CAN-CLUSTER-CONDITIONAL/BAUDRATE"
+  LongName: "text:LONG-NAME/L-4"
+  Language: "@L:LONG-NAME/L-4"
+"""
+
+README_CONFIGS = {'Get PDU Information': PDU_CONFIG, 'Get CAN Cluster': CAN_CLUSTER_CONFIG}
+
+
+def build_queries(yaml: str) -> list:
+    config = ConfigProvider().parse(yaml)
+    return QueryBuilder().build(config)
+
+
+@contextmanager
+def generated_arxml(**kwargs):
+    """Generates a temporary ARXML file and yields its path"""
+    directory = tempfile.mkdtemp()
+    file = os.path.join(directory, 'generated.arxml')
+    generate(file, **kwargs)
+    try:
+        yield file
+    finally:
+        os.remove(file)
+        os.rmdir(directory)
+
+
+def measure(func, *args, repeat: int = 1, **kwargs):
+    """Returns the best wall clock time in seconds and the result of the last call"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
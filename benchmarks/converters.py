@@ -0,0 +1,50 @@
+"""Compares the conversion of date values by arrow.get with the ISO 8601 parser of the
+converters, with and without the date memo, on generated date strings.
+
+    python -m benchmarks.converters --values 200000 --distinct 1000
+"""
+import argparse
+
+from arxml_data_extractor.handler.converters import Converters
+from arxml_data_extractor.query.data_query import DataQuery
+from benchmarks.common import measure
+
+
+def generate_dates(values: int, distinct: int) -> list:
+    return [
+        f'2020-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:00Z'
+        for i in (j % distinct for j in range(values))
+    ]
+
+
+def convert(converters: Converters, dates: list) -> list:
+    convert_value = converters.compile(DataQuery.Format.Date)
+    return [convert_value(date) for date in dates]
+
+
+def convert_column(converters: Converters, dates: list) -> list:
+    return converters.compile_column(DataQuery.Format.Date)(dates)
+
+
+def run(values: int, distinct: int):
+    dates = generate_dates(values, distinct)
+    arrow_time, expected = measure(convert, Converters(arrow_dates=True, date_memo_size=0), dates)
+    parser_time, parsed = measure(convert, Converters(date_memo_size=0), dates)
+    memo_time, _ = measure(convert, Converters(), dates)
+    column_time, _ = measure(convert_column, Converters(date_memo_size=0), dates)
+    identical = [date.isoformat() for date in expected] == [date.isoformat() for date in parsed]
+
+    print(f'{values} dates, {distinct} distinct')
+    print(f'  arrow.get        : {arrow_time:8.3f}s')
+    print(f'  ISO 8601 parser  : {parser_time:8.3f}s (identical: {identical})')
+    print(f'  with date memo   : {memo_time:8.3f}s')
+    print(f'  column conversion: {column_time:8.3f}s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the date converters.')
+    parser.add_argument('--values', type=int, default=200000)
+    parser.add_argument('--distinct', type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.values, args.distinct)
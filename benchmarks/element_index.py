@@ -0,0 +1,42 @@
+"""Compares the extraction from the whole parsed tree with the extraction of only the
+needed elements located by the element index. The index is measured when it is built
+by the first run and when it is reused by later runs.
+
+    python -m benchmarks.element_index --pdus 2000
+"""
+import argparse
+import os
+
+from arxml_data_extractor.asr.element_index import ElementIndex
+from arxml_data_extractor.query_handler import QueryHandler
+from benchmarks.common import CAN_CLUSTER_CONFIG, PDU_CONFIG, build_queries, generated_arxml, measure
+
+
+def run(pdus: int):
+    with generated_arxml(pdus=pdus) as file:
+        size = os.path.getsize(file) / 2**20
+        print(f'{size:.1f} MB, {pdus} PDUs')
+        try:
+            for name, config in [('CanCluster', CAN_CLUSTER_CONFIG), ('PDU', PDU_CONFIG)]:
+                queries = build_queries(config)
+                full_time, expected = measure(QueryHandler().handle_queries, file, queries)
+                if os.path.exists(ElementIndex.sidecar(file)):
+                    os.remove(ElementIndex.sidecar(file))
+                cold_time, _ = measure(QueryHandler(use_index=True).handle_queries, file, queries)
+                warm_time, results = measure(
+                    QueryHandler(use_index=True).handle_queries, file, queries, repeat=3)
+                print(f'  {name}')
+                print(f'    full parse:           {full_time:6.3f} s')
+                print(f'    index, first run:     {cold_time:6.3f} s')
+                print(f'    index, later runs:    {warm_time:6.3f} s (identical: {results == expected})')
+        finally:
+            if os.path.exists(ElementIndex.sidecar(file)):
+                os.remove(ElementIndex.sidecar(file))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the element index.')
+    parser.add_argument('--pdus', type=int, default=2000)
+    args = parser.parse_args()
+
+    run(args.pdus)
@@ -0,0 +1,47 @@
+"""Compares the memory usage of the Excel writer with and without the constant memory
+mode on a generated result set of the shape produced by the PDU configuration.
+
+    python -m benchmarks.excel_writer --pdus 10000
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from arxml_data_extractor.output.excel_writer import ExcelWriter
+from arxml_data_extractor.output.tabularize import estimate_rows
+from benchmarks.common import measure
+from benchmarks.json_writer import generate_results
+
+
+def write(file: str, data: dict, constant_memory: bool) -> int:
+    tracemalloc.start()
+    try:
+        ExcelWriter(constant_memory=constant_memory).write(file, data)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(pdus: int):
+    data = generate_results(pdus)
+    directory = tempfile.mkdtemp()
+    file = os.path.join(directory, 'results.xlsx')
+    try:
+        print(f'{estimate_rows(data["PDU"])} rows ({pdus} PDUs)')
+        for constant_memory in (False, True):
+            elapsed, peak = measure(write, file, data, constant_memory)
+            print(f'  constant_memory={constant_memory!s:<5}: {elapsed:8.3f}s, '
+                  f'peak {peak / 1024**2:8.1f} MB')
+    finally:
+        if os.path.exists(file):
+            os.remove(file)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the constant memory Excel writer.')
+    parser.add_argument('--pdus', type=int, default=10000)
+    args = parser.parse_args()
+
+    run(args.pdus)
@@ -0,0 +1,147 @@
+"""Generates synthetic ARXML files of arbitrary size for benchmarking.
+
+The generated structure follows the test ARXML: one CAN cluster, a package of
+I-SIGNAL-I-PDUs with signal mappings, a package of I-SIGNALs referenced by these
+mappings and a package of CAN frames referencing the PDUs.
+"""
+import argparse
+
+HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://autosar.org/schema/r4.0 AUTOSAR_4-3-0.xsd">
+  <AR-PACKAGES>
+'''
+
+FOOTER = '''  </AR-PACKAGES>
+</AUTOSAR>
+'''
+
+CLUSTER = '''    <AR-PACKAGE>
+      <SHORT-NAME>Cluster</SHORT-NAME>
+      <ELEMENTS>
+        <CAN-CLUSTER>
+          <SHORT-NAME>CAN</SHORT-NAME>
+          <LONG-NAME><L-4 L="FOR-ALL">CAN Channel 1</L-4></LONG-NAME>
+          <CAN-CLUSTER-VARIANTS>
+            <CAN-CLUSTER-CONDITIONAL>
+              <BAUDRATE>500000</BAUDRATE>
+              <PROTOCOL-NAME>CAN</PROTOCOL-NAME>
+            </CAN-CLUSTER-CONDITIONAL>
+          </CAN-CLUSTER-VARIANTS>
+        </CAN-CLUSTER>
+      </ELEMENTS>
+    </AR-PACKAGE>
+'''
+
+PDU_START = '''        <I-SIGNAL-I-PDU>
+          <SHORT-NAME>Pdu{pdu}</SHORT-NAME>
+          <ADMIN-DATA><SDGS><SDG GID="Generator"><SD GID="Id">{pdu}</SD></SDG></SDGS></ADMIN-DATA>
+          <LENGTH>{length}</LENGTH>
+          <I-PDU-TIMING-SPECIFICATIONS>
+            <I-PDU-TIMING>
+              <MINIMUM-DELAY>0</MINIMUM-DELAY>
+              <TRANSMISSION-MODE-DECLARATION>
+                <TRANSMISSION-MODE-TRUE-TIMING>
+                  <CYCLIC-TIMING>
+                    <TIME-OFFSET><VALUE>0</VALUE></TIME-OFFSET>
+                    <TIME-PERIOD><VALUE>0.1</VALUE></TIME-PERIOD>
+                  </CYCLIC-TIMING>
+                </TRANSMISSION-MODE-TRUE-TIMING>
+              </TRANSMISSION-MODE-DECLARATION>
+            </I-PDU-TIMING>
+          </I-PDU-TIMING-SPECIFICATIONS>
+          <I-SIGNAL-TO-PDU-MAPPINGS>
+'''
+
+MAPPING = '''            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>Pdu{pdu}Signal{signal}</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/ISignal/Signal{signal}</I-SIGNAL-REF>
+              <PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER>
+              <START-POSITION>{position}</START-POSITION>
+              <TRANSFER-PROPERTY>PENDING</TRANSFER-PROPERTY>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+'''
+
+PDU_END = '''          </I-SIGNAL-TO-PDU-MAPPINGS>
+          <UNUSED-BIT-PATTERN>0</UNUSED-BIT-PATTERN>
+        </I-SIGNAL-I-PDU>
+'''
+
+SIGNAL = '''        <I-SIGNAL>
+          <SHORT-NAME>Signal{signal}</SHORT-NAME>
+          <DESC><L-2 L="EN">Generated signal {signal}</L-2></DESC>
+          <DATA-TYPE-POLICY>LEGACY</DATA-TYPE-POLICY>
+          <INIT-VALUE>
+            <NUMERICAL-VALUE-SPECIFICATION><VALUE>{init}</VALUE></NUMERICAL-VALUE-SPECIFICATION>
+          </INIT-VALUE>
+          <LENGTH>8</LENGTH>
+        </I-SIGNAL>
+'''
+
+FRAME = '''        <CAN-FRAME>
+          <SHORT-NAME>Frame{pdu}</SHORT-NAME>
+          <FRAME-LENGTH>8</FRAME-LENGTH>
+          <PDU-TO-FRAME-MAPPINGS>
+            <PDU-TO-FRAME-MAPPING>
+              <SHORT-NAME>Frame{pdu}Pdu{pdu}</SHORT-NAME>
+              <PDU-REF DEST="I-SIGNAL-I-PDU">/PDU/Pdu{pdu}</PDU-REF>
+              <START-POSITION>0</START-POSITION>
+            </PDU-TO-FRAME-MAPPING>
+          </PDU-TO-FRAME-MAPPINGS>
+        </CAN-FRAME>
+'''
+
+
+def package_start(name: str) -> str:
+    return f'    <AR-PACKAGE>\n      <SHORT-NAME>{name}</SHORT-NAME>\n      <ELEMENTS>\n'
+
+
+def package_end() -> str:
+    return '      </ELEMENTS>\n    </AR-PACKAGE>\n'
+
+
+def generate(file: str, pdus: int = 1000, signals_per_pdu: int = 8, shared_signals: int = 0):
+    """Writes a synthetic ARXML file
+
+    Arguments:
+        file {str} -- output file
+        pdus {int} -- number of I-SIGNAL-I-PDUs and CAN-FRAMEs
+        signals_per_pdu {int} -- number of signal mappings per PDU
+        shared_signals {int} -- if > 0, mappings refer to this many signals in round robin,
+                                otherwise every mapping refers to its own signal
+    """
+    signals = shared_signals if shared_signals > 0 else pdus * signals_per_pdu
+    with open(file, 'w', encoding='utf-8') as f:
+        f.write(HEADER)
+        f.write(CLUSTER)
+
+        f.write(package_start('PDU'))
+        for pdu in range(pdus):
+            f.write(PDU_START.format(pdu=pdu, length=signals_per_pdu))
+            for i in range(signals_per_pdu):
+                signal = (pdu * signals_per_pdu + i) % signals
+                f.write(MAPPING.format(pdu=pdu, signal=signal, position=i * 8))
+            f.write(PDU_END)
+        f.write(package_end())
+
+        f.write(package_start('ISignal'))
+        for signal in range(signals):
+            f.write(SIGNAL.format(signal=signal, init=signal % 256))
+        f.write(package_end())
+
+        f.write(package_start('Frame'))
+        for pdu in range(pdus):
+            f.write(FRAME.format(pdu=pdu))
+        f.write(package_end())
+
+        f.write(FOOTER)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generates a synthetic ARXML file.')
+    parser.add_argument('output', help='output .arxml file')
+    parser.add_argument('--pdus', type=int, default=1000)
+    parser.add_argument('--signals-per-pdu', type=int, default=8)
+    parser.add_argument('--shared-signals', type=int, default=0)
+    args = parser.parse_args()
+
+    generate(args.output, args.pdus, args.signals_per_pdu, args.shared_signals)
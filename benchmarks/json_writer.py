@@ -0,0 +1,75 @@
+"""Compares json.dump(indent=4) with the JsonWriter on a generated result set of the
+shape produced by the PDU configuration of the README.
+
+    python -m benchmarks.json_writer --pdus 48000
+"""
+import argparse
+import json
+import os
+import tempfile
+from typing import Iterator
+
+from arxml_data_extractor.output.json_writer import JsonWriter
+from benchmarks.common import measure
+
+
+def generate_records(pdus: int, signals_per_pdu: int = 8) -> Iterator[dict]:
+    for i in range(pdus):
+        yield {
+            'Name': f'Pdu{i}',
+            'Length': 8,
+            'CyclicTiming': 0.1,
+            'SignalMappings': [{
+                'Signal': f'Pdu{i}Signal{j}',
+                'StartPosition': j * 8,
+                'ISignal': {
+                    'InitValue': 0,
+                    'Length': 8
+                }
+            } for j in range(signals_per_pdu)]
+        }
+
+
+def generate_results(pdus: int, signals_per_pdu: int = 8) -> dict:
+    return {'PDU': list(generate_records(pdus, signals_per_pdu))}
+
+
+def json_dump(file: str, data: dict):
+    with open(file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def run(pdus: int):
+    data = generate_results(pdus)
+    directory = tempfile.mkdtemp()
+    expected_file = os.path.join(directory, 'expected.json')
+    indented_file = os.path.join(directory, 'indented.json')
+    compact_file = os.path.join(directory, 'compact.json')
+    try:
+        dump_time, _ = measure(json_dump, expected_file, data)
+        indented_time, _ = measure(JsonWriter().write, indented_file, data)
+        compact_time, _ = measure(JsonWriter(compact=True).write, compact_file, data)
+
+        with open(expected_file, encoding='utf-8') as expected, open(
+                indented_file, encoding='utf-8') as indented:
+            identical = expected.read() == indented.read()
+
+        size = os.path.getsize(expected_file) / 1024**2
+        print(f'{pdus} PDUs, {size:.1f} MB JSON')
+        print(f'  json.dump(indent=4): {dump_time:8.3f}s')
+        print(f'  JsonWriter         : {indented_time:8.3f}s (identical: {identical})')
+        print(f'  JsonWriter compact : {compact_time:8.3f}s '
+              f'({os.path.getsize(compact_file) / 1024**2:.1f} MB)')
+    finally:
+        for file in (expected_file, indented_file, compact_file):
+            if os.path.exists(file):
+                os.remove(file)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the JSON writer.')
+    parser.add_argument('--pdus', type=int, default=48000)
+    args = parser.parse_args()
+
+    run(args.pdus)
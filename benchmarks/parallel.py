@@ -0,0 +1,82 @@
+"""Compares the serial extraction of independent root objects with the extraction
+in worker processes and checks that both produce byte-identical JSON output.
+
+    python -m benchmarks.parallel --pdus 5000 --jobs 8
+"""
+import argparse
+import filecmp
+import os
+import tempfile
+
+from arxml_data_extractor.data_writer import DataWriter
+from arxml_data_extractor.query_handler import QueryHandler
+from benchmarks.common import build_queries, generated_arxml, measure
+
+CONFIG = """
+PDU:
+  _xpath: ".//I-SIGNAL-I-PDU"
+  Name: "SHORT-NAME"
+  Length: "text>int:LENGTH"
+  CyclicTiming: "text>float:.//TRANSMISSION-MODE-TRUE-TIMING/CYCLIC-TIMING/TIME-PERIOD/VALUE"
+  SignalMappings:
+    _xpath: ".//I-SIGNAL-TO-I-PDU-MAPPING"
+    Signal: "SHORT-NAME"
+    StartPosition: "text>int:START-POSITION"
+    ISignal:
+      _xref: "I-SIGNAL-REF"
+      InitValue: "text>int:.//VALUE"
+Signal:
+  _xpath: ".//I-SIGNAL"
+  Name: "SHORT-NAME"
+  InitValue: "text>int:.//VALUE"
+  Length: "text>int:LENGTH"
+Mapping:
+  _xpath: ".//I-SIGNAL-TO-I-PDU-MAPPING"
+  Name: "SHORT-NAME"
+  Signal: "&(I-SIGNAL-REF)SHORT-NAME"
+  Length: "text>int:&(I-SIGNAL-REF)LENGTH"
+Frame:
+  _xpath: ".//CAN-FRAME"
+  Name: "SHORT-NAME"
+  Length: "text>int:FRAME-LENGTH"
+  Pdu:
+    _xref: ".//PDU-REF"
+    Name: "SHORT-NAME"
+    Length: "text>int:LENGTH"
+Cluster:
+  _ref: "/Cluster/CAN"
+  Name: "SHORT-NAME"
+  Baudrate: "text>int:CAN-CLUSTER-VARIANTS/CAN-CLUSTER-CONDITIONAL/BAUDRATE"
+"""
+
+
+def run(pdus: int, jobs: int):
+    queries = build_queries(CONFIG)
+    directory = tempfile.mkdtemp()
+    serial_json = os.path.join(directory, 'serial.json')
+    parallel_json = os.path.join(directory, 'parallel.json')
+
+    with generated_arxml(pdus=pdus) as arxml:
+        serial_time, serial = measure(QueryHandler().handle_queries, arxml, queries)
+        parallel_time, parallel = measure(QueryHandler().handle_queries, arxml, queries, jobs=jobs)
+
+    DataWriter().write_json(serial_json, serial)
+    DataWriter().write_json(parallel_json, parallel)
+    identical = filecmp.cmp(serial_json, parallel_json, shallow=False)
+    os.remove(serial_json)
+    os.remove(parallel_json)
+    os.rmdir(directory)
+
+    print(f'{len(queries)} root objects ({pdus} PDUs)')
+    print(f'  serial            : {serial_time:8.3f}s')
+    print(f'  {jobs:2d} processes      : {parallel_time:8.3f}s')
+    print(f'  identical output  : {identical}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the parallel handling of root objects.')
+    parser.add_argument('--pdus', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    run(args.pdus, args.jobs)
@@ -0,0 +1,53 @@
+"""Compares the memory and time of a full parse with the pruned parse of the example
+configurations. Every parse runs in a fresh process, the memory is the growth of the
+peak resident set size of that process during the parse (Unix only).
+
+    python -m benchmarks.pruning --pdus 10000
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.asr.prune_plan import PrunePlan
+from benchmarks.common import README_CONFIGS, build_queries, generated_arxml
+
+
+def parse(file: str, config: str, prune: bool, results: multiprocessing.Queue):
+    plan = PrunePlan(build_queries(config)) if prune else None
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    parser = AsrParser(file, prune=plan)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    results.put((elapsed, peak * 1024, parser.prune_report))
+
+
+def measure(file: str, config: str, prune: bool) -> tuple:
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=parse, args=(file, config, prune, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def run(pdus: int):
+    with generated_arxml(pdus=pdus) as file:
+        print(f'{pdus} PDUs')
+        full_time, full_memory, _ = measure(file, '', False)
+        print(f'  {"full parse:":<32}{full_time:6.2f} s, {full_memory / 2**20:7.1f} MB')
+        for name, config in README_CONFIGS.items():
+            elapsed, memory, report = measure(file, config, True)
+            print(f'  {f"pruned, {name}:":<32}{elapsed:6.2f} s, {memory / 2**20:7.1f} MB '
+                  f'({report.share:.0%} of the elements pruned, estimated {report.saved / 2**20:.1f} MB saved)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the pruned parsing.')
+    parser.add_argument('--pdus', type=int, default=10000)
+    args = parser.parse_args()
+
+    run(args.pdus)
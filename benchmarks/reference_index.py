@@ -0,0 +1,47 @@
+"""Compares the AUTOSAR reference index of AsrParser with the previous
+SHORT-NAME search for each path segment.
+
+    python -m benchmarks.reference_index --pdus 2000
+"""
+import argparse
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.query_handler import QueryHandler
+from benchmarks.common import README_CONFIGS, build_queries, generated_arxml, measure
+
+
+def find_reference_by_search(parser: AsrParser, reference: str):
+    ref_parts = reference.strip('/').split('/')
+    element = parser.packages.get(ref_parts[0])
+    for part in ref_parts[1:]:
+        if element is None:
+            return None
+        xpath = f'.//*/ar:SHORT-NAME[text()="{part}"]/..'
+        element = next(iter(AsrParser.find(element, xpath)), None)
+    return element
+
+
+def run(pdus: int, signals_per_pdu: int):
+    with generated_arxml(pdus=pdus, signals_per_pdu=signals_per_pdu) as arxml:
+        parser = AsrParser(arxml)
+        references = [ref.text for ref in parser.find_all_elements('I-SIGNAL-REF')]
+        print(f'{len(references)} references in generated ARXML ({pdus} PDUs)')
+
+        search_time, _ = measure(lambda: [find_reference_by_search(parser, r) for r in references])
+        index_time, _ = measure(lambda: [parser.find_reference(r) for r in references])
+        print(f'  SHORT-NAME search : {search_time:8.3f}s')
+        print(f'  reference index   : {index_time:8.3f}s (including index build)')
+
+        for name, config in README_CONFIGS.items():
+            queries = build_queries(config)
+            elapsed, _ = measure(QueryHandler().handle_queries, arxml, queries)
+            print(f'  README example \'{name}\': {elapsed:8.3f}s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the AUTOSAR reference index.')
+    parser.add_argument('--pdus', type=int, default=1000)
+    parser.add_argument('--signals-per-pdu', type=int, default=8)
+    args = parser.parse_args()
+
+    run(args.pdus, args.signals_per_pdu)
@@ -0,0 +1,48 @@
+"""Compares the anchor resolution of a configuration with 20 root objects using
+descendant-axis anchors with and without the tag index.
+
+    python -m benchmarks.tag_index --pdus 2000
+"""
+import argparse
+
+from arxml_data_extractor.asr.asr_parser import AsrParser
+from arxml_data_extractor.handler.path_handler import PathHandler
+from benchmarks.common import build_queries, generated_arxml, measure
+
+TAGS = ['I-SIGNAL-I-PDU', 'I-SIGNAL', 'CAN-FRAME', 'I-SIGNAL-TO-I-PDU-MAPPING', 'PDU-TO-FRAME-MAPPING']
+
+CONFIG = ''.join(f"""
+Object{i}:
+  _xpath: ".//{TAGS[i % len(TAGS)]}"
+  Name: "SHORT-NAME"
+""" for i in range(20))
+
+
+def resolve_anchors(path_handler: PathHandler, queries: list) -> int:
+    return sum(
+        len(path_handler.elements_by_path(q.path, path_handler.parser.root)) for q in queries)
+
+
+def run(pdus: int):
+    queries = build_queries(CONFIG)
+    with generated_arxml(pdus=pdus) as arxml:
+        parser = AsrParser(arxml)
+
+        xpath_time, matches = measure(resolve_anchors, PathHandler(parser, False), queries)
+
+        path_handler = PathHandler(parser, True)
+        index_time, _ = measure(path_handler.index_anchors, queries)
+        lookup_time, _ = measure(resolve_anchors, path_handler, queries)
+
+        print(f'{len(queries)} root objects, {matches} matches ({pdus} PDUs)')
+        print(f'  XPath           : {xpath_time:8.3f}s')
+        print(f'  tag index build : {index_time:8.3f}s')
+        print(f'  tag index lookup: {lookup_time:8.3f}s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the tag index for anchors.')
+    parser.add_argument('--pdus', type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.pdus)